@@ -0,0 +1,19 @@
+"""
+URLconf for requests served through config.asgi: the hot task and user
+endpoints resolve to async views, everything else to config.urls.
+"""
+from django.urls import path
+
+from config.urls import urlpatterns as sync_urlpatterns
+from tasks.async_views import AsyncTaskViewSet
+from users.async_views import AsyncUserViewSet
+
+urlpatterns = [
+    path('api/tasks/', AsyncTaskViewSet.as_view({'get': 'list', 'post': 'create'}), name='task-list'),
+    path('api/tasks/<int:pk>/', AsyncTaskViewSet.as_view({
+        'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+    }), name='task-detail'),
+    path('api/tasks/<int:pk>/assign/', AsyncTaskViewSet.as_view({'post': 'assign'}), name='task-assign'),
+    path('api/users/me/', AsyncUserViewSet.as_view({'get': 'me'}), name='user-me'),
+    *sync_urlpatterns,
+]
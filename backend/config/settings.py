@@ -14,6 +14,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -25,6 +26,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.ResponseCompressionMiddleware',
+    'core.middleware.async_api',
+    'core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',         
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -36,6 +41,8 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'config.urls'
+# Used instead of ROOT_URLCONF for requests served under ASGI; set empty to keep every view sync.
+ASYNC_URLCONF = env_config('ASYNC_URLCONF', default='config.async_urls')
 
 TEMPLATES = [
     {
@@ -56,6 +63,26 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
 
+# Set by config/asgi.py. Under ASGI, connections are opened in whichever thread runs
+# the query, so they must not persist per thread; use the pool instead.
+ASGI = env_config('DJANGO_ASGI', default=False, cast=bool)
+
+# DB_POOL keeps a psycopg connection pool per process. Without it, connections
+# persist for DB_CONN_MAX_AGE seconds (WSGI only). Health checks test a pooled
+# connection on checkout, or a persistent one at the start of each request.
+DB_POOL = env_config('DB_POOL', default=True, cast=bool)
+DB_CONN_HEALTH_CHECKS = env_config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+DB_OPTIONS = {}
+if DB_POOL:
+    DB_OPTIONS['pool'] = {
+        'min_size': int(env_config('DB_POOL_MIN_SIZE', default='2')),
+        'max_size': int(env_config('DB_POOL_MAX_SIZE', default='10')),
+        # Seconds a request waits for a free connection before failing.
+        'timeout': float(env_config('DB_POOL_TIMEOUT', default='10')),
+        'max_idle': float(env_config('DB_POOL_MAX_IDLE', default='300')),
+        'max_lifetime': float(env_config('DB_POOL_MAX_LIFETIME', default='1800')),
+    }
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -64,7 +91,43 @@ DATABASES = {
         'PASSWORD': env_config('POSTGRES_PASSWORD', default='team_tasks'),
         'HOST': env_config('POSTGRES_HOST', default='localhost'),
         'PORT': env_config('POSTGRES_PORT', default='5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL or ASGI else int(env_config('DB_CONN_MAX_AGE', default='60')),
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'OPTIONS': DB_OPTIONS,
+    }
+}
+
+# Read replicas (core.db.ReplicaRouter): DB_REPLICA_HOSTS="host[:port],..." adds
+# replica_1, replica_2, ... with the primary's credentials. Without them, the
+# "replica" alias stands in for one locally: the same database over separate
+# connections, read from only when DB_LOCAL_REPLICA is set. Replicas are test
+# mirrors of the primary and are never migrated.
+DB_REPLICA_HOSTS = [host.strip() for host in env_config('DB_REPLICA_HOSTS', default='').split(',') if host.strip()]
+for _number, _host in enumerate(DB_REPLICA_HOSTS, start=1):
+    _hostname, _, _port = _host.partition(':')
+    DATABASES[f'replica_{_number}'] = {
+        **DATABASES['default'],
+        'HOST': _hostname,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
     }
+if not DB_REPLICA_HOSTS:
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+
+# Safe-method requests read from a random healthy alias in ALIASES, outside
+# transactions. A user who made a successful write reads from the primary for
+# the next STICKY_SECONDS. A replica is checked at most every LAG_CHECK_INTERVAL
+# seconds and skipped while it lags more than MAX_LAG seconds or is unreachable;
+# with none left, reads fall back to the primary. Keep STICKY_SECONDS above MAX_LAG.
+# Pins are kept in the default cache, so ALIASES requires one every process shares (core.E001).
+DATABASE_REPLICAS = {
+    'ALIASES': [f'replica_{number}' for number in range(1, len(DB_REPLICA_HOSTS) + 1)]
+    or (['replica'] if env_config('DB_LOCAL_REPLICA', default=False, cast=bool) else []),
+    'STICKY_SECONDS': float(env_config('DB_REPLICA_STICKY_SECONDS', default='10')),
+    'MAX_LAG': float(env_config('DB_REPLICA_MAX_LAG', default='5')),
+    'LAG_CHECK_INTERVAL': float(env_config('DB_REPLICA_LAG_CHECK_INTERVAL', default='5')),
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -80,9 +143,48 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    'users.backends.PooledModelBackend',
 ]
 
+# New and upgraded password hashes use PASSWORD_HASHER (argon2, bcrypt or pbkdf2;
+# bcrypt needs the bcrypt package). Hashes from the other hashers, or made with
+# other costs, still verify and are rehashed on the user's next login.
+# Hashing runs on WORKERS threads per process (0: on the request thread); logins
+# wait up to QUEUE_TIMEOUT seconds for one of WORKERS + MAX_QUEUE slots, then get a 503.
+PASSWORD_HASHING = {
+    'ALGORITHM': env_config('PASSWORD_HASHER', default='argon2'),
+    # OWASP's minimum Argon2id profile: 19 MiB, 2 passes, 1 lane.
+    'ARGON2': {
+        'TIME_COST': int(env_config('ARGON2_TIME_COST', default='2')),
+        'MEMORY_COST': int(env_config('ARGON2_MEMORY_KIB', default='19456')),
+        'PARALLELISM': int(env_config('ARGON2_PARALLELISM', default='1')),
+    },
+    'BCRYPT_ROUNDS': int(env_config('BCRYPT_ROUNDS', default='12')),
+    'PBKDF2_ITERATIONS': int(env_config('PBKDF2_ITERATIONS', default='1000000')),
+    'WORKERS': int(env_config('PASSWORD_HASH_WORKERS', default='2')),
+    'MAX_QUEUE': int(env_config('PASSWORD_HASH_MAX_QUEUE', default='32')),
+    'QUEUE_TIMEOUT': float(env_config('PASSWORD_HASH_QUEUE_TIMEOUT', default='5')),
+}
+_PASSWORD_HASHERS = {
+    'argon2': 'users.hashers.Argon2PasswordHasher',
+    'bcrypt': 'users.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'users.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHING['ALGORITHM']]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHING['ALGORITHM']
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Failed logins allowed per username from one client IP, and per client IP, within WINDOW seconds.
+LOGIN_THROTTLE = {
+    'CACHE': 'default',
+    'USERNAME_LIMIT': int(env_config('LOGIN_USERNAME_LIMIT', default='5')),
+    'IP_LIMIT': int(env_config('LOGIN_IP_LIMIT', default='50')),
+    'WINDOW': int(env_config('LOGIN_THROTTLE_WINDOW', default='900')),
+}
+
 
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -92,6 +194,12 @@ CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_HEADERS = [
     "authorization",
     "content-type",
+    "if-none-match",
+]
+
+CORS_EXPOSE_HEADERS = [
+    "etag",
+    "last-modified",
 ]
 
 
@@ -108,7 +216,7 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -118,6 +226,16 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
         'rest_framework.filters.SearchFilter',
     ),
+    # orjson-backed JSON; set API_JSON_RENDERER/API_JSON_PARSER to DRF's JSONRenderer/JSONParser to go back.
+    'DEFAULT_RENDERER_CLASSES': (
+        env_config('API_JSON_RENDERER', default='core.renderers.ORJSONRenderer'),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        env_config('API_JSON_PARSER', default='core.renderers.ORJSONParser'),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 from datetime import timedelta
@@ -127,7 +245,121 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=int(env_config('REFRESH_TOKEN_DAYS', default='1'))),
     'AUTH_HEADER_TYPES': ('Bearer',),
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.ClaimsTokenRefreshSerializer',
+}
+
+# Fan-out for the task change feed. The in-memory broker only reaches clients of the same process.
+EVENT_BROKER = {
+    'BACKEND': env_config('EVENT_BROKER_BACKEND', default='core.events.InMemoryBroker'),
+    'OPTIONS': {},
+}
+TASK_EVENTS_HEARTBEAT = int(env_config('TASK_EVENTS_HEARTBEAT_SECONDS', default='15'))
+# Seconds a ticket from /api/tasks/events/ticket/ can be used to open the stream (once).
+TASK_EVENTS_TICKET_TTL = int(env_config('TASK_EVENTS_TICKET_SECONDS', default='30'))
+
+# Optional per-process Bloom filter in front of the refresh token blacklist query
+# (users.tokens.BlacklistFilter), rebuilt every TTL seconds. A token blacklisted by
+# another process can still be refreshed here until the next rebuild.
+TOKEN_BLACKLIST_FILTER = {
+    'ENABLED': env_config('TOKEN_BLACKLIST_FILTER', default=False, cast=bool),
+    'TTL': int(env_config('TOKEN_BLACKLIST_FILTER_TTL', default='30')),
+    'ERROR_RATE': 0.001,
 }
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Seconds a process trusts its cached token version; bounds how long a revoked token keeps working.
+AUTH_TOKEN_VERSION_TTL = int(env_config('AUTH_TOKEN_VERSION_TTL', default='30'))
+# Seconds the shared cache keeps a token version; bounds how long a lookup racing a revocation can restore the old one.
+AUTH_TOKEN_VERSION_CACHE_TTL = int(env_config('AUTH_TOKEN_VERSION_CACHE_TTL', default='300'))
+
+# The default cache is process-local; point it at Redis/memcached to share it between workers.
+CACHES = {
+    'default': {
+        'BACKEND': env_config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env_config('CACHE_LOCATION', default='team-tasks'),
+    }
+}
+
+# Task list/retrieve response cache (core.cache.ResponseCache). An empty BACKEND disables it.
+RESPONSE_CACHE = {
+    'BACKEND': env_config('RESPONSE_CACHE_BACKEND', default='core.cache.DjangoCacheBackend'),
+    'OPTIONS': {},
+    'TIMEOUT': int(env_config('RESPONSE_CACHE_SECONDS', default='60')),
+}
+
+# Deletion log kept for /api/tasks/sync/; older watermarks must refetch everything.
+TASK_TOMBSTONE_RETENTION = timedelta(days=int(env_config('TASK_TOMBSTONE_RETENTION_DAYS', default='30')))
+
+# Completed tasks untouched for this long are moved to the archive table by
+# `manage.py archive_tasks`; the API reads them only with ?include_archived=true.
+TASK_ARCHIVE_AFTER = timedelta(days=int(env_config('TASK_ARCHIVE_AFTER_DAYS', default='90')))
+TASK_ARCHIVE_BATCH_SIZE = int(env_config('TASK_ARCHIVE_BATCH_SIZE', default='5000'))
+
+# Task history (tasks.TaskActivity) older than this is deleted by `manage.py prune_task_activity`.
+TASK_ACTIVITY_RETENTION = timedelta(days=int(env_config('TASK_ACTIVITY_RETENTION_DAYS', default='365')))
+
+# Per-request query/timing metrics (core.middleware.RequestMetricsMiddleware).
+# The profiler samples call stacks of a RATE fraction of sync requests and keeps
+# the KEEP slowest per process; admins read them at /api/system/slow-requests/.
+REQUEST_METRICS = {
+    'ENABLED': env_config('REQUEST_METRICS', default=True, cast=bool),
+    # Times one SELECT may repeat in a request before it is logged as a likely N+1.
+    'N_PLUS_ONE_THRESHOLD': int(env_config('N_PLUS_ONE_THRESHOLD', default='5')),
+    'PROFILER': {
+        'ENABLED': env_config('REQUEST_PROFILER', default=False, cast=bool),
+        'RATE': float(env_config('REQUEST_PROFILER_RATE', default='1.0')),
+        'INTERVAL': float(env_config('REQUEST_PROFILER_INTERVAL', default='0.005')),
+        'KEEP': 20,
+        'STACKS': 20,
+    },
+}
+
+# core.middleware.ResponseCompressionMiddleware. ENCODINGS is the server's preference
+# when the client accepts several equally; "br" is skipped unless Brotli is installed.
+RESPONSE_COMPRESSION = {
+    'ENABLED': env_config('RESPONSE_COMPRESSION', default=True, cast=bool),
+    # Bodies smaller than this (bytes) are not worth the CPU or the extra header.
+    'MIN_SIZE': int(env_config('RESPONSE_COMPRESSION_MIN_SIZE', default='1024')),
+    'ENCODINGS': ['br', 'gzip'],
+    # Dynamic responses: fast levels, close to the best ratio for JSON.
+    'BROTLI_QUALITY': int(env_config('RESPONSE_COMPRESSION_BROTLI_QUALITY', default='4')),
+    'GZIP_LEVEL': int(env_config('RESPONSE_COMPRESSION_GZIP_LEVEL', default='6')),
+    'EXCLUDE_CONTENT_TYPES': ['text/event-stream'],
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.requests': {
+            'handlers': ['console'],
+            # INFO logs a line for every request; WARNING only the likely N+1s.
+            'level': env_config('REQUEST_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+EMAIL_BACKEND = env_config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = env_config('DEFAULT_FROM_EMAIL', default='Task Manager <noreply@localhost>')
+# Links in emails point here.
+FRONTEND_URL = env_config('FRONTEND_URL', default='http://localhost:5173')
+
+# Transactional outbox (core.outbox), drained by `manage.py process_outbox`.
+OUTBOX = {
+    # Topic -> handler(key, payloads); payloads are every message claimed for the key.
+    'HANDLERS': {
+        'task.assigned': 'tasks.notifications.send_assignment_email',
+    },
+    # Messages wait this long (seconds) so quick successive changes become one email.
+    'DELAY': float(env_config('OUTBOX_DELAY_SECONDS', default='30')),
+    'BATCH_SIZE': int(env_config('OUTBOX_BATCH_SIZE', default='100')),
+    'POLL_INTERVAL': float(env_config('OUTBOX_POLL_SECONDS', default='5')),
+    'MAX_ATTEMPTS': int(env_config('OUTBOX_MAX_ATTEMPTS', default='8')),
+    # Retry delays double from BACKOFF up to MAX_BACKOFF seconds.
+    'BACKOFF': 30,
+    'MAX_BACKOFF': 3600,
+}
 
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 from config.routers import router
+from core.views import DatabasePoolView, DatabaseReplicasView, SlowRequestsView
+from tasks.views import TaskEventTicketView, task_event_stream
 from users.views import RegisterView, LogoutView, LoginView
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -10,5 +12,11 @@ urlpatterns = [
     path('api/auth/login/', LoginView.as_view(), name='token_obtain_pair'),
     path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/auth/logout/', LogoutView.as_view(), name='logout'),
+    path('api/system/db-pool/', DatabasePoolView.as_view(), name='db-pool'),
+    path('api/system/db-replicas/', DatabaseReplicasView.as_view(), name='db-replicas'),
+    path('api/system/slow-requests/', SlowRequestsView.as_view(), name='slow-requests'),
+    # Before the router so "events" is not taken for a task id.
+    path('api/tasks/events/', task_event_stream, name='task-events'),
+    path('api/tasks/events/ticket/', TaskEventTicketView.as_view(), name='task-events-ticket'),
     path('api/', include(router.urls)),
 ]
@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('topic', 'key', 'available_at', 'attempts', 'failed_at')
+    list_filter = ('topic', 'failed_at')
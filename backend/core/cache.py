@@ -0,0 +1,264 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.db import replicas
+
+# Response headers stored with the data so cache hits can still answer conditional requests.
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+class LRUCacheBackend:
+    """In-process LRU with per-entry expiry. Used by tests and single-process runs."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires, value = entry
+                if expires is not None and expires <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set(self, key, value, timeout=None):
+        expires = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def set_many(self, mapping, timeout=None):
+        for key, value in mapping.items():
+            self.set(key, value, timeout)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheBackend:
+    """
+    Delegates to a Django cache alias. With the default LocMemCache this is a
+    local stand-in; point CACHES at Redis/memcached to share entries between workers.
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.cache.set(key, value, timeout)
+
+    def set_many(self, mapping, timeout=None):
+        self.cache.set_many(mapping, timeout)
+
+    def clear(self):
+        self.cache.clear()
+
+    async def aget_many(self, keys):
+        return await self.cache.aget_many(keys)
+
+    async def aget(self, key):
+        return await self.cache.aget(key)
+
+    async def aset(self, key, value, timeout=None):
+        await self.cache.aset(key, value, timeout)
+
+    async def aset_many(self, mapping, timeout=None):
+        await self.cache.aset_many(mapping, timeout)
+
+
+class ResponseCache:
+    """
+    Caches serialized response data under keys stamped with the current
+    generation of each tag the response depends on. Invalidating a tag gives
+    it a new generation, so every key built from the old one is never read again.
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._backend = None
+        setting_changed.connect(self._reset_backend, weak=False)
+
+    @property
+    def config(self):
+        return settings.RESPONSE_CACHE
+
+    @property
+    def enabled(self):
+        return bool(self.config.get('BACKEND'))
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            backend_class = import_string(self.config['BACKEND'])
+            self._backend = backend_class(**self.config.get('OPTIONS', {}))
+        return self._backend
+
+    def _reset_backend(self, setting, **kwargs):
+        if setting == 'RESPONSE_CACHE':
+            self._backend = None
+            self.hits = self.misses = 0
+
+    def _tag_key(self, tag):
+        return f'{self.namespace}:tag:{tag}'
+
+    async def _acall(self, method, *args):
+        # Backends without async methods (the in-process LRU) never block, so call them directly.
+        async_method = getattr(self.backend, f'a{method}', None)
+        if async_method is not None:
+            return await async_method(*args)
+        return getattr(self.backend, method)(*args)
+
+    def _tag_generations(self, tags, found):
+        keys = [self._tag_key(tag) for tag in tags]
+        # A fresh random generation, never 0, so an evicted tag cannot resurrect old entries.
+        missing = {key: uuid.uuid4().hex for key in keys if key not in found}
+        return [found.get(key) or missing[key] for key in keys], missing
+
+    def generations(self, tags):
+        found = self.backend.get_many([self._tag_key(tag) for tag in tags])
+        generations, missing = self._tag_generations(tags, found)
+        if missing:
+            self.backend.set_many(missing)
+        return generations
+
+    async def agenerations(self, tags):
+        found = await self._acall('get_many', [self._tag_key(tag) for tag in tags])
+        generations, missing = self._tag_generations(tags, found)
+        if missing:
+            await self._acall('set_many', missing)
+        return generations
+
+    def _new_generations(self, tags):
+        return {self._tag_key(tag): uuid.uuid4().hex for tag in set(tags)}
+
+    def invalidate(self, *tags):
+        if self.enabled and tags:
+            self.backend.set_many(self._new_generations(tags))
+
+    async def ainvalidate(self, *tags):
+        if self.enabled and tags:
+            await self._acall('set_many', self._new_generations(tags))
+
+    def _key(self, parts, generations):
+        raw = repr((list(parts), generations))
+        return f'{self.namespace}:resp:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+    def make_key(self, parts, tags):
+        return self._key(parts, self.generations(tags))
+
+    async def amake_key(self, parts, tags):
+        return self._key(parts, await self.agenerations(tags))
+
+    def respond(self, request, parts, tags, compute):
+        """Return a cached Response for ``parts``/``tags``, or call ``compute`` and cache a 200 result."""
+        if not self.enabled:
+            return compute()
+
+        key = self.make_key(parts, tags)
+        entry = self.backend.get(key)
+        if entry is not None:
+            return self.cached_response(request, entry)
+
+        response = compute()
+        entry = self.miss(response)
+        timeout = self.store_timeout()
+        if entry is not None and timeout != 0:
+            self.backend.set(key, entry, timeout)
+        return response
+
+    async def arespond(self, request, parts, tags, compute):
+        """respond() for async views; ``compute`` is a coroutine function."""
+        if not self.enabled:
+            return await compute()
+
+        key = await self.amake_key(parts, tags)
+        entry = await self._acall('get', key)
+        if entry is not None:
+            return self.cached_response(request, entry)
+
+        response = await compute()
+        entry = self.miss(response)
+        timeout = self.store_timeout()
+        if entry is not None and timeout != 0:
+            await self._acall('set', key, entry, timeout)
+        return response
+
+    def store_timeout(self):
+        """
+        Seconds to keep a new entry. One read from a replica is kept at most
+        MAX_LAG: its key carries the tag generations of writes the replica may
+        not have replayed yet, and the primary-pinned writer reads that key too.
+        """
+        timeout = self.config.get('TIMEOUT')
+        if replicas.read_replica() is not None:
+            max_lag = replicas.config['MAX_LAG']
+            timeout = max_lag if timeout is None else min(timeout, max_lag)
+        return timeout
+
+    def cached_response(self, request, entry):
+        self.hits += 1
+        data, headers = entry
+        response = None
+        if 'ETag' in headers:
+            response = get_conditional_response(
+                request,
+                etag=headers['ETag'],
+                last_modified=parse_http_date_safe(headers.get('Last-Modified', '')),
+            )
+        response = response or Response(data)
+        for header, value in headers.items():
+            response[header] = value
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def miss(self, response):
+        """Mark ``response`` as a miss; returns the entry to store, if it is cacheable."""
+        self.misses += 1
+        response['X-Cache'] = 'MISS'
+        if response.status_code != status.HTTP_200_OK:
+            return None
+        headers = {header: response[header] for header in CACHED_HEADERS if header in response}
+        return (response.data, headers)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
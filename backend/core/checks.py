@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Cache backends whose entries other processes never see.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_replica_pins(app_configs, **kwargs):
+    """
+    ReplicaSet.pin() keeps its primary pins in the default cache. Unless every
+    process shares it, the writer's next read lands in another worker that
+    never saw the pin and reads its own write from a lagging replica.
+    """
+    if not settings.DATABASE_REPLICAS['ALIASES']:
+        return []
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        f"DATABASE_REPLICAS['ALIASES'] needs a default cache shared by every process, not {backend}.",
+        hint='Set CACHE_BACKEND (e.g. django.core.cache.backends.redis.RedisCache) and CACHE_LOCATION.',
+        id='core.E001',
+    )]
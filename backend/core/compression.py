@@ -0,0 +1,97 @@
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+
+class GzipCoding:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return gzip.compress(data, self.level, mtime=0)
+
+    def compressor(self):
+        """(process, finish) callables for a streamed body."""
+        # wbits 16 + MAX_WBITS writes a gzip container.
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress, compressor.flush
+
+
+class BrotliCoding:
+    name = 'br'
+
+    def __init__(self, quality):
+        self.quality = quality
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def compressor(self):
+        compressor = brotli.Compressor(quality=self.quality)
+        return compressor.process, compressor.finish
+
+
+def available_codings(config):
+    """Configured codings in server preference order, skipping brotli when it is not installed."""
+    codings = {
+        'gzip': lambda: GzipCoding(config['GZIP_LEVEL']),
+        'br': lambda: BrotliCoding(config['BROTLI_QUALITY']) if brotli is not None else None,
+    }
+    return [coding for coding in (codings[name]() for name in config['ENCODINGS']) if coding is not None]
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header; an unreadable q-value refuses the coding."""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header, codings):
+    """The coding the client accepts with the highest q-value; ties go to the earlier one in ``codings``."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in codings:
+        q = accepted.get(coding.name, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_chunks(coding, chunks):
+    # No flush per chunk: exports yield a row at a time, which would ruin the ratio.
+    process, finish = coding.compressor()
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_chunks(coding, chunks):
+    process, finish = coding.compressor()
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
@@ -0,0 +1,90 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response when the request's If-None-Match/If-Modified-Since match, else None."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Let browsers keep the body but always revalidate it.
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETag and Last-Modified validators for list and retrieve, derived from
+    ``updated_at`` (and the ``updated_at`` of embedded related objects), so a
+    matching If-None-Match/If-Modified-Since gets a 304 before any serialization.
+    """
+    validator_related_fields = ()
+
+    def get_validator_scope(self):
+        request = self.request
+        return (request.user.pk, request.path, request.META.get('QUERY_STRING', ''))
+
+    def get_list_aggregates(self):
+        aggregates = {'last': Max('updated_at'), 'count': Count('pk')}
+        for field in self.validator_related_fields:
+            aggregates[field] = Max(f'{field}__updated_at')
+        return aggregates
+
+    def get_list_validators(self, queryset):
+        return self.list_validators(queryset.order_by().aggregate(**self.get_list_aggregates()))
+
+    async def aget_list_validators(self, queryset):
+        return self.list_validators(await queryset.order_by().aaggregate(**self.get_list_aggregates()))
+
+    def list_validators(self, values):
+        last_modified = max((value for key, value in values.items() if key != 'count' and value), default=None)
+        return make_etag(self.get_validator_scope(), sorted(values.items())), last_modified
+
+    def get_object_validators(self, instance):
+        stamps = [instance.updated_at]
+        for field in self.validator_related_fields:
+            related = getattr(instance, field)
+            stamps.append(related.updated_at if related is not None else None)
+        last_modified = max((stamp for stamp in stamps if stamp), default=None)
+        return make_etag(self.get_validator_scope(), instance.pk, stamps), last_modified
+
+    def conditional_response(self, etag, last_modified, respond):
+        response = not_modified(self.request, etag, last_modified)
+        if response is None:
+            response = respond()
+        return set_validators(response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        # Filter once: filtersets may query while validating (e.g. a user choice field).
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = self.get_list_validators(queryset)
+        return self.conditional_response(etag, last_modified, lambda: self.list_response(queryset))
+
+    def list_response(self, queryset):
+        """ListModelMixin.list() for an already filtered queryset."""
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        return self.conditional_response(
+            etag, last_modified, lambda: Response(self.get_serializer(instance).data)
+        )
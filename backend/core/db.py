@@ -0,0 +1,198 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.functional import SimpleLazyObject
+
+logger = logging.getLogger(__name__)
+
+
+def pool_stats(alias):
+    """
+    Connection pool counters for this process. ``created`` and ``requests`` are
+    cumulative since the pool opened; ``in_use`` and ``waiting`` are current.
+    """
+    connection = connections[alias]
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return {'pooled': False, 'conn_max_age': connection.settings_dict['CONN_MAX_AGE']}
+
+    stats = pool.get_stats()
+    return {
+        'pooled': True,
+        'min_size': stats['pool_min'],
+        'max_size': stats['pool_max'],
+        'size': stats['pool_size'],
+        'available': stats['pool_available'],
+        'in_use': stats['pool_size'] - stats['pool_available'],
+        'waiting': stats.get('requests_waiting', 0),
+        'created': stats.get('connections_num', 0),
+        'requests': stats.get('requests_num', 0),
+        'wait_ms': stats.get('requests_wait_ms', 0),
+        'timeouts': stats.get('requests_errors', 0),
+        'lost': stats.get('connections_lost', 0),
+    }
+
+
+# Seconds the replica is behind: 0 on a primary, or when everything received is replayed.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# The request whose reads may go to a replica, and the alias chosen for it.
+_reading = ContextVar('replica_reading', default=None)
+
+
+class ReplicaSet:
+    """
+    Picks the database a read goes to and remembers who must read from the
+    primary. Lag is measured per process, one replica check at a time; a
+    replica that lags more than MAX_LAG or fails the check is skipped until
+    it passes again. Configured by ``settings.DATABASE_REPLICAS``.
+    """
+
+    def __init__(self):
+        self._status = {}
+        self._lock = threading.Lock()
+        setting_changed.connect(self._reset, weak=False)
+
+    @property
+    def config(self):
+        return settings.DATABASE_REPLICAS
+
+    @property
+    def enabled(self):
+        return bool(self.config['ALIASES'])
+
+    def _reset(self, setting, **kwargs):
+        if setting == 'DATABASE_REPLICAS':
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._status.clear()
+
+    def _pin_key(self, user_id):
+        return f'db:primary:{user_id}'
+
+    def pin(self, user_id):
+        """Send ``user_id``'s reads to the primary for STICKY_SECONDS."""
+        cache.set(self._pin_key(user_id), True, self.config['STICKY_SECONDS'])
+
+    def pinned(self, user_id):
+        return bool(cache.get(self._pin_key(user_id)))
+
+    @contextmanager
+    def reading(self, request):
+        """Let reads made while handling ``request`` go to a replica."""
+        token = _reading.set({'request': request, 'alias': None})
+        try:
+            yield
+        finally:
+            _reading.reset(token)
+
+    def read_alias(self):
+        """The alias for a read now, or None for the primary."""
+        state = _reading.get()
+        if state is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        if state['alias'] is None:
+            # Until authentication replaces Django's lazy user, reads (the token checks themselves) use the primary.
+            user = state['request'].__dict__.get('user')
+            if user is None or isinstance(user, SimpleLazyObject):
+                return None
+            if user.is_authenticated and self.pinned(user.pk):
+                state['alias'] = DEFAULT_DB_ALIAS
+            else:
+                # One replica per request, so its reads are consistent with each other.
+                healthy = self.healthy()
+                state['alias'] = random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+        return None if state['alias'] == DEFAULT_DB_ALIAS else state['alias']
+
+    def use_primary(self):
+        """Send the rest of this request's reads to the primary."""
+        state = _reading.get()
+        if state is not None:
+            state['alias'] = DEFAULT_DB_ALIAS
+
+    def read_replica(self):
+        """The replica this request's reads went to, or None."""
+        state = _reading.get()
+        alias = state and state['alias']
+        return None if alias in (None, DEFAULT_DB_ALIAS) else alias
+
+    def healthy(self):
+        return [alias for alias in self.config['ALIASES'] if self.check(alias)['healthy']]
+
+    def check(self, alias):
+        """The last lag check of ``alias``, re-run once it is LAG_CHECK_INTERVAL old."""
+        now = time.monotonic()
+        status = self._status.get(alias)
+        if status is not None and now - status['checked'] < self.config['LAG_CHECK_INTERVAL']:
+            return status
+        # Another thread is checking: use what it last found (optimistic before the first check).
+        if not self._lock.acquire(blocking=False):
+            return status or {'healthy': True, 'lag': None, 'checked': now}
+        try:
+            try:
+                lag = self.measure_lag(alias)
+            except DatabaseError as exc:
+                logger.warning('Replica %s is unavailable: %s', alias, exc)
+                lag = None
+            healthy = lag is not None and lag <= self.config['MAX_LAG']
+            if lag is not None and not healthy:
+                logger.warning('Replica %s lags %.1fs; reading from the primary.', alias, lag)
+            status = self._status[alias] = {'healthy': healthy, 'lag': lag, 'checked': time.monotonic()}
+            return status
+        finally:
+            self._lock.release()
+
+    def measure_lag(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'replicas': {
+                alias: {'healthy': status['healthy'], 'lag': status['lag']}
+                for alias, status in ((alias, self.check(alias)) for alias in self.config['ALIASES'])
+            },
+        }
+
+
+replicas = ReplicaSet()
+
+
+def is_replica(alias):
+    return connections.settings[alias].get('TEST', {}).get('MIRROR') == DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    """Reads follow ``replicas``; writes, migrations and relations stay on the primary."""
+
+    def db_for_read(self, model, **hints):
+        return replicas.read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Not the instance's own database: it may have been read from a replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if is_replica(db) else None
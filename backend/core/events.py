@@ -0,0 +1,120 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+# Sent to a subscriber that fell too far behind; it should resync and reconnect.
+OVERFLOW = {'event': 'resync'}
+
+
+class Subscription:
+    """A bounded queue bound to the subscriber's event loop; iterate it with ``async for``."""
+
+    def __init__(self, broker, channel, max_queue):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.closed = False
+
+    def put(self, event):
+        # Runs on the subscriber's loop via call_soon_threadsafe.
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+            self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self, timeout=None):
+        """The next event, or None when ``timeout`` seconds pass without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """
+    Fans events out to subscribers in this process. Enough for a single ASGI
+    worker and for tests; several workers need a shared backend (e.g. Redis
+    pub/sub) with the same ``publish``/``subscribe``/``unsubscribe`` methods.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.get(subscription.channel, set()).discard(subscription)
+
+    def publish(self, channel, events):
+        """Safe to call from any thread, e.g. a sync view running under ASGI."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            for event in events:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.put, event)
+                except RuntimeError:
+                    # The subscriber's loop has shut down.
+                    self.unsubscribe(subscription)
+                    break
+
+    def has_subscribers(self, channel):
+        with self._lock:
+            return bool(self._subscribers.get(channel))
+
+
+class ChangeFeed:
+    """A named channel on the broker configured by ``settings.EVENT_BROKER``."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self._backend = None
+        setting_changed.connect(self._reset_backend, weak=False)
+
+    @property
+    def config(self):
+        return settings.EVENT_BROKER
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            backend_class = import_string(self.config['BACKEND'])
+            self._backend = backend_class(**self.config.get('OPTIONS', {}))
+        return self._backend
+
+    def _reset_backend(self, setting, **kwargs):
+        if setting == 'EVENT_BROKER':
+            self._backend = None
+
+    @property
+    def active(self):
+        """False only when the backend knows nobody is listening, so publishers can skip building events."""
+        has_subscribers = getattr(self.backend, 'has_subscribers', None)
+        return has_subscribers is None or has_subscribers(self.channel)
+
+    def publish(self, events):
+        if events:
+            self.backend.publish(self.channel, events)
+
+    def subscribe(self):
+        """Must be called from the event loop that will consume the subscription."""
+        return self.backend.subscribe(self.channel)
@@ -0,0 +1,260 @@
+import heapq
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+_current = ContextVar('request_metrics', default=None)
+
+# Bind parameters and IN lists vary between otherwise identical statements.
+_IN_LIST = re.compile(r'\((?:%s|\?)(?:,\s*(?:%s|\?))*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def normalize_sql(sql):
+    return _LITERAL.sub('?', _IN_LIST.sub('(...)', sql))
+
+
+class RequestMetrics:
+    """What one request spent: queries, database time and named phases (seconds)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.timings = defaultdict(float)
+        self.statements = Counter()
+        self.view_started = None
+        self._active = set()
+
+    def record_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        self.statements[normalize_sql(sql)] += 1
+
+    @contextmanager
+    def timer(self, name):
+        # Nested timers of the same name (a serializer inside a serializer) count once.
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+            self._active.discard(name)
+
+    def repeated_queries(self, threshold):
+        """SELECTs run at least ``threshold`` times: the signature of an N+1 loop."""
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.statements.most_common()
+            if count >= threshold and sql.lstrip().upper().startswith('SELECT')
+        ]
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """Collect metrics for the code in the block; nested blocks share the outer collector."""
+    metrics = _current.get()
+    if metrics is not None:
+        yield metrics
+        return
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timer(name):
+    """Add the block's duration to phase ``name`` of the current request, if one is being measured."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+    else:
+        with metrics.timer(name):
+            yield
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; a no-op outside collect()."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver; the wrapper list outlives pooled connections, so add it once."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """Adds the time spent building ``.data`` to the request's ``serialize`` phase."""
+
+    @property
+    def data(self):
+        with timer('serialize'):
+            return super().data
+
+
+def server_timing(metrics, total):
+    entries = [f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"']
+    entries += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in sorted(metrics.timings.items())]
+    entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+
+class StackSampler:
+    """
+    Samples the stacks of registered threads every ``interval`` seconds from one
+    daemon thread. Each profile counts collapsed stacks ("outer;...;inner"),
+    the input format of flamegraph tools.
+    """
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._busy = threading.Event()
+        self._thread = None
+
+    def start(self):
+        profile = Counter()
+        with self._lock:
+            self._profiles[threading.get_ident()] = profile
+            self._busy.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+        return profile
+
+    def stop(self):
+        with self._lock:
+            profile = self._profiles.pop(threading.get_ident(), Counter())
+            if not self._profiles:
+                self._busy.clear()
+        return profile
+
+    def _run(self):
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, profile in self._profiles.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profile[self.collapse(frame)] += 1
+
+    def collapse(self, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f'{code.co_name} ({code.co_filename}:{frame.f_lineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+
+class SlowestRequests:
+    """The ``size`` slowest profiled requests seen by this process."""
+
+    def __init__(self, size=20):
+        self.size = size
+        self._heap = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def add(self, duration, entry):
+        with self._lock:
+            self._counter += 1
+            item = (duration, self._counter, entry)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+            elif duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def would_keep(self, duration):
+        with self._lock:
+            return len(self._heap) < self.size or duration > self._heap[0][0]
+
+    def entries(self):
+        with self._lock:
+            return [entry for _, _, entry in sorted(self._heap, reverse=True)]
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+class RequestProfiler:
+    """Opt-in sampling profiler configured by ``settings.REQUEST_METRICS['PROFILER']``."""
+
+    def __init__(self):
+        self.sampler = StackSampler()
+        self._slowest = None
+        self._lock = threading.Lock()
+        setting_changed.connect(self._reset, weak=False)
+
+    @property
+    def config(self):
+        return settings.REQUEST_METRICS['PROFILER']
+
+    @property
+    def slowest(self):
+        with self._lock:
+            if self._slowest is None:
+                self._slowest = SlowestRequests(self.config.get('KEEP', 20))
+            return self._slowest
+
+    def _reset(self, setting, **kwargs):
+        if setting == 'REQUEST_METRICS':
+            with self._lock:
+                self._slowest = None
+
+    def should_profile(self):
+        config = self.config
+        return config.get('ENABLED', False) and random.random() < config.get('RATE', 1.0)
+
+    def start(self):
+        self.sampler.interval = self.config.get('INTERVAL', 0.005)
+        return self.sampler.start()
+
+    def finish(self, request, duration, metrics):
+        profile = self.sampler.stop()
+        if not self.slowest.would_keep(duration):
+            return
+        self.slowest.add(duration, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'duration_ms': round(duration * 1000, 1),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 1),
+            'samples': sum(profile.values()),
+            'stacks': [f'{stack} {count}' for stack, count in profile.most_common(self.config.get('STACKS', 20))],
+        })
+
+
+profiler = RequestProfiler()
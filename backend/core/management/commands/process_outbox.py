@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver outbox messages (assignment emails, ...) in batches, polling until '
+        'interrupted. Run several for more throughput; they never claim the same message.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--poll', type=float, help='Seconds to sleep when the outbox is empty.')
+        parser.add_argument('--once', action='store_true', help='Exit once no message is available.')
+
+    def handle(self, *args, **options):
+        poll = options['poll'] if options['poll'] is not None else settings.OUTBOX['POLL_INTERVAL']
+        total = 0
+        try:
+            while True:
+                claimed = process_batch(options['batch_size'])
+                total += claimed
+                if claimed:
+                    continue
+                if options['once']:
+                    break
+                # Drop a connection that went stale while idle, as request handling does.
+                close_old_connections()
+                time.sleep(poll)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'Processed {total} outbox messages.')
@@ -0,0 +1,199 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+from .compression import acompress_chunks, available_codings, compress_chunks, negotiate
+from .db import replicas
+from .instrumentation import collect, current_metrics, profiler, server_timing, timer
+
+request_logger = logging.getLogger('core.requests')
+
+
+@sync_and_async_middleware
+def async_api(get_response):
+    """Resolve requests handled on the event loop with ``settings.ASYNC_URLCONF``."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if settings.ASYNC_URLCONF:
+                request.urlconf = settings.ASYNC_URLCONF
+            return await get_response(request)
+    else:
+        def middleware(request):
+            return get_response(request)
+    return middleware
+
+
+class ResponseCompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses response bodies with the coding the client prefers among
+    ``settings.RESPONSE_COMPRESSION['ENCODINGS']`` (brotli only when installed).
+    Bodies under MIN_SIZE, already encoded responses and the excluded content
+    types (event streams, which must reach the client event by event) are sent
+    as is. Strong ETags become weak, as with Django's GZipMiddleware.
+    """
+
+    def process_response(self, request, response):
+        config = settings.RESPONSE_COMPRESSION
+        if not config['ENABLED'] or response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < config['MIN_SIZE']:
+            return response
+        if response.get('Content-Type', '').partition(';')[0].strip() in config['EXCLUDE_CONTENT_TYPES']:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), available_codings(config))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_chunks(coding, response.streaming_content)
+            else:
+                response.streaming_content = compress_chunks(coding, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            with timer('compress'):
+                compressed = coding.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding.name
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe-method requests read from a replica (see core.db.ReplicaSet), and
+    pins the user behind a successful write to the primary for a while, so they
+    read their own writes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replicas.enabled:
+            return self.get_response(request)
+        if request.method in SAFE_METHODS:
+            with replicas.reading(request):
+                return self.get_response(request)
+        response = self.get_response(request)
+        self.after_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not replicas.enabled:
+            return await self.get_response(request)
+        if request.method in SAFE_METHODS:
+            with replicas.reading(request):
+                return await self.get_response(request)
+        response = await self.get_response(request)
+        self.after_write(request, response)
+        return response
+
+    def after_write(self, request, response):
+        # The user DRF authenticated, if any; never evaluates Django's lazy session user.
+        user = request.__dict__.get('user')
+        if response.status_code < 400 and getattr(user, 'is_authenticated', False) and user.pk is not None:
+            replicas.pin(user.pk)
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures each request (see core.instrumentation): query count and database
+    time, view time (resolved view through rendering), serializer time and
+    response size. Reports them in a ``Server-Timing`` header and one JSON log
+    line on the ``core.requests`` logger, at WARNING when a SELECT repeats
+    often enough to look like an N+1 loop. Sync requests can also be sampled
+    by the stack profiler. Configured by ``settings.REQUEST_METRICS``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django runs a sync process_view() in a thread on the async path.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS['ENABLED']:
+            return self.get_response(request)
+        with collect() as metrics:
+            profiling = profiler.should_profile()
+            if profiling:
+                profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiling:
+                    profiler.finish(request, time.perf_counter() - metrics.started, metrics)
+            return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS['ENABLED']:
+            return await self.get_response(request)
+        # Not profiled: concurrent requests share the event loop thread.
+        with collect() as metrics:
+            response = await self.get_response(request)
+            return self.report(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.start_view()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.start_view()
+
+    def start_view(self):
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def report(self, request, response, metrics):
+        now = time.perf_counter()
+        if metrics.view_started is not None:
+            metrics.timings['view'] = now - metrics.view_started
+        total = now - metrics.started
+        response['Server-Timing'] = server_timing(metrics, total)
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(total * 1000, 1),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 1),
+            **{f'{name}_ms': round(seconds * 1000, 1) for name, seconds in metrics.timings.items()},
+            'bytes': None if response.streaming else len(response.content),
+        }
+        repeated = metrics.repeated_queries(settings.REQUEST_METRICS['N_PLUS_ONE_THRESHOLD'])
+        if repeated:
+            record['n_plus_one'] = repeated
+            request_logger.warning(json.dumps(record))
+        else:
+            request_logger.info(json.dumps(record))
+        return response
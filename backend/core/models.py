@@ -16,3 +16,32 @@ class AuditModel(TimeStampedModel):
 
     class Meta:
         abstract = True
+
+
+class OutboxMessage(models.Model):
+    """
+    A side effect (an email, a webhook) written in the same transaction as the
+    change that causes it and carried out later by ``manage.py process_outbox``
+    (see core.outbox). Messages sharing a topic and key are handled together.
+    """
+    topic = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Set when the handler failed OUTBOX['MAX_ATTEMPTS'] times; the row is kept for inspection.
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['available_at', 'id'],
+                condition=models.Q(failed_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.topic} {self.key}'
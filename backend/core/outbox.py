@@ -0,0 +1,73 @@
+import logging
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxMessage
+
+logger = logging.getLogger('core.outbox')
+
+
+def enqueue(topic, messages):
+    """
+    Write ``(key, payload)`` messages for ``topic`` in the current transaction.
+    They become available after OUTBOX['DELAY'], so changes made in quick
+    succession for the same key reach the handler together.
+    """
+    available_at = timezone.now() + timedelta(seconds=settings.OUTBOX['DELAY'])
+    OutboxMessage.objects.bulk_create(
+        OutboxMessage(topic=topic, key=str(key), payload=payload, available_at=available_at)
+        for key, payload in messages
+    )
+
+
+def backoff(attempts):
+    """Delay before retry number ``attempts``: doubling from BACKOFF up to MAX_BACKOFF seconds."""
+    config = settings.OUTBOX
+    return timedelta(seconds=min(config['BACKOFF'] * 2 ** (attempts - 1), config['MAX_BACKOFF']))
+
+
+def process_batch(batch_size=None, now=None):
+    """
+    Claim up to ``batch_size`` available messages with FOR UPDATE SKIP LOCKED,
+    so concurrent workers never share one, and call the OUTBOX['HANDLERS']
+    entry for their topic once per key with every claimed payload for it.
+    Handled messages are deleted; a failing key is retried with backoff until
+    MAX_ATTEMPTS. Returns the number of messages claimed.
+    """
+    config = settings.OUTBOX
+    now = now or timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(failed_at__isnull=True, available_at__lte=now)
+            .order_by('available_at', 'id')[:batch_size or config['BATCH_SIZE']]
+        )
+        messages.sort(key=lambda message: (message.topic, message.key, message.id))
+        for (topic, key), group in groupby(messages, key=lambda message: (message.topic, message.key)):
+            group = list(group)
+            try:
+                # A savepoint, so a failing handler's own writes roll back without losing the claim.
+                with transaction.atomic():
+                    import_string(config['HANDLERS'][topic])(key, [message.payload for message in group])
+            except Exception as exc:
+                logger.exception('Outbox handler for %s %s failed', topic, key)
+                retry(group, exc, now)
+            else:
+                OutboxMessage.objects.filter(pk__in=[message.pk for message in group]).delete()
+    return len(messages)
+
+
+def retry(messages, exc, now):
+    attempts = max(message.attempts for message in messages) + 1
+    failed = attempts >= settings.OUTBOX['MAX_ATTEMPTS']
+    OutboxMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+        attempts=attempts,
+        last_error=repr(exc),
+        available_at=now + backoff(attempts),
+        failed_at=now if failed else None,
+    )
@@ -0,0 +1,258 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over the queryset's ordering plus a unique
+    tie-breaker, so fetching page N costs the same as fetching page 1.
+
+    The ordering is taken from the filtered queryset (``OrderingFilter``)
+    or the model's ``Meta.ordering``. NULLs in nullable columns sort after
+    non-NULL values. Each page is read as index ranges: NOT NULL keys get a
+    plain ORDER BY, and a nullable leading key is paged as two segments.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 500
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        results = []
+        for segment in self.page_segments(queryset, request):
+            results.extend(segment[:self.page_size + 1 - len(results)])
+            if len(results) > self.page_size:
+                break
+        return self.set_page(results)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        results = []
+        for segment in self.page_segments(queryset, request):
+            results.extend([row async for row in segment[:self.page_size + 1 - len(results)]])
+            if len(results) > self.page_size:
+                break
+        return self.set_page(results)
+
+    def page_segments(self, queryset, request):
+        """
+        Querysets whose rows, in turn, hold the requested page plus one row to
+        detect more; each is read only while the page is short. A nullable
+        leading key splits the order into its non-NULL rows and its NULL rows
+        (which sort last), so that each is a plain index range.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor['reverse'])
+        position = self.cursor['position'] if self.cursor else None
+
+        keys = [(field.lstrip('-'), field.startswith('-'), self.is_nullable(field.lstrip('-')))
+                for field in self.ordering]
+        (leading, descending, nullable), rest = keys[0], keys[1:]
+        if not nullable:
+            segments = [(queryset, keys, position)]
+        else:
+            not_null = queryset.filter(**{f'{leading}__isnull': False})
+            not_null_keys = [(leading, descending, False), *rest]
+            null = queryset.filter(**{f'{leading}__isnull': True})
+            if position is None:
+                segments = [(not_null, not_null_keys, None), (null, rest, None)]
+            elif position[0] is None:
+                segments = [(null, rest, position[1:])]
+                if self.reverse:
+                    segments.append((not_null, not_null_keys, None))
+            else:
+                segments = [(not_null, not_null_keys, position)]
+                if not self.reverse:
+                    segments.append((null, rest, None))
+
+        return [
+            self.seek(segment, keys, position).order_by(*self.order_expressions(keys))
+            for segment, keys, position in segments
+        ]
+
+    def seek(self, queryset, keys, position):
+        if position is None:
+            return queryset
+        return queryset.filter(self.leading_bound(keys[0], position[0]) & self.seek_condition(keys, position))
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else self.cursor is not None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ]
+        if not ordering:
+            ordering = ['-' + self.tie_breaker]
+        if ordering[-1].lstrip('-') not in (self.tie_breaker, 'pk'):
+            prefix = '-' if ordering[0].startswith('-') else ''
+            ordering.append(prefix + self.tie_breaker)
+        return ordering
+
+    def order_expressions(self, keys):
+        expressions = []
+        for name, descending, nullable in keys:
+            nulls = {}
+            if nullable:
+                nulls = {'nulls_first': True} if self.reverse else {'nulls_last': True}
+            if descending != self.reverse:
+                expressions.append(F(name).desc(**nulls))
+            else:
+                expressions.append(F(name).asc(**nulls))
+        return expressions
+
+    def leading_bound(self, key, value):
+        """
+        ``k1 >= v1`` (or ``<=``): implied by the seek condition, but unlike
+        its OR chain it is an index range the scan can start from.
+        """
+        name, descending, nullable = key
+        if value is None:
+            return Q() if self.reverse else Q(**{f'{name}__isnull': True})
+        lookup = 'gte' if descending == self.reverse else 'lte'
+        bound = Q(**{f'{name}__{lookup}': value})
+        if not self.reverse and nullable:
+            bound |= Q(**{f'{name}__isnull': True})
+        return bound
+
+    def seek_condition(self, keys, position):
+        """
+        ``(k1, k2, ...) > (v1, v2, ...)`` under the ordering of ``keys``, or
+        ``<`` when paging backwards.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending, nullable), value in zip(keys, position):
+            if value is None:
+                # NULLs sort last: nothing follows them, every non-NULL precedes them.
+                beyond = Q(**{f'{name}__isnull': False}) if self.reverse else Q(pk__in=[])
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                lookup = 'gt' if descending == self.reverse else 'lt'
+                beyond = Q(**{f'{name}__{lookup}': value})
+                if not self.reverse and nullable:
+                    beyond |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            condition |= equal & beyond
+            equal &= same
+        return condition
+
+    def is_nullable(self, name):
+        """
+        Whether the ordering key ``name`` can be NULL. An annotation says so
+        through its output field, e.g. ``output_field=FloatField(null=True)``.
+        """
+        field = self.key_field(name)
+        return True if field is None else field.null
+
+    def key_field(self, name):
+        """The model field or annotation output field ordered by as ``name``, if it can be resolved."""
+        if name == 'pk':
+            return self.model._meta.pk
+        if name in self.annotations:
+            return self.annotations[name].output_field
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            if isinstance(value, (datetime.date, datetime.datetime)):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'o': self.ordering, 'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            ordering, position, reverse = payload['o'], payload['p'], payload['r']
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering or not isinstance(position, list) or len(position) != len(ordering):
+            # The cursor was issued for a different ``ordering`` parameter, or tampered with.
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            # Values that cannot be filtered on fail here rather than in the query.
+            position = [self.key_value(field.lstrip('-'), value) for field, value in zip(ordering, position)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return {'position': position, 'reverse': bool(reverse)}
+
+    def key_value(self, name, value):
+        field = self.key_field(name)
+        return value if field is None else field.to_python(value)
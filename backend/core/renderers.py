@@ -0,0 +1,64 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to DRF's json module based classes
+    orjson = None
+
+
+def renders_datetimes(context):
+    """
+    Whether the response for a serializer ``context`` is rendered by a renderer
+    that writes datetime and date values as ISO 8601 itself, so serializers
+    can hand them over unformatted.
+    """
+    renderer = getattr(context.get('request'), 'accepted_renderer', None)
+    return getattr(renderer, 'renders_datetimes', False)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer with orjson, producing the same bytes as DRF's default
+    (UNICODE_JSON, COMPACT_JSON) output, U+2028/U+2029 escaped included.
+    Datetimes are written the way DRF's ISO_8601 format writes them (``Z``
+    for UTC, microseconds kept); other types orjson does not know (Decimal,
+    lazy strings, ...) go through DRF's JSONEncoder. Unlike STRICT_JSON, NaN
+    and infinities are written as null rather than rejected, and orjson only
+    indents by two spaces.
+    """
+    renders_datetimes = orjson is not None
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        rendered = orjson.dumps(data, default=self.encoder.default, option=option)
+        # Valid JSON but not valid JavaScript; escaped as JSONRenderer does.
+        return rendered.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % exc)
@@ -0,0 +1,90 @@
+import gzip
+from functools import partial
+
+import brotli
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.compression import GzipCoding, available_codings, compress_chunks, negotiate
+from core.tests.utils import override_setting_dict
+from tasks.models import Task
+
+User = get_user_model()
+
+
+compression = partial(override_setting_dict, 'RESPONSE_COMPRESSION')
+
+
+class NegotiateTests(SimpleTestCase):
+    codings = available_codings(settings.RESPONSE_COMPRESSION)
+
+    def negotiated(self, header):
+        coding = negotiate(header, self.codings)
+        return coding and coding.name
+
+    def test_preference(self):
+        self.assertEqual(self.negotiated('gzip, deflate, br'), 'br')
+        self.assertEqual(self.negotiated('gzip;q=1.0, br;q=0.5'), 'gzip')
+        self.assertEqual(self.negotiated('br;q=0, gzip'), 'gzip')
+        self.assertEqual(self.negotiated('*;q=0.1, br;q=0'), 'gzip')
+        self.assertIsNone(self.negotiated('identity'))
+        self.assertIsNone(self.negotiated('gzip;q=nope'))
+        self.assertIsNone(self.negotiated(''))
+
+    def test_brotli_can_be_left_out(self):
+        codings = available_codings({**settings.RESPONSE_COMPRESSION, 'ENCODINGS': ['gzip']})
+        self.assertEqual([coding.name for coding in codings], ['gzip'])
+
+
+@override_settings(RESPONSE_CACHE={'BACKEND': ''})
+class ResponseCompressionTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        Task.objects.bulk_create(
+            Task(title=f'Task {n}', description='Lorem ipsum dolor sit amet', created_by=self.admin)
+            for n in range(20)
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def get(self, url, encoding, **params):
+        return self.client.get(url, params, HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_negotiated_encodings(self):
+        plain = self.get(reverse('task-list'), '').content
+        for encoding, decompress in (('br', brotli.decompress), ('gzip', gzip.decompress)):
+            response = self.get(reverse('task-list'), f'{encoding}, identity')
+            self.assertEqual(response['Content-Encoding'], encoding)
+            self.assertIn('Accept-Encoding', response['Vary'])
+            self.assertEqual(int(response['Content-Length']), len(response.content))
+            self.assertTrue(response['ETag'].startswith('W/"'))
+            self.assertEqual(decompress(response.content), plain)
+
+    def test_weak_etag_still_revalidates(self):
+        etag = self.get(reverse('task-list'), 'br')['ETag']
+        response = self.client.get(reverse('task-list'), HTTP_ACCEPT_ENCODING='br', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_small_bodies_and_identity_clients_are_sent_as_is(self):
+        response = self.get(reverse('task-list'), 'gzip', page_size=1)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.get(reverse('task-list'), '')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @compression(ENABLED=False)
+    def test_disabled(self):
+        self.assertFalse(self.get(reverse('task-list'), 'br').has_header('Content-Encoding'))
+
+    def test_streamed_export(self):
+        response = self.get(reverse('task-export'), 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        lines = gzip.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 20)
+
+    def test_streamed_chunks_form_one_gzip_member(self):
+        chunks = [f'line {n}\n'.encode() for n in range(1_000)]
+        self.assertEqual(gzip.decompress(b''.join(compress_chunks(GzipCoding(6), chunks))), b''.join(chunks))
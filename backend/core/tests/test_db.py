@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class DatabasePoolTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+
+    def test_admin_sees_pool_metrics(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('db-pool'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = response.data['default']
+        if connection.pool is None:
+            self.assertEqual(stats, {'pooled': False, 'conn_max_age': connection.settings_dict['CONN_MAX_AGE']})
+        else:
+            self.assertTrue(stats['pooled'])
+            # This request holds a connection.
+            self.assertGreaterEqual(stats['in_use'], 1)
+            self.assertGreaterEqual(stats['created'], 1)
+            self.assertEqual(stats['in_use'] + stats['available'], stats['size'])
+
+    def test_members_cannot_read_metrics(self):
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(self.client.get(reverse('db-pool')).status_code, status.HTTP_403_FORBIDDEN)
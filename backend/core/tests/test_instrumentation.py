@@ -0,0 +1,120 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.instrumentation import RequestMetrics, collect, normalize_sql, server_timing
+from core.middleware import RequestMetricsMiddleware
+from core.tests.utils import override_setting_dict
+from tasks.models import Task
+
+User = get_user_model()
+
+
+def profiled(**options):
+    profiler = {**settings.REQUEST_METRICS['PROFILER'], 'ENABLED': True, 'INTERVAL': 0.001, **options}
+    return override_setting_dict('REQUEST_METRICS', PROFILER=profiler)
+
+
+class RequestMetricsApiTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        Task.objects.bulk_create(
+            Task(title=f'Task {n}', assigned_to=self.member, created_by=self.admin) for n in range(3)
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_server_timing_and_log_line(self):
+        with CaptureQueriesContext(connection) as queries, self.assertLogs('core.requests', 'INFO') as logs:
+            response = self.client.get(reverse('task-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        for phase in ('serialize;dur=', 'view;dur=', 'total;dur='):
+            self.assertIn(phase, timing)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], reverse('task-list'))
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['queries'], len(queries))
+        self.assertEqual(record['bytes'], len(response.content))
+        self.assertNotIn('n_plus_one', record)
+
+    def test_disabled(self):
+        with override_setting_dict('REQUEST_METRICS', ENABLED=False):
+            response = self.client.get(reverse('task-list'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_profiler_keeps_slowest_requests(self):
+        with profiled(KEEP=1):
+            self.client.get(reverse('task-list'))
+            self.client.get(reverse('user-me'))
+            response = self.client.get(reverse('slow-requests'))
+
+        self.assertTrue(response.data['enabled'])
+        [entry] = response.data['results']
+        self.assertIn(entry['path'], (reverse('task-list'), reverse('user-me')))
+        self.assertEqual(entry['samples'], sum(int(stack.rsplit(' ', 1)[1]) for stack in entry['stacks']))
+
+    def test_slow_requests_admin_only(self):
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(self.client.get(reverse('slow-requests')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class NPlusOneTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(f'user{n}', f'user{n}@example.com', 'pass1234', role='MEMBER')
+            for n in range(5)
+        ]
+
+    def test_repeated_selects_are_reported(self):
+        with collect() as metrics:
+            for user in self.users:
+                User.objects.get(pk=user.pk)
+            User.objects.filter(pk__in=[user.pk for user in self.users]).count()
+
+        [repeated] = metrics.repeated_queries(5)
+        self.assertEqual(repeated['count'], 5)
+        self.assertIn('"users_user"."id" = %s', repeated['sql'])
+        self.assertEqual(metrics.queries, 6)
+
+    def test_middleware_logs_warning(self):
+        def view(request):
+            for user in self.users:
+                User.objects.get(pk=user.pk)
+            return HttpResponse('ok')
+
+        middleware = RequestMetricsMiddleware(view)
+        with self.assertLogs('core.requests', 'WARNING') as logs:
+            middleware(RequestFactory().get('/loop/'))
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['n_plus_one'][0]['count'], 5)
+
+
+class InstrumentationHelperTests(SimpleTestCase):
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql('SELECT 1 FROM "t" WHERE "id" IN (%s, %s, %s) AND "name" = \'x\' LIMIT 21'),
+            'SELECT ? FROM "t" WHERE "id" IN (...) AND "name" = ? LIMIT ?',
+        )
+        self.assertEqual(normalize_sql('WHERE "id" IN (%s)'), normalize_sql('WHERE "id" IN (%s, %s)'))
+
+    def test_nested_timers_count_once(self):
+        metrics = RequestMetrics()
+        with metrics.timer('serialize'):
+            with metrics.timer('serialize'):
+                pass
+        self.assertEqual(list(metrics.timings), ['serialize'])
+        self.assertTrue(server_timing(metrics, 0.01).endswith('total;dur=10.0'))
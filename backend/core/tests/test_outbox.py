@@ -0,0 +1,100 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from core.models import OutboxMessage
+from core.outbox import enqueue, process_batch
+from core.tests.utils import override_setting_dict
+
+handled = []
+
+
+def record(key, payloads):
+    handled.append((key, sorted(payload['n'] for payload in payloads)))
+
+
+def explode(key, payloads):
+    OutboxMessage.objects.create(topic='side-effect', key=key, available_at=timezone.now())
+    raise RuntimeError('mail server down')
+
+
+def outbox(**options):
+    return override_setting_dict('OUTBOX', **{
+        'DELAY': 0,
+        'HANDLERS': {'record': 'core.tests.test_outbox.record', 'explode': 'core.tests.test_outbox.explode'},
+        **options,
+    })
+
+
+@outbox()
+class OutboxTests(TestCase):
+    def setUp(self):
+        handled.clear()
+
+    def test_messages_for_one_key_are_handled_together(self):
+        enqueue('record', [('a', {'n': 1}), ('b', {'n': 2}), ('a', {'n': 3})])
+        self.assertEqual(process_batch(), 3)
+        self.assertEqual(handled, [('a', [1, 3]), ('b', [2])])
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(process_batch(), 0)
+
+    def test_delay(self):
+        with outbox(DELAY=60):
+            enqueue('record', [('a', {'n': 1})])
+        self.assertEqual(process_batch(), 0)
+        self.assertEqual(process_batch(now=timezone.now() + timedelta(minutes=2)), 1)
+
+    def test_failures_back_off_then_give_up(self):
+        enqueue('explode', [('a', {})])
+        now = timezone.now()
+        with outbox(MAX_ATTEMPTS=3, BACKOFF=10), self.assertLogs('core.outbox', 'ERROR'):
+            for attempt, delay in ((1, 10), (2, 20)):
+                process_batch(now=now)
+                message = OutboxMessage.objects.get()
+                self.assertEqual((message.attempts, message.available_at), (attempt, now + timedelta(seconds=delay)))
+                self.assertIn('mail server down', message.last_error)
+                self.assertEqual(process_batch(now=now), 0)
+                now = message.available_at
+
+            process_batch(now=now)
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.attempts, message.failed_at), (3, now))
+        self.assertEqual(process_batch(now=now + timedelta(days=1)), 0)
+
+    def test_command(self):
+        enqueue('record', [('a', {'n': 1}), ('b', {'n': 2})])
+        out = StringIO()
+        call_command('process_outbox', once=True, batch_size=1, stdout=out)
+        self.assertIn('Processed 2 outbox messages.', out.getvalue())
+        self.assertEqual(len(handled), 2)
+
+
+@outbox()
+class OutboxLockingTests(TransactionTestCase):
+    def test_workers_skip_claimed_messages(self):
+        handled.clear()
+        enqueue('record', [('a', {'n': 1}), ('b', {'n': 2})])
+        locked, release = threading.Event(), threading.Event()
+
+        def other_worker():
+            # Holds a claim on the oldest message, as a worker in the middle of a batch would.
+            with transaction.atomic():
+                list(OutboxMessage.objects.select_for_update().order_by('id')[:1])
+                locked.set()
+                release.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        locked.wait(5)
+        try:
+            self.assertEqual(process_batch(), 1)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(handled, [('b', [2])])
@@ -0,0 +1,239 @@
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.models import Task, TaskActivity, TaskStatus
+from users.authentication import token_versions
+from users.serializers import UsernameTokenObtainPairSerializer
+
+User = get_user_model()
+
+# Every route must issue the same number of queries at each of these table sizes.
+ROW_COUNTS = (10, 100, 1_000)
+
+
+@override_settings(RESPONSE_CACHE={'BACKEND': ''})
+class QueryCountTestCase(APITestCase):
+    """
+    Pins the queries issued by each API route, cold (no response cache, no
+    cached token versions), while the tables it reads grow. A failure with the
+    same count at every size means the pinned number changed; a count that
+    grows with the rows is an N+1.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.client.force_authenticate(user=self.admin)
+
+    def add_tasks(self, total):
+        """Top the task table up to ``total`` rows, half of them assigned to the member; returns the newest."""
+        count = Task.objects.count()
+        statuses = list(TaskStatus.values)
+        Task.objects.bulk_create(
+            Task(
+                title=f'Task {n}',
+                status=statuses[n % len(statuses)],
+                assigned_to=self.member if n % 2 else self.admin,
+                created_by=self.admin,
+            )
+            for n in range(count, total)
+        )
+        return Task.objects.latest('id')
+
+    def add_users(self, total):
+        count = User.objects.count()
+        User.objects.bulk_create(
+            User(username=f'user{n}', email=f'user{n}@example.com', role='MEMBER', password='!')
+            for n in range(count, total)
+        )
+
+    def assertConstantQueries(self, expected, send, seed):
+        """
+        ``seed(rows)`` grows the data and returns what ``send`` needs; only
+        ``send`` is counted, with the on_commit work it schedules.
+        """
+        for rows in ROW_COUNTS:
+            with self.subTest(rows=rows):
+                target = seed(rows)
+                cache.clear()
+                token_versions.clear()
+                with self.assertNumQueries(expected), self.captureOnCommitCallbacks(execute=True):
+                    response = send(target)
+                self.assertLess(response.status_code, 400, response.content)
+
+
+class TaskRouteQueryCountTests(QueryCountTestCase):
+    def test_list(self):
+        # Validators aggregate, page, users on the page.
+        self.assertConstantQueries(3, lambda _: self.client.get(reverse('task-list')), self.add_tasks)
+
+    def test_list_as_member(self):
+        self.client.force_authenticate(user=self.member)
+        self.assertConstantQueries(3, lambda _: self.client.get(reverse('task-list')), self.add_tasks)
+
+    def test_list_include_archived(self):
+        url = f"{reverse('task-list')}?include_archived=true"
+        self.assertConstantQueries(3, lambda _: self.client.get(url), self.add_tasks)
+
+    def test_list_filtered(self):
+        # Plus the assigned_to filter resolving its user, and the nullable due_date
+        # order read as two segments: tasks with a due date, then (all of these) without.
+        url = f"{reverse('task-list')}?status={TaskStatus.values[0]}&assigned_to={self.member.pk}&ordering=due_date"
+        self.assertConstantQueries(5, lambda _: self.client.get(url), self.add_tasks)
+
+    def test_retrieve(self):
+        # The task joined to both users; validators and serializer reuse it.
+        self.assertConstantQueries(
+            1, lambda task: self.client.get(reverse('task-detail', args=[task.pk])), self.add_tasks
+        )
+
+    def test_partial_update(self):
+        # Task, UPDATE and activity, in a transaction (SAVEPOINT/RELEASE here) with any outbox rows.
+        # The on_commit invalidation and event publish add none.
+        self.assertConstantQueries(
+            5,
+            lambda task: self.client.patch(
+                reverse('task-detail', args=[task.pk]), {'title': 'Renamed'}, format='json'
+            ),
+            self.add_tasks,
+        )
+
+    def test_partial_update_reassign(self):
+        # Plus a tombstone for the previous assignee.
+        self.assertConstantQueries(
+            7,
+            lambda task: self.client.patch(
+                reverse('task-detail', args=[task.pk]), {'assigned_to_id': self.admin.pk}, format='json'
+            ),
+            self.add_tasks,
+        )
+
+    def test_update(self):
+        # Task, assignee, SAVEPOINT, UPDATE, activity, RELEASE.
+        self.assertConstantQueries(
+            6,
+            lambda task: self.client.put(
+                reverse('task-detail', args=[task.pk]),
+                {'title': 'Replaced', 'status': task.status, 'assigned_to_id': task.assigned_to_id},
+                format='json',
+            ),
+            self.add_tasks,
+        )
+
+    def test_assign(self):
+        # Task, assignee, SAVEPOINT, UPDATE, tombstone, activity, RELEASE.
+        self.assertConstantQueries(
+            7,
+            lambda task: self.client.post(
+                reverse('task-assign', args=[task.pk]), {'user_id': self.admin.pk}, format='json'
+            ),
+            self.add_tasks,
+        )
+
+    def test_destroy(self):
+        # Task, then DELETE, tombstone and activity in a savepoint.
+        self.assertConstantQueries(
+            6, lambda task: self.client.delete(reverse('task-detail', args=[task.pk])), self.add_tasks
+        )
+
+    def test_history(self):
+        # The task, then a page of its activity joined to the actors.
+        def seed(rows):
+            task = self.add_tasks(rows)
+            TaskActivity.objects.bulk_create(
+                TaskActivity(task_id=task.pk, actor=self.admin, action='task.updated', changes={'title': ['a', 'b']})
+                for _ in range(rows - TaskActivity.objects.count())
+            )
+            return task
+
+        self.assertConstantQueries(
+            2, lambda task: self.client.get(reverse('task-history', args=[task.pk])), seed
+        )
+
+    def test_stats(self):
+        self.assertConstantQueries(1, lambda _: self.client.get(reverse('task-stats')), self.add_tasks)
+
+    def test_sync(self):
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        self.assertConstantQueries(
+            3, lambda _: self.client.get(reverse('task-sync'), {'since': since}), self.add_tasks
+        )
+
+
+class UserRouteQueryCountTests(QueryCountTestCase):
+    def test_list(self):
+        self.assertConstantQueries(2, lambda _: self.client.get(reverse('user-list')), self.add_users)
+
+    def test_me(self):
+        self.assertConstantQueries(0, lambda _: self.client.get(reverse('user-me')), self.add_users)
+
+    def test_me_with_token(self):
+        # Claims-built user: token version check, then the full profile.
+        self.client.force_authenticate(user=None)
+        token = UsernameTokenObtainPairSerializer.get_token(self.member).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertConstantQueries(2, lambda _: self.client.get(reverse('user-me')), self.add_users)
+
+    def test_options(self):
+        self.assertConstantQueries(2, lambda _: self.client.get(reverse('user-options')), self.add_users)
+
+    def test_directory(self):
+        # Just the page; no count, no validators.
+        url = f"{reverse('user-directory')}?q=user1"
+        self.assertConstantQueries(1, lambda _: self.client.get(url), self.add_users)
+
+
+class AuthRouteQueryCountTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=None)
+
+    def add_blacklisted(self, total):
+        expires_at = timezone.now() + timedelta(days=1)
+        count = OutstandingToken.objects.count()
+        tokens = OutstandingToken.objects.bulk_create(
+            OutstandingToken(user=self.member, jti=uuid.uuid4().hex, token='', expires_at=expires_at)
+            for _ in range(count, total)
+        )
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in tokens)
+
+    def test_login(self):
+        # User, outstanding token INSERT.
+        self.assertConstantQueries(
+            2,
+            lambda _: self.client.post(
+                reverse('token_obtain_pair'), {'username': 'member', 'password': 'pass1234'}, format='json'
+            ),
+            self.add_users,
+        )
+
+    def test_refresh(self):
+        # Blacklist check (twice: version check and refresh parse the token), token version, user.
+        def seed(rows):
+            self.add_users(rows)
+            return str(UsernameTokenObtainPairSerializer.get_token(self.member))
+
+        self.assertConstantQueries(
+            4, lambda refresh: self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json'), seed
+        )
+
+    def test_logout(self):
+        def seed(rows):
+            self.add_users(rows)
+            self.add_blacklisted(rows)
+            return str(RefreshToken.for_user(self.member))
+
+        self.client.force_authenticate(user=self.member)
+        # Blacklist check, user, outstanding and blacklisted token lookups, INSERT in a savepoint.
+        self.assertConstantQueries(
+            7, lambda refresh: self.client.post(reverse('logout'), {'refresh': refresh}, format='json'), seed
+        )
@@ -0,0 +1,76 @@
+import datetime
+import io
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core.renderers import ORJSONParser, ORJSONRenderer
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_output(self):
+        data = {
+            'created_at': '2026-01-02T03:04:05.123456Z',
+            'title': 'Café ✓ \u2028 \u2029',
+            'amount': Decimal('1.50'),
+            'label': gettext_lazy('Tasks'),
+            'nested': [{'id': 1, 'due_date': None}],
+            1: 'non-string key',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_nan_renders_as_null(self):
+        self.assertEqual(ORJSONRenderer().render({'n': float('nan'), 'i': float('inf')}), b'{"n":null,"i":null}')
+
+    def test_datetimes_render_as_iso_8601(self):
+        data = {
+            'at': datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'on': datetime.date(2026, 1, 2),
+        }
+        self.assertEqual(ORJSONRenderer().render(data), b'{"at":"2026-01-02T03:04:05.123456Z","on":"2026-01-02"}')
+
+    def test_none_and_indent(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        self.assertEqual(ORJSONRenderer().render({'a': 1}, 'application/json; indent=4'), b'{\n  "a": 1\n}')
+
+    def test_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"title": "Café"}'.encode())), {'title': 'Café'})
+        latin1 = parser.parse(io.BytesIO('{"title": "Café"}'.encode('latin-1')), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(latin1, {'title': 'Café'})
+        for body in (b'{"title": ', b'{"n": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+
+@override_settings(RESPONSE_CACHE={'BACKEND': ''})
+class NativeDatetimeTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.task = Task.objects.create(title='Task', due_date=datetime.date(2026, 1, 2), created_by=self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_list_leaves_datetimes_to_the_renderer(self):
+        response = self.client.get(reverse('task-list'))
+        task = response.data['results'][0]
+        self.assertIsInstance(task['created_at'], datetime.datetime)
+        self.assertEqual(task['due_date'], datetime.date(2026, 1, 2))
+
+        rendered = response.json()['results'][0]
+        formatted = self.client.get(reverse('task-detail', args=[self.task.pk])).data
+        self.assertEqual(rendered['due_date'], '2026-01-02')
+        self.assertEqual(rendered['created_at'], formatted['created_at'])
+
+    def test_other_renderers_get_formatted_values(self):
+        task = self.client.get(reverse('task-list'), HTTP_ACCEPT='text/html').data['results'][0]
+        self.assertIsInstance(task['created_at'], str)
+        self.assertEqual(task['due_date'], '2026-01-02')
@@ -0,0 +1,177 @@
+import datetime
+import time
+from urllib.parse import urlencode
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connections, router, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.checks import check_replica_pins
+from core.db import replicas
+from core.tests.utils import override_setting_dict
+from tasks.models import Task
+
+User = get_user_model()
+
+REPLICA = 'replica'
+
+
+def routing(**options):
+    return override_setting_dict('DATABASE_REPLICAS', **{'ALIASES': [REPLICA], 'LAG_CHECK_INTERVAL': 60, **options})
+
+
+@routing()
+class ReplicaRoutingTests(TransactionTestCase):
+    """The local "replica" alias is a second connection to the test database, so it sees committed rows."""
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def tearDownClass(cls):
+        # Pooled replica connections would keep the test database from being dropped.
+        connections[REPLICA].close_pool()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        replicas.clear()
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.task = Task.objects.create(title='Mine', assigned_to=self.member, created_by=self.admin)
+        self.client = self.client_for(self.member)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def send(self, client, method, url, data=None):
+        """Returns the response and the number of queries each alias ran for it."""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(client, method)(url, data, format='json')
+        return response, len(primary), len(replica)
+
+    def test_safe_requests_read_from_the_replica(self):
+        response, primary, replica = self.send(self.client, 'get', reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['results']], [self.task.pk])
+        self.assertEqual(primary, 0)
+        # The lag check, then the reads.
+        self.assertGreater(replica, 1)
+        # Validated by the replica's rows, not by cache tags it may not have caught up with.
+        self.assertIn('Last-Modified', response)
+
+    def test_writes_go_to_the_primary_and_pin_the_writer(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        response, _, replica = self.send(self.client, 'patch', url, {'status': 'IN_PROGRESS'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(replica, 0)
+
+        response, _, replica = self.send(self.client, 'get', url)
+        self.assertEqual(response.data['status'], 'IN_PROGRESS')
+        self.assertEqual(replica, 0)
+
+        # Only the writer is pinned.
+        _, primary, _ = self.send(self.client_for(self.admin), 'get', url)
+        self.assertEqual(primary, 0)
+
+    def test_pin_expires(self):
+        with routing(STICKY_SECONDS=0.01):
+            self.send(self.client, 'patch', reverse('task-detail', args=[self.task.pk]), {'status': 'COMPLETED'})
+            time.sleep(0.02)
+            _, primary, _ = self.send(self.client, 'get', reverse('task-list'))
+        self.assertEqual(primary, 0)
+
+    def test_failed_writes_do_not_pin(self):
+        self.send(self.client, 'patch', reverse('task-detail', args=[self.task.pk]), {'status': 'NOPE'})
+        _, primary, _ = self.send(self.client, 'get', reverse('task-list'))
+        self.assertEqual(primary, 0)
+
+    @override_settings(RESPONSE_CACHE={'BACKEND': 'core.cache.LRUCacheBackend', 'TIMEOUT': 60})
+    def test_responses_read_from_a_replica_are_cached_no_longer_than_max_lag(self):
+        def stored_timeouts(client, method, url, data=None):
+            with mock.patch('core.cache.LRUCacheBackend.set', autospec=True) as store:
+                self.send(client, method, url, data)
+            return [call.args[3] for call in store.call_args_list if ':resp:' in call.args[1]]
+
+        url = reverse('task-detail', args=[self.task.pk])
+        self.assertEqual(stored_timeouts(self.client_for(self.admin), 'get', url), [5.0])
+        self.send(self.client, 'patch', url, {'status': 'IN_PROGRESS'})
+        self.assertEqual(stored_timeouts(self.client, 'get', url), [60])
+
+    def test_sync_reads_from_the_primary(self):
+        since = urlencode({'since': (timezone.now() - datetime.timedelta(days=1)).isoformat()})
+        response, primary, replica = self.send(self.client, 'get', f"{reverse('task-sync')}?{since}")
+        self.assertEqual([task['id'] for task in response.data['changed']], [self.task.pk])
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_lagging_replica_falls_back_to_the_primary(self):
+        with mock.patch.object(replicas, 'measure_lag', return_value=60.0), self.assertLogs('core.db', 'WARNING'):
+            response, primary, replica = self.send(self.client, 'get', reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replicas.stats()['replicas'][REPLICA], {'healthy': False, 'lag': 60.0})
+
+    def test_unreachable_replica_falls_back_to_the_primary(self):
+        unreachable = mock.patch.object(replicas, 'measure_lag', side_effect=OperationalError('connection refused'))
+        with unreachable, self.assertLogs('core.db', 'WARNING'):
+            response, primary, _ = self.send(self.client, 'get', reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(primary, 0)
+
+    def test_lag_is_checked_once_per_interval(self):
+        with mock.patch.object(replicas, 'measure_lag', return_value=0.0) as measure_lag:
+            for _ in range(3):
+                self.send(self.client, 'get', reverse('task-list'))
+        measure_lag.assert_called_once_with(REPLICA)
+
+    def test_replica_status_for_admins(self):
+        response = self.client_for(self.admin).get(reverse('db-replicas'))
+        self.assertEqual(response.data, {'enabled': True, 'replicas': {REPLICA: {'healthy': True, 'lag': 0.0}}})
+        self.assertEqual(self.client.get(reverse('db-replicas')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+@routing()
+class ReplicaRouterTests(TransactionTestCase):
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close_pool()
+        super().tearDownClass()
+
+    def test_reads_outside_requests_and_inside_transactions_use_the_primary(self):
+        request = mock.Mock(user=User(pk=1))
+        self.assertEqual(router.db_for_read(User), 'default')
+        with replicas.reading(request):
+            self.assertEqual(router.db_for_read(User), REPLICA)
+        with transaction.atomic(), replicas.reading(mock.Mock(user=User(pk=1))):
+            self.assertEqual(router.db_for_read(User), 'default')
+
+    def test_writes_and_migrations_stay_on_the_primary(self):
+        user = User.objects.using(REPLICA).create(username='x', email='x@example.com')
+        self.assertEqual(router.db_for_write(User, instance=user), 'default')
+        self.assertFalse(router.allow_migrate(REPLICA, 'tasks'))
+        self.assertTrue(router.allow_migrate('default', 'tasks'))
+
+
+class ReplicaPinCheckTests(SimpleTestCase):
+    def cache(self, backend):
+        return override_settings(CACHES={'default': {'BACKEND': backend}})
+
+    def test_replicas_need_a_shared_cache_for_pins(self):
+        with routing(), self.cache('django.core.cache.backends.locmem.LocMemCache'):
+            self.assertEqual([error.id for error in check_replica_pins(None)], ['core.E001'])
+        with routing(), self.cache('django.core.cache.backends.redis.RedisCache'):
+            self.assertEqual(check_replica_pins(None), [])
+        with routing(ALIASES=[]), self.cache('django.core.cache.backends.locmem.LocMemCache'):
+            self.assertEqual(check_replica_pins(None), [])
@@ -0,0 +1,7 @@
+from django.conf import settings
+from django.test import override_settings
+
+
+def override_setting_dict(name, **options):
+    """override_settings() for the dict setting ``name``: ``options`` replace its keys, the rest are kept."""
+    return override_settings(**{name: {**getattr(settings, name), **options}})
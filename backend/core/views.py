@@ -0,0 +1,38 @@
+from django.db import connections
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .db import is_replica, pool_stats, replicas
+from .instrumentation import profiler
+from .permissions import IsAdmin
+
+
+class DatabasePoolView(APIView):
+    """Connection pool metrics per database alias, for the worker process that answers (Admin only)."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        # Replicas that reads are not routed to have no pool to report (asking would open one).
+        return Response({
+            alias: pool_stats(alias) for alias in connections
+            if not is_replica(alias) or alias in replicas.config['ALIASES']
+        })
+
+
+class DatabaseReplicasView(APIView):
+    """Read replica health and lag as this worker process last checked them (Admin only)."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(replicas.stats())
+
+
+class SlowRequestsView(APIView):
+    """The slowest requests sampled by the request profiler in the worker process that answers (Admin only)."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response({
+            'enabled': profiler.config.get('ENABLED', False),
+            'results': profiler.slowest.entries(),
+        })
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+
+from .events import TASK_DELETED
+from .models import TaskActivity
+
+# Field name in TaskActivity.changes -> Task attribute.
+TRACKED_FIELDS = {
+    'title': 'title',
+    'description': 'description',
+    'status': 'status',
+    'due_date': 'due_date',
+    'assigned_to': 'assigned_to_id',
+}
+
+
+def snapshot(task):
+    """The tracked values of ``task``; take it before the write."""
+    return {field: getattr(task, attname) for field, attname in TRACKED_FIELDS.items()}
+
+
+def activity_entries(action, tasks, snapshots, actor_id):
+    """
+    Unsaved TaskActivity rows, with {field: [old, new]} changes, for ``tasks``
+    written since their ``snapshots``. Tasks with nothing changed get none.
+    """
+    entries = []
+    for task, before in zip(tasks, snapshots):
+        after = snapshot(task)
+        changes = {field: [before[field], after[field]] for field in TRACKED_FIELDS if before[field] != after[field]}
+        if changes:
+            entries.append(TaskActivity(task_id=task.pk, actor_id=actor_id, action=action, changes=changes))
+    return entries
+
+
+def deletion_entry(task_id, before, actor_id):
+    """The TaskActivity row for a deleted task, keeping its last values as [old, None]."""
+    changes = {field: [value, None] for field, value in before.items() if value not in (None, '')}
+    return TaskActivity(task_id=task_id, actor_id=actor_id, action=TASK_DELETED, changes=changes)
+
+
+def record_activity(entries):
+    """
+    Write ``entries`` with one bulk_create. Call it last in the transaction
+    that saves the change, so the log commits or rolls back with the change
+    and a request adds one INSERT however many tasks it wrote.
+    """
+    TaskActivity.objects.bulk_create(entries)
+
+
+def retention_horizon(now):
+    return now - settings.TASK_ACTIVITY_RETENTION
+
+
+def prune_activity(horizon, batch_size=5000, pause=0.0):
+    """
+    Delete activity older than ``horizon``, oldest first, a batch per
+    statement; each batch seeks past the last id deleted, so no scan passes
+    over the dead index entries of earlier batches. Returns the number deleted.
+    """
+    expired = TaskActivity.objects.filter(created_at__lt=horizon).order_by('id')
+    total = last_id = 0
+    while True:
+        ids = list(expired.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        total += TaskActivity.objects.filter(id__in=ids).delete()[0]
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
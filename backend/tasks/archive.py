@@ -0,0 +1,58 @@
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import invalidate_tasks
+from .models import TaskStatus
+
+COLUMNS = 'id, title, description, status, due_date, assigned_to_id, created_by_id, created_at, updated_at'
+
+# One statement per batch: rows leave tasks_task and land in the archive atomically.
+# Rows locked by a concurrent update are skipped and picked up by a later run.
+ARCHIVE_SQL = f"""
+    WITH moved AS (
+        DELETE FROM tasks_task
+        WHERE id IN (
+            SELECT id FROM tasks_task
+            WHERE status = %(status)s AND updated_at < %(cutoff)s
+            ORDER BY updated_at
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING {COLUMNS}
+    )
+    INSERT INTO tasks_archivedtask ({COLUMNS}, archived_at)
+    SELECT {COLUMNS}, %(now)s FROM moved
+    RETURNING id, assigned_to_id
+"""
+
+
+def archive_completed_tasks(older_than=None, batch_size=None, pause=0.0, now=None):
+    """
+    Move COMPLETED tasks last updated more than ``older_than`` ago (default
+    ``settings.TASK_ARCHIVE_AFTER``) into tasks_archivedtask, a batch per short
+    transaction, and drop cached responses that listed them. Returns the
+    number of tasks archived.
+    """
+    now = now or timezone.now()
+    params = {
+        'status': TaskStatus.COMPLETED,
+        'cutoff': now - (older_than or settings.TASK_ARCHIVE_AFTER),
+        'limit': batch_size or settings.TASK_ARCHIVE_BATCH_SIZE,
+        'now': now,
+    }
+    total = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_SQL, params)
+            moved = cursor.fetchall()
+        if not moved:
+            return total
+        total += len(moved)
+        invalidate_tasks([task_id for task_id, _ in moved], [assignee_id for _, assignee_id in moved])
+        if len(moved) < params['limit']:
+            return total
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,155 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.async_views import AsyncViewSetMixin
+from core.conditional import not_modified, set_validators
+from .activity import activity_entries, record_activity, snapshot
+from .cache import ainvalidate_tasks, detail_tags, list_tags, request_key_parts, task_cache
+from .events import TASK_ASSIGNED, TASK_UPDATED, apublish_task_events
+from .views import TaskViewSet
+
+User = get_user_model()
+
+
+class AsyncTaskViewSet(AsyncViewSetMixin, TaskViewSet):
+    """
+    TaskViewSet with list, retrieve, partial_update and assign on the async ORM.
+    Served under ASGI (see core.middleware.async_api); other actions run the
+    sync implementations in a worker thread.
+    """
+    # Filters that may query while validating: assignee lookups and the pg_trgm probe.
+    blocking_filter_params = ('assigned_to', 'search')
+
+    async def afilter_queryset(self, queryset):
+        if self.request.query_params.keys() & set(self.blocking_filter_params):
+            return await sync_to_async(self.filter_queryset)(queryset)
+        return self.filter_queryset(queryset)
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    async def asave_task(self, event, task, previous_assignee_id, before, **kwargs):
+        """
+        task.asave(). A write that changes a tracked field also needs its
+        TaskActivity and record_changes() rows in the same transaction, which
+        the async ORM cannot open, so that save runs in a worker thread.
+        """
+        entries = activity_entries(event, [task], [before], self.request.user.pk)
+        if entries:
+            await sync_to_async(self.save_task_changes)(task, previous_assignee_id, entries, **kwargs)
+        else:
+            await task.asave(**kwargs)
+
+    def save_task_changes(self, task, previous_assignee_id, entries, **kwargs):
+        with transaction.atomic():
+            task.save(**kwargs)
+            self.record_changes(self.task_changes([task], [previous_assignee_id]))
+            record_activity(entries)
+
+    async def atasks_changed(self, event, tasks, previous_assignee_ids):
+        """tasks_changed() after asave_task() has recorded the changes."""
+        changes = self.task_changes(tasks, previous_assignee_ids)
+        await ainvalidate_tasks(*self.changed_task_and_assignee_ids(changes))
+        await apublish_task_events(event, tasks, previous_assignee_ids)
+
+    async def list(self, request, *args, **kwargs):
+        return await task_cache.arespond(
+            request,
+            request_key_parts(request, 'list'),
+            list_tags(request.user),
+            self.alist_response,
+        )
+
+    async def alist_response(self):
+        request = self.request
+        queryset = await self.afilter_queryset(self.get_queryset())
+        etag, last_modified = await self.aget_list_validators(queryset)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            rows = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            data = await self.get_serializer(many=True).ato_representation(rows)
+            response = self.paginator.get_paginated_response(data)
+        return set_validators(response, etag, last_modified)
+
+    async def retrieve(self, request, *args, **kwargs):
+        # The URL converter makes pk an int; keep cache keys identical to the sync view's.
+        pk = str(kwargs[self.lookup_field])
+        return await task_cache.arespond(
+            request,
+            request_key_parts(request, 'retrieve', pk),
+            detail_tags(pk),
+            self.aretrieve_response,
+        )
+
+    async def aretrieve_response(self):
+        instance = await self.aget_object()
+        etag, last_modified = self.get_object_validators(instance)
+        return self.conditional_response(
+            etag, last_modified, lambda: Response(self.get_serializer(instance).data)
+        )
+
+    async def partial_update(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        denied = self.check_member_update(request, instance)
+        if denied is not None:
+            return denied
+
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        # PrefetchedUserField resolves the assignee from here instead of querying; a body
+        # that is not an object is left for is_valid() to reject, as the sync view does.
+        user_id = request.data.get('assigned_to_id') if isinstance(request.data, dict) else None
+        serializer.context['prefetched_users'] = await self.aprefetch_users(user_id)
+        serializer.is_valid(raise_exception=True)
+
+        # ModelSerializer.update(): Task has no many-to-many fields.
+        previous_assignee_id = instance.assigned_to_id
+        before = snapshot(instance)
+        for attr, value in serializer.validated_data.items():
+            setattr(instance, attr, value)
+        await self.asave_task(TASK_UPDATED, instance, previous_assignee_id, before)
+        await self.atasks_changed(TASK_UPDATED, [instance], [previous_assignee_id])
+
+        return Response(serializer.data)
+
+    async def aprefetch_users(self, user_id):
+        try:
+            return await User.objects.ain_bulk([int(user_id)])
+        except (TypeError, ValueError):
+            return {}
+
+    async def assign(self, request, pk=None):
+        """Assign task to a user (Manager/Admin only)."""
+        task = await self.aget_object()
+        previous_assignee_id = task.assigned_to_id
+        before = snapshot(task)
+        user_id = request.data.get('user_id')
+
+        if not user_id:
+            task.assigned_to = None
+        else:
+            try:
+                assignee = await User.objects.aget(id=user_id)
+            except User.DoesNotExist:
+                return Response(
+                    {'detail': 'User not found.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            task.assigned_to = assignee
+
+        await self.asave_task(TASK_ASSIGNED, task, previous_assignee_id, before,
+                              update_fields=['assigned_to', 'updated_at'])
+        await self.atasks_changed(TASK_ASSIGNED, [task], [previous_assignee_id])
+
+        return Response(self.get_serializer(task).data)
@@ -0,0 +1,59 @@
+from core.cache import ResponseCache
+
+task_cache = ResponseCache('tasks')
+
+# Nested user payloads (UserLiteSerializer) appear in every task response.
+USERS_TAG = 'users'
+# The user fields those payloads embed; saving a change to one invalidates USERS_TAG.
+USER_PAYLOAD_FIELDS = ('username', 'email', 'role')
+ALL_TASKS_TAG = 'all'
+
+
+def assignee_tag(user_id):
+    return f'assignee:{user_id}'
+
+
+def task_tag(task_id):
+    return f'task:{task_id}'
+
+
+def request_key_parts(request, action, *extra):
+    """
+    Scope entries by role, user, the normalized query string and the accepted
+    renderer, whose format decides how datetimes are left in the cached data.
+    """
+    user = request.user
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    renderer = getattr(request.accepted_renderer, 'format', None)
+    return (action, user.role, user.pk, request.get_host(), params, renderer, *extra)
+
+
+def list_tags(user):
+    return [USERS_TAG, assignee_tag(user.pk) if user.is_member else ALL_TASKS_TAG]
+
+
+def detail_tags(task_id):
+    return [USERS_TAG, task_tag(task_id)]
+
+
+def task_change_tags(task_ids, assignee_ids):
+    tags = {ALL_TASKS_TAG}
+    tags.update(task_tag(task_id) for task_id in task_ids)
+    tags.update(assignee_tag(user_id) for user_id in assignee_ids if user_id is not None)
+    return tags
+
+
+def invalidate_tasks(task_ids, assignee_ids):
+    """
+    Drop cached lists and details that may include the given tasks.
+    ``assignee_ids`` must cover assignees both before and after the write.
+    """
+    task_cache.invalidate(*task_change_tags(task_ids, assignee_ids))
+
+
+async def ainvalidate_tasks(task_ids, assignee_ids):
+    await task_cache.ainvalidate(*task_change_tags(task_ids, assignee_ids))
+
+
+def invalidate_users():
+    task_cache.invalidate(USERS_TAG)
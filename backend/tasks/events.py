@@ -0,0 +1,95 @@
+import json
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from core.events import ChangeFeed
+from .serializers import TaskReadSerializer
+
+TASK_CREATED = 'task.created'
+TASK_UPDATED = 'task.updated'
+TASK_ASSIGNED = 'task.assigned'
+TASK_DELETED = 'task.deleted'
+# Sent to a member instead of the real event when a task is reassigned away from them.
+TASK_REMOVED = 'task.removed'
+
+task_feed = ChangeFeed('tasks')
+
+
+def _ticket_key(ticket):
+    return f'tasks:stream-ticket:{ticket}'
+
+
+def issue_stream_ticket(user_id):
+    """
+    A random ticket that opens one event stream as ``user_id`` within
+    TASK_EVENTS_TICKET_TTL seconds. EventSource cannot send headers, so it
+    goes in the URL instead of the JWT, and access logs only see spent tickets.
+    """
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(ticket), user_id, settings.TASK_EVENTS_TICKET_TTL)
+    return ticket
+
+
+async def aredeem_stream_ticket(ticket):
+    """The user id ``ticket`` was issued to, or None; a ticket is redeemed once."""
+    key = _ticket_key(ticket)
+    user_id = await cache.aget(key)
+    # Of concurrent redeemers, only the one whose delete removed the key wins.
+    if user_id is None or not await cache.adelete(key):
+        return None
+    return user_id
+
+
+def publish_task_events(event, tasks, previous_assignee_ids):
+    """
+    Publish one ``event`` per task on the change feed once the surrounding
+    transaction commits; the tasks are serialized only then.
+    """
+    def publish():
+        if task_feed.active:
+            payloads = TaskReadSerializer(tasks, many=True).data
+            task_feed.publish(task_events(event, payloads, previous_assignee_ids))
+
+    transaction.on_commit(publish)
+
+
+async def apublish_task_events(event, tasks, previous_assignee_ids):
+    """publish_task_events() for async views, which run in autocommit mode."""
+    if task_feed.active:
+        payloads = await TaskReadSerializer(many=True).ato_representation(tasks)
+        task_feed.publish(task_events(event, payloads, previous_assignee_ids))
+
+
+def task_events(event, payloads, previous_assignee_ids):
+    return [
+        {'event': event, 'id': data['id'], 'task': data, 'previous_assignee_id': previous}
+        for data, previous in zip(payloads, previous_assignee_ids)
+    ]
+
+
+def publish_task_deleted(task_id, assignee_id):
+    events = [{'event': TASK_DELETED, 'id': task_id, 'task': None, 'previous_assignee_id': assignee_id}]
+    transaction.on_commit(lambda: task_feed.publish(events))
+
+
+def scope_event(user, event):
+    """
+    What ``user`` may see of ``event``, mirroring TaskViewSet.get_queryset:
+    members only hear about tasks assigned to them, or that just stopped being.
+    """
+    if not user.is_member:
+        return event
+    task = event['task']
+    if task is not None and task['assigned_to_id'] == user.pk:
+        return event
+    if event['previous_assignee_id'] == user.pk:
+        return {'event': TASK_DELETED if task is None else TASK_REMOVED, 'id': event['id']}
+    return None
+
+
+def format_sse(event):
+    return f"event: {event['event']}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
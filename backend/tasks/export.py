@@ -0,0 +1,82 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+
+from .serializers import TaskReadSerializer, UserLiteSerializer
+
+User = get_user_model()
+
+CSV_COLUMNS = (
+    'id', 'title', 'description', 'status', 'due_date',
+    'assigned_to_id', 'assigned_to', 'created_by_id', 'created_by',
+    'created_at', 'updated_at',
+)
+
+
+class Echo:
+    """File-like object whose write() hands back the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_tasks(queryset, chunk_size=2000):
+    """
+    Yield TaskReadSerializer dicts, reading rows through a server-side cursor.
+    Users are loaded once per chunk for the ids not seen yet, so memory is bounded
+    by the number of users rather than the number of tasks.
+    """
+    serializer = TaskReadSerializer()
+    format_datetime, format_date = serializer.formatters()
+    rows = queryset.values(*TaskReadSerializer.value_fields).iterator(chunk_size=chunk_size)
+    users = {}
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        missing = {row['assigned_to_id'] for row in chunk} | {row['created_by_id'] for row in chunk}
+        missing -= users.keys()
+        missing.discard(None)
+        if missing:
+            users.update(
+                (user['id'], user)
+                for user in User.objects.filter(pk__in=missing).values(*UserLiteSerializer.Meta.fields)
+            )
+        for row in chunk:
+            yield serializer.represent(row, users, format_datetime, format_date)
+
+
+def ndjson_lines(tasks):
+    for task in tasks:
+        yield json.dumps(task, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+async def aiter_lines(lines, batch_size=200):
+    """
+    ``lines`` as an async iterator for StreamingHttpResponse under ASGI, which
+    would otherwise read a sync iterator to the end into memory first. Each
+    batch is read on the request's thread-sensitive thread, where the
+    server-side cursor lives, and sent as one chunk.
+    """
+    next_batch = sync_to_async(lambda: list(islice(lines, batch_size)))
+    try:
+        while batch := await next_batch():
+            yield ''.join(batch)
+    finally:
+        await sync_to_async(lines.close)()
+
+
+def csv_lines(tasks):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for task in tasks:
+        assigned_to = task['assigned_to']
+        yield writer.writerow([
+            task['id'], task['title'], task['description'], task['status'], task['due_date'],
+            task['assigned_to_id'], assigned_to['username'] if assigned_to else '',
+            task['created_by']['id'], task['created_by']['username'],
+            task['created_at'], task['updated_at'],
+        ])
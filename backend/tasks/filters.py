@@ -1,5 +1,16 @@
+import re
+from functools import lru_cache
+
 import django_filters
-from .models import Task
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from rest_framework.filters import SearchFilter
+
+from .models import Task, TaskWithArchive
+
+WORD_RE = re.compile(r'\w+')
 
 
 class TaskFilter(django_filters.FilterSet):
@@ -10,3 +21,42 @@ class TaskFilter(django_filters.FilterSet):
             'assigned_to': ['exact'],
             'due_date': ['lt', 'gt'],
         }
+
+
+class TaskWithArchiveFilter(TaskFilter):
+    class Meta(TaskFilter.Meta):
+        model = TaskWithArchive
+
+
+@lru_cache(maxsize=None)
+def trigram_available(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class TaskSearchFilter(SearchFilter):
+    """
+    Full-text search over Task.search_vector instead of ILIKE scans.
+    Each word matches as a prefix; with pg_trgm installed, titles within
+    a typo of the input match too. Results are ranked unless ?ordering= is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        words = WORD_RE.findall(' '.join(self.get_search_terms(request)))
+        if not words:
+            return queryset
+
+        text = ' '.join(words)
+        query = SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config='english')
+        matches = Q(search_vector=query)
+        rank = SearchRank(F('search_vector'), query)
+        if trigram_available(queryset.db):
+            matches |= Q(title__trigram_word_similar=text)
+            rank = rank + TrigramWordSimilarity(text, 'title')
+
+        # ts_rank() is a float4; a float8 rank survives the keyset cursor round trip exactly.
+        queryset = queryset.annotate(search_rank=Cast(rank, FloatField())).filter(matches)
+        if not queryset.query.order_by:
+            queryset = queryset.order_by('-search_rank', *queryset.model._meta.ordering, '-id')
+        return queryset
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tasks.archive import archive_completed_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Move completed tasks not updated for --days (default TASK_ARCHIVE_AFTER) '
+        'into the archive table, in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int)
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        older_than = timedelta(days=options['days']) if options['days'] is not None else None
+        total = archive_completed_tasks(older_than, options['batch_size'], options['pause'])
+        self.stdout.write(f'Archived {total} completed tasks.')
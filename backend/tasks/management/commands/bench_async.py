@@ -0,0 +1,101 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+
+from tasks.models import Task, TaskStatus
+from users.serializers import UsernameTokenObtainPairSerializer
+
+User = get_user_model()
+
+SEED_PREFIX = 'bench-async'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the sync (WSGI handler, thread pool) and async (ASGI handler, '
+        'config.async_urls) task list and detail views at several concurrency levels. '
+        'Requests go through the full middleware and view stack in-process, so network and '
+        'server overhead are excluded. Seeded rows are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[100, 1_000])
+        parser.add_argument('--threads', type=int, default=32,
+                            help='Worker threads serving the sync views (gunicorn --threads).')
+        parser.add_argument('--tasks', type=int, default=2_000)
+        parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled.')
+
+    def handle(self, *args, **options):
+        manager, task_ids = self.seed(options['tasks'])
+        headers = {'Authorization': f'Bearer {UsernameTokenObtainPairSerializer.get_token(manager).access_token}'}
+        paths = ['/api/tasks/?page_size=50'] + [f'/api/tasks/{task_id}/' for task_id in task_ids[:50]]
+        cache = {} if options['cache'] else {'RESPONSE_CACHE': {'BACKEND': ''}}
+
+        try:
+            with override_settings(**cache):
+                self.stdout.write(f"{'mode':<6} {'conns':>6} {'req/s':>9} {'p50':>9} {'p95':>9} {'errors':>7}")
+                for concurrency in options['concurrency']:
+                    urls = [paths[n % len(paths)] for n in range(concurrency)]
+                    self.report('sync', concurrency, *self.run_sync(urls, headers, options['threads']))
+                    self.report('async', concurrency, *asyncio.run(self.run_async(urls, headers)))
+        finally:
+            Task.objects.filter(title__startswith=SEED_PREFIX).delete()
+            User.objects.filter(username__startswith=SEED_PREFIX).delete()
+
+    def run_sync(self, urls, headers, threads):
+        def fetch(url):
+            start = time.perf_counter()
+            response = Client().get(url, headers=headers)
+            return time.perf_counter() - start, response.status_code
+
+        start = time.perf_counter()
+        # Each worker thread keeps its own connection, as a threaded WSGI worker would.
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(fetch, urls))
+        return time.perf_counter() - start, results
+
+    async def run_async(self, urls, headers):
+        client = AsyncClient()
+
+        async def fetch(url):
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            return time.perf_counter() - start, response.status_code
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(fetch(url) for url in urls))
+        return time.perf_counter() - start, results
+
+    def report(self, mode, concurrency, elapsed, results):
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status_code in results if status_code != 200)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f'{mode:<6} {concurrency:>6} {len(results) / elapsed:>9.0f} '
+            f'{statistics.median(latencies) * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms {errors:>7}'
+        )
+
+    def seed(self, count):
+        manager = User.objects.create_user(
+            f'{SEED_PREFIX}-manager', f'{SEED_PREFIX}-manager@example.com', None, role='MANAGER'
+        )
+        members = User.objects.bulk_create(
+            User(username=f'{SEED_PREFIX}-{n}', email=f'{SEED_PREFIX}-{n}@example.com', role='MEMBER', password='!')
+            for n in range(20)
+        )
+        statuses = list(TaskStatus.values)
+        tasks = Task.objects.bulk_create(
+            Task(
+                title=f'{SEED_PREFIX} {n}',
+                status=statuses[n % len(statuses)],
+                assigned_to=members[n % len(members)],
+                created_by=manager,
+            )
+            for n in range(count)
+        )
+        return manager, [task.pk for task in tasks]
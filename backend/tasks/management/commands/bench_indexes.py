@@ -0,0 +1,159 @@
+import datetime
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.archive import COLUMNS
+from tasks.models import Task, TaskStatus
+from tasks.views import TaskViewSet
+
+User = get_user_model()
+
+SEED_SQL = """
+    INSERT INTO tasks_task
+        (created_at, updated_at, title, description, status, due_date, assigned_to_id, created_by_id)
+    SELECT
+        now() - (n || ' seconds')::interval,
+        now() - (n || ' seconds')::interval,
+        'Task ' || n,
+        '',
+        CASE WHEN n %% 10 < 7 THEN 'COMPLETED' WHEN n %% 10 < 9 THEN 'TODO' ELSE 'IN_PROGRESS' END,
+        CASE WHEN n %% 4 = 0 THEN NULL ELSE current_date + (n %% 120 - 60) END,
+        (%(user_ids)s::bigint[])[1 + n %% %(user_count)s],
+        (%(user_ids)s::bigint[])[1 + (n / 7) %% %(user_count)s]
+    FROM generate_series(1, %(rows)s) AS n
+"""
+
+# Half the completed tasks, moved the way tasks.archive does.
+ARCHIVE_SEED_SQL = f"""
+    WITH moved AS (
+        DELETE FROM tasks_task WHERE status = 'COMPLETED' AND id % 2 = 0 RETURNING {COLUMNS}
+    )
+    INSERT INTO tasks_archivedtask ({COLUMNS}, archived_at)
+    SELECT {COLUMNS}, now() FROM moved
+"""
+
+SEQ_SCAN_RE = re.compile(r'Seq Scan on tasks_(task|archivedtask)\b')
+# A Sort plan node, as opposed to the "Sort Key" of a Merge Append.
+SORT_NODE_RE = re.compile(r'^(\s*->)?\s*(Incremental )?Sort\s+\(', re.MULTILINE)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed large task and archive tables inside a transaction and EXPLAIN the queries TaskViewSet '
+        'runs for a page past the first, built by the view and its paginator. Fails on '
+        'sequential scans of either table, or on sorts where an index should supply the order. '
+        'PostgreSQL only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--keep', action='store_true', help='Commit the seeded rows instead of rolling back.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_indexes requires PostgreSQL.')
+
+        failures = []
+        with transaction.atomic():
+            admin, member = self.seed(options['rows'], options['users'])
+            for name, queryset, index_ordered in self.queries(admin, member):
+                plan = queryset.explain()
+                problems = []
+                if SEQ_SCAN_RE.search(plan):
+                    problems.append('SEQ')
+                if index_ordered and SORT_NODE_RE.search(plan):
+                    problems.append('SORT')
+                failures.extend([name] if problems else [])
+                self.stdout.write(f"{'/'.join(problems) or 'ok':<8} {name}")
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Queries not served by an index: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('All task queries use indexes.'))
+
+    def seed(self, rows, user_count):
+        users = User.objects.bulk_create(
+            User(username=f'bench-idx-{n}', email=f'bench-idx-{n}@example.com',
+                 role='ADMIN' if n == 0 else 'MEMBER', password='!')
+            for n in range(user_count)
+        )
+        user_ids = [user.pk for user in users]
+        with connection.cursor() as cursor:
+            cursor.execute(SEED_SQL, {'user_ids': user_ids, 'user_count': user_count, 'rows': rows})
+            cursor.execute(ARCHIVE_SEED_SQL)
+            cursor.execute('ANALYZE tasks_task, tasks_archivedtask')
+        return users[0], users[1]
+
+    def queries(self, admin, member):
+        """(name, queryset, whether an index must supply the order) for each query shape."""
+        today = timezone.localdate()
+        since = timezone.now() - datetime.timedelta(days=2)
+
+        def sync(view):
+            return view.changed_since(since)
+
+        pages = [
+            ('list', self.next_page(admin), True),
+            ('list by due date', self.next_page(admin, ordering='due_date'), True),
+            ('member list', self.next_page(member), True),
+            # The seed gives this member only completed tasks.
+            ('member list by status', self.next_page(member, status=TaskStatus.COMPLETED), True),
+            ('status + due range', self.next_page(
+                admin,
+                status=TaskStatus.IN_PROGRESS,
+                due_date__gt=today.isoformat(),
+                due_date__lt=(today + datetime.timedelta(days=7)).isoformat(),
+            ), False),
+            ('sync', self.next_page(admin, 'sync', build=sync), True),
+            # Few enough rows past the watermark that sorting them can beat an ordered scan.
+            ('member sync', self.next_page(member, 'sync', build=sync), False),
+            # The UNION ALL view: a Merge Append of both tables' index scans.
+            ('list with archive', self.next_page(admin, include_archived='true'), True),
+            ('member list with archive', self.next_page(member, include_archived='true'), True),
+        ]
+        queries = [
+            (name if n == 0 else f'{name} (segment {n + 1})', segment, index_ordered)
+            for name, segments, index_ordered in pages
+            for n, segment in enumerate(segments)
+        ]
+        # Not paged by any route; the access path task_open_due_idx exists for.
+        queries.append(('open overdue', Task.objects.filter(
+            ~Q(status=TaskStatus.COMPLETED), due_date__lt=today,
+        ).order_by('due_date')[:51], True))
+        return queries
+
+    def next_page(self, user, action='list', build=None, **params):
+        """
+        The querysets TaskViewSet reads for the second page of ``params``:
+        filtered by the view (or ``build(view)``), with the seeks and ORDER BY
+        of its paginator.
+        """
+        build = build or (lambda view: view.filter_queryset(view.get_queryset()))
+        factory = APIRequestFactory()
+        view = self.view(Request(factory.get('/api/tasks/', params)), user, action)
+        paginator = view.paginator
+        paginator.paginate_queryset(build(view), view.request, view)
+        next_link = paginator.get_next_link()
+        if next_link is None:
+            raise CommandError(f'Only one page of tasks for {action} {params}; seed more --rows.')
+
+        view = self.view(Request(factory.get(next_link)), user, action)
+        paginator = view.paginator
+        segments = paginator.page_segments(build(view), view.request)
+        return [segment[:paginator.page_size + 1] for segment in segments]
+
+    @staticmethod
+    def view(request, user, action):
+        request.user = user
+        return TaskViewSet(request=request, action=action, format_kwarg=None, args=(), kwargs={})
@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from core.compression import BrotliCoding, GzipCoding, brotli
+from core.renderers import ORJSONRenderer
+from tasks.models import Task
+from tasks.serializers import TaskReadSerializer, UserLiteSerializer
+from .bench_serializers import Command as SerializerBenchmark
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the CPU time of DRF\'s JSONRenderer and ORJSONRenderer (serialize + render, '
+        'rows already fetched) on task lists, and the bytes sent with each response coding. '
+        'Seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000])
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['sizes'])
+        config = settings.RESPONSE_COMPRESSION
+        codings = [GzipCoding(config['GZIP_LEVEL'])]
+        if brotli is not None:
+            codings.append(BrotliCoding(config['BROTLI_QUALITY']))
+
+        with transaction.atomic():
+            admin = SerializerBenchmark().seed(sizes[-1], options['users'])
+            self.stdout.write(
+                f"{'rows':>8} {'renderer':<16} {'cpu':>9} {'identity':>10}"
+                + ''.join(f' {coding.name:>9} {"(cpu)":>8}' for coding in codings)
+            )
+            for size in sizes:
+                rows = list(Task.objects.order_by('-id').values(*TaskReadSerializer.value_fields)[:size])
+                users = {user['id']: user for user in User.objects.values(*UserLiteSerializer.Meta.fields)}
+                for renderer in (JSONRenderer(), ORJSONRenderer()):
+                    request = APIRequestFactory().get('/')
+                    request.user, request.accepted_renderer = admin, renderer
+                    serializer = TaskReadSerializer(many=True, context={'request': request})
+                    cpu, body = self.best_of(
+                        options['repeat'], lambda: renderer.render(serializer.represent_rows(rows, users)),
+                    )
+                    line = f'{size:>8} {type(renderer).__name__:<16} {cpu * 1000:>7.1f}ms {len(body):>10}'
+                    for coding in codings:
+                        compress_cpu, compressed = self.best_of(options['repeat'], lambda: coding.compress(body))
+                        line += f' {len(compressed):>9} {compress_cpu * 1000:>6.1f}ms'
+                    self.stdout.write(line)
+
+            transaction.set_rollback(True)
+
+    def best_of(self, repeat, work):
+        """Lowest process CPU time over ``repeat`` runs, and the result."""
+        timings = []
+        for _ in range(repeat):
+            start = time.process_time()
+            result = work()
+            timings.append(time.process_time() - start)
+        return min(timings), result
@@ -0,0 +1,75 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from tasks.models import Task, TaskStatus
+from tasks.serializers import TaskReadSerializer, TaskSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare TaskSerializer with the TaskReadSerializer fast path (fetch + serialize + render) '
+        'on seeded tasks. Seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['sizes'])
+        with transaction.atomic():
+            admin = self.seed(sizes[-1], options['users'])
+            request = APIRequestFactory().get('/')
+            request.user = admin
+            context = {'request': request}
+
+            self.stdout.write(f"{'rows':>8} {'TaskSerializer':>16} {'TaskReadSerializer':>20} {'speedup':>8}")
+            for size in sizes:
+                slow = self.best_of(options['repeat'], lambda: TaskSerializer(
+                    Task.objects.select_related('assigned_to', 'created_by').order_by('-id')[:size],
+                    many=True, context=context,
+                ).data)
+                fast = self.best_of(options['repeat'], lambda: TaskReadSerializer(
+                    Task.objects.order_by('-id').values(*TaskReadSerializer.value_fields)[:size],
+                    many=True, context=context,
+                ).data)
+                self.stdout.write(f'{size:>8} {slow * 1000:>14.1f}ms {fast * 1000:>18.1f}ms {slow / fast:>7.1f}x')
+
+            transaction.set_rollback(True)
+
+    def best_of(self, repeat, serialize):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            JSONRenderer().render(serialize())
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def seed(self, rows, user_count):
+        users = User.objects.bulk_create(
+            User(username=f'bench-ser-{n}', email=f'bench-ser-{n}@example.com', role='MEMBER', password='!')
+            for n in range(user_count)
+        )
+        statuses = list(TaskStatus.values)
+        Task.objects.bulk_create(
+            (
+                Task(
+                    title=f'Task {n}',
+                    description='Lorem ipsum dolor sit amet ' * 4,
+                    status=statuses[n % len(statuses)],
+                    assigned_to=users[n % user_count] if n % 5 else None,
+                    created_by=users[(n // 7) % user_count],
+                )
+                for n in range(rows)
+            ),
+            batch_size=5_000,
+        )
+        return users[0]
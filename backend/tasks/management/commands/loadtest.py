@@ -0,0 +1,386 @@
+import datetime
+import http.client
+import json
+import math
+import platform
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from tasks.models import Task, TaskStatus
+from users.models import Roles
+from users.serializers import UsernameTokenObtainPairSerializer
+from .seed_tasks import NOUNS
+
+User = get_user_model()
+
+# Relative weight of each scenario in the default mix.
+DEFAULT_MIX = 'member_list=35,member_update_status=20,manager_list=20,manager_search=12,assign=10,login=3'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class InProcessTarget:
+    """Requests through django.test.Client: the full middleware and view stack, no network."""
+    name = 'in-process'
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def request(self, method, path, data=None, token=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        if method == 'GET':
+            return client.get(path, data, headers=headers).status_code
+        return client.generic(method, path, json.dumps(data), 'application/json', headers=headers).status_code
+
+    def close_thread(self):
+        connection.close()
+
+
+class HttpTarget:
+    """Requests to a running server over one keep-alive connection per worker thread."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise CommandError(f'Unsupported URL: {url}')
+        self.name = url
+        self.https = parts.scheme == 'https'
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._local.conn = connection_class(self.netloc, timeout=30)
+        return conn
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Accept': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        body = None
+        if method == 'GET':
+            if data:
+                path = f'{path}?{urlencode(data)}'
+        else:
+            body = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+        conn = self.connection()
+        try:
+            conn.request(method, self.prefix + path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            return 0
+
+    def close_thread(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+
+
+class Workload:
+    """
+    The actors and data a run draws from: members with their own task ids,
+    managers, assignable members and search words. Each scenario returns
+    (endpoint, method, path, data, token).
+    """
+
+    # The methods --mix may name; nothing else on the class is a scenario.
+    SCENARIOS = (
+        'member_list', 'member_update_status', 'manager_list', 'manager_search', 'directory', 'assign', 'login',
+    )
+
+    def __init__(self, prefix, password, actors, rng):
+        users = User.objects.filter(is_active=True)
+        if prefix:
+            users = users.filter(username__startswith=f'{prefix}-')
+
+        self.password = password
+        self.managers = self.sample(users.filter(role=Roles.MANAGER), actors, rng)
+        members = self.sample(users.filter(role=Roles.MEMBER), actors, rng)
+        own_tasks = {}
+        for task_id, assignee_id in Task.objects.filter(assigned_to__in=members).values_list('id', 'assigned_to_id'):
+            tasks = own_tasks.setdefault(assignee_id, [])
+            if len(tasks) < 20:
+                tasks.append(task_id)
+        self.members = [member for member in members if member.pk in own_tasks]
+        self.own_tasks = own_tasks
+        if not self.members or not self.managers:
+            raise CommandError('Need active members with tasks and managers; run seed_tasks first.')
+
+        # Assign moves tasks no member here edits, so status updates keep hitting the editor's own tasks.
+        self.assignable = [member.pk for member in self.members]
+        self.task_ids = list(
+            Task.objects.exclude(assigned_to__in=self.members).order_by('-id').values_list('id', flat=True)[:10_000]
+        ) or [task_id for tasks in own_tasks.values() for task_id in tasks]
+        self.tokens = {
+            user.pk: str(UsernameTokenObtainPairSerializer.get_token(user).access_token)
+            for user in self.members + self.managers
+        }
+        self.rng = rng
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sample(users, count, rng):
+        ids = list(users.order_by('id').values_list('id', flat=True))
+        return list(User.objects.filter(pk__in=rng.sample(ids, min(count, len(ids)))).order_by('id'))
+
+    def choice(self, values):
+        # random.Random is not safe to share between threads.
+        with self._lock:
+            return self.rng.choice(values)
+
+    def member_list(self):
+        member = self.choice(self.members)
+        params = {'status': self.choice(TaskStatus.values)} if self.choice((True, False)) else {}
+        return 'GET /tasks/ (member)', 'GET', '/api/tasks/', params, self.tokens[member.pk]
+
+    def member_update_status(self):
+        member = self.choice(self.members)
+        task_id = self.choice(self.own_tasks[member.pk])
+        return (
+            'PATCH /tasks/:id/ (status)', 'PATCH', f'/api/tasks/{task_id}/',
+            {'status': self.choice(TaskStatus.values)}, self.tokens[member.pk],
+        )
+
+    def manager_list(self):
+        manager = self.choice(self.managers)
+        today = timezone.localdate()
+        params = {
+            'status': self.choice(TaskStatus.values),
+            'due_date__gt': (today - datetime.timedelta(days=30)).isoformat(),
+            'due_date__lt': (today + datetime.timedelta(days=30)).isoformat(),
+            'ordering': self.choice(('due_date', '-created_at')),
+        }
+        if self.choice((True, False, False)):
+            params['assigned_to'] = self.choice(self.assignable)
+        return 'GET /tasks/ (filtered)', 'GET', '/api/tasks/', params, self.tokens[manager.pk]
+
+    def manager_search(self):
+        manager = self.choice(self.managers)
+        word = self.choice(NOUNS).split()[0]
+        return 'GET /tasks/?search=', 'GET', '/api/tasks/', {'search': word}, self.tokens[manager.pk]
+
+    def directory(self):
+        # Typeahead in the assignee picker: a few leading characters of someone's username.
+        manager = self.choice(self.managers)
+        username = self.choice(self.members).username
+        prefix = username[:self.choice(range(1, len(username) + 1))]
+        return 'GET /users/directory/?q=', 'GET', '/api/users/directory/', {'q': prefix}, self.tokens[manager.pk]
+
+    def assign(self):
+        manager = self.choice(self.managers)
+        task_id = self.choice(self.task_ids)
+        return (
+            'POST /tasks/:id/assign/', 'POST', f'/api/tasks/{task_id}/assign/',
+            {'user_id': self.choice(self.assignable)}, self.tokens[manager.pk],
+        )
+
+    def login(self):
+        user = self.choice(self.members + self.managers)
+        return (
+            'POST /auth/login/', 'POST', '/api/auth/login/',
+            {'username': user.username, 'password': self.password}, None,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive a mixed workload (member list and status updates, manager filtered list, search '
+        'and assign, login) against a running server (--url) or in-process through the full '
+        'Django stack, and report throughput and p50/p95/p99 latency per endpoint. '
+        'Seed data with seed_tasks first. Writes (status updates, assignments) are kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server, e.g. http://localhost:8000. '
+                                          'Default: in-process.')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run.')
+        parser.add_argument('--requests', type=int, help='Stop after this many requests instead.')
+        parser.add_argument('--concurrency', type=int, default=16, help='Worker threads.')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'scenario=weight,... (default {DEFAULT_MIX})')
+        parser.add_argument('--prefix', default='load', help='Only act as users seeded with this prefix.')
+        parser.add_argument('--password', default='load-test-pass', help='Password of the seeded users.')
+        parser.add_argument('--actors', type=int, default=200, help='Members and managers to act as.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--no-cache', action='store_true', help='Disable the response cache (in-process only).')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='A previous --output file to compare against.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        mix = self.parse_mix(options['mix'])
+        workload = Workload(options['prefix'], options['password'], options['actors'], rng)
+        target = HttpTarget(options['url']) if options['url'] else InProcessTarget()
+
+        scenarios = [getattr(workload, name) for name in mix]
+        cum_weights = []
+        for weight in mix.values():
+            cum_weights.append((cum_weights[-1] if cum_weights else 0) + weight)
+
+        overrides = {'RESPONSE_CACHE': {'BACKEND': ''}} if options['no_cache'] and not options['url'] else {}
+        with override_settings(**overrides):
+            elapsed, samples = self.run(target, workload, scenarios, cum_weights, options)
+
+        results = self.summarize(target, options, elapsed, samples)
+        self.report(results, self.load_baseline(options['baseline']))
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def parse_mix(self, spec):
+        mix = {}
+        for part in spec.split(','):
+            name, _, weight = part.partition('=')
+            name = name.strip()
+            if name not in Workload.SCENARIOS:
+                raise CommandError(f'Unknown scenario "{name}"; choose from {", ".join(Workload.SCENARIOS)}.')
+            try:
+                mix[name] = float(weight or 1)
+            except ValueError:
+                raise CommandError(f'Invalid weight for "{name}": {weight}')
+        return mix
+
+    def run(self, target, workload, scenarios, cum_weights, options):
+        deadline = time.perf_counter() + options['duration']
+        remaining = [options['requests']]
+        lock = threading.Lock()
+        samples = []
+
+        def take():
+            if options['requests'] is None:
+                return time.perf_counter() < deadline
+            with lock:
+                remaining[0] -= 1
+                return remaining[0] >= 0
+
+        def worker():
+            local = []
+            try:
+                while take():
+                    with lock:
+                        scenario = rng.choices(scenarios, cum_weights=cum_weights)[0]
+                    endpoint, method, path, data, token = scenario()
+                    start = time.perf_counter()
+                    status_code = target.request(method, path, data, token)
+                    local.append((endpoint, time.perf_counter() - start, status_code))
+            finally:
+                target.close_thread()
+                with lock:
+                    samples.extend(local)
+
+        rng = random.Random(options['seed'] + 1)
+        start = time.perf_counter()
+        if options['concurrency'] == 1:
+            # On this thread (and connection), e.g. inside a test transaction.
+            close_thread, target.close_thread = target.close_thread, lambda: None
+            try:
+                worker()
+            finally:
+                target.close_thread = close_thread
+        else:
+            close_old_connections()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                for future in [pool.submit(worker) for _ in range(options['concurrency'])]:
+                    future.result()
+        return time.perf_counter() - start, samples
+
+    def summarize(self, target, options, elapsed, samples):
+        by_endpoint = {}
+        for endpoint, latency, status_code in samples:
+            by_endpoint.setdefault(endpoint, []).append((latency, status_code))
+
+        def stats(entries):
+            latencies = sorted(latency for latency, _ in entries)
+            return {
+                'requests': len(entries),
+                'errors': sum(1 for _, status_code in entries if not 200 <= status_code < 400),
+                'rps': round(len(entries) / elapsed, 1),
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+            }
+
+        return {
+            'started_at': timezone.now().isoformat(),
+            'target': target.name,
+            'elapsed_s': round(elapsed, 2),
+            'options': {
+                key: options[key]
+                for key in ('duration', 'requests', 'concurrency', 'mix', 'prefix', 'actors', 'seed', 'no_cache')
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'db_pool': bool(settings.DATABASES['default'].get('OPTIONS', {}).get('pool')),
+                'tasks': Task.objects.count(),
+                'users': User.objects.count(),
+            },
+            'total': stats([(latency, status_code) for _, latency, status_code in samples]) if samples else None,
+            'endpoints': {endpoint: stats(entries) for endpoint, entries in sorted(by_endpoint.items())},
+        }
+
+    def load_baseline(self, path):
+        if not path:
+            return None
+        try:
+            with open(path) as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+    def report(self, results, baseline):
+        header = f"{'endpoint':<28} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}"
+        if baseline:
+            header += f" {'Δp95':>8} {'Δreq/s':>8}"
+        self.stdout.write(header)
+
+        rows = list(results['endpoints'].items())
+        if results['total']:
+            rows.append(('total', results['total']))
+        for endpoint, stats in rows:
+            line = (
+                f"{endpoint:<28} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+                f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+            )
+            if baseline:
+                before = baseline['total'] if endpoint == 'total' else baseline['endpoints'].get(endpoint)
+                if before:
+                    line += (
+                        f" {self.change(stats['p95_ms'], before['p95_ms']):>8}"
+                        f" {self.change(stats['rps'], before['rps']):>8}"
+                    )
+            self.stdout.write(line)
+
+    @staticmethod
+    def change(now, before):
+        if not before:
+            return 'n/a'
+        return f'{(now - before) / before * 100:+.0f}%'
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.activity import prune_activity, retention_horizon
+
+
+class Command(BaseCommand):
+    help = 'Delete task activity older than TASK_ACTIVITY_RETENTION, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        horizon = retention_horizon(timezone.now())
+        total = prune_activity(horizon, options['batch_size'], options['pause'])
+        self.stdout.write(f'Deleted {total} activity entries older than {horizon.isoformat()}.')
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import TaskTombstone
+from tasks.sync import retention_horizon
+
+
+class Command(BaseCommand):
+    help = 'Delete sync tombstones older than TASK_TOMBSTONE_RETENTION, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        horizon = retention_horizon(timezone.now())
+        expired = TaskTombstone.objects.filter(removed_at__lt=horizon)
+        total = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += TaskTombstone.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f'Deleted {total} tombstones older than {horizon.isoformat()}.')
@@ -0,0 +1,162 @@
+import datetime
+import itertools
+import random
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import Task, TaskStatus
+from users.models import Roles
+
+User = get_user_model()
+
+VERBS = (
+    'Review', 'Fix', 'Update', 'Draft', 'Migrate', 'Test', 'Document', 'Refactor', 'Deploy', 'Plan',
+    'Investigate', 'Design', 'Clean up', 'Prepare', 'Schedule',
+)
+NOUNS = (
+    'invoice export', 'login flow', 'onboarding email', 'billing report', 'search index', 'release notes',
+    'customer survey', 'API client', 'dashboard', 'sprint backlog', 'vendor contract', 'budget sheet',
+    'support macros', 'database backup', 'mobile layout', 'payment webhook', 'audit log', 'roadmap',
+)
+DETAILS = (
+    'before the quarterly review', 'for the new region', 'after the outage', 'with the design team',
+    'for enterprise accounts', 'ahead of launch', 'per legal feedback', 'for the Monday sync',
+)
+SENTENCES = (
+    'Customers reported this twice last week.',
+    'Coordinate with finance before changing anything.',
+    'See the linked ticket for the full history.',
+    'Needs a second reviewer.',
+    'Blocked until the staging environment is refreshed.',
+    'Keep the old behaviour behind a flag.',
+    'Low risk, but touches several teams.',
+)
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create() store the created_at/updated_at values we set."""
+    fields = [model._meta.get_field('created_at'), model._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed users across roles and tasks with realistic status, due date and assignment '
+        'distributions for load testing. Every seeded user shares --password; usernames '
+        'start with --prefix so --clear can remove them (and their tasks) again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--tasks', type=int, default=50_000)
+        parser.add_argument('--days', type=int, default=365, help='Spread task creation over this many days.')
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--password', default='load-test-pass')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for repeatable data sets.')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded users and tasks first.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 3:
+            raise CommandError('--users must be at least 3 (one per role).')
+        prefix = options['prefix']
+        rng = random.Random(options['seed'])
+
+        if options['clear']:
+            # Tasks go with their creators (on_delete=CASCADE).
+            deleted, _ = User.objects.filter(username__startswith=f'{prefix}-').delete()
+            self.stdout.write(f'Deleted {deleted} rows from a previous seed.')
+        elif User.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f'Users with prefix "{prefix}-" exist; pass --clear or another --prefix.')
+
+        with transaction.atomic():
+            users = self.seed_users(options['users'], prefix, make_password(options['password']))
+            self.seed_tasks(options['tasks'], users, options['days'], options['batch_size'], rng)
+
+        counts = {role: len(members) for role, members in users.items()}
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {sum(counts.values())} users ({', '.join(f'{n} {role}' for role, n in counts.items())}) "
+            f"and {options['tasks']} tasks."
+        ))
+
+    def seed_users(self, count, prefix, password):
+        """About 1% admins and 10% managers; the rest are members."""
+        admins = max(1, count // 100)
+        managers = max(1, count // 10)
+        roles = [Roles.ADMIN] * admins + [Roles.MANAGER] * managers + [Roles.MEMBER] * (count - admins - managers)
+        created = User.objects.bulk_create(
+            User(
+                username=f'{prefix}-{role.lower()}-{n}',
+                email=f'{prefix}-{role.lower()}-{n}@example.com',
+                role=role,
+                password=password,
+            )
+            for n, role in enumerate(roles)
+        )
+        users = {role: [] for role in Roles.values}
+        for user in created:
+            users[user.role].append(user)
+        return users
+
+    def seed_tasks(self, count, users, days, batch_size, rng):
+        members = users[Roles.MEMBER]
+        creators = users[Roles.MANAGER] + users[Roles.ADMIN]
+        # A few members carry most of the work (Zipf-like).
+        weights = list(itertools.accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(members))))
+        now = timezone.now()
+        span = datetime.timedelta(days=days).total_seconds()
+        # Oldest first, so ids grow with created_at as they would in production.
+        ages = sorted((rng.random() * span for _ in range(count)), reverse=True)
+
+        with explicit_timestamps(Task):
+            for start in range(0, count, batch_size):
+                Task.objects.bulk_create(
+                    self.make_task(age / span, now - datetime.timedelta(seconds=age), now,
+                                   members, weights, creators, rng)
+                    for age in ages[start:start + batch_size]
+                )
+
+    def make_task(self, age, created_at, now, members, weights, creators, rng):
+        """``age`` runs from 0 (just created) to 1 (oldest)."""
+        # Old work is mostly done; recent work is mostly open.
+        if rng.random() < 0.15 + 0.8 * age:
+            status = TaskStatus.COMPLETED
+        else:
+            status = TaskStatus.IN_PROGRESS if rng.random() < 0.35 else TaskStatus.TODO
+
+        due_date = None
+        if rng.random() < 0.8:
+            due_date = (created_at + datetime.timedelta(days=rng.choice((1, 2, 3, 7, 7, 14, 14, 30, 60)))).date()
+
+        if rng.random() < 0.05:
+            assigned_to = None
+        else:
+            assigned_to = rng.choices(members, cum_weights=weights)[0]
+        # Members file some of their own tasks.
+        created_by = assigned_to if assigned_to and rng.random() < 0.1 else rng.choice(creators)
+
+        updated_at = min(now, created_at + datetime.timedelta(hours=rng.expovariate(1 / 48)))
+        description = '' if rng.random() < 0.3 else ' '.join(rng.sample(SENTENCES, rng.randint(1, 3)))
+        return Task(
+            title=f'{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(DETAILS)}',
+            description=description,
+            status=status,
+            due_date=due_date,
+            assigned_to=assigned_to,
+            created_by=created_by,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
@@ -1,4 +1,7 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from core.models import TimeStampedModel
 
@@ -21,10 +24,168 @@ class Task(TimeStampedModel):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, related_name='tasks_created', on_delete=models.CASCADE
     )
-   
+    # Maintained by Postgres; queried by tasks.filters.TaskSearchFilter.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('description', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination over the default ordering.
+            models.Index(fields=['-created_at', '-id'], name='task_created_idx'),
+            # Members only ever see their own tasks, optionally by status.
+            models.Index(fields=['assigned_to', '-created_at', '-id'], name='task_assignee_created_idx'),
+            models.Index(fields=['assigned_to', 'status', '-created_at', '-id'], name='task_assignee_status_idx'),
+            # TaskFilter status + due_date__lt/gt.
+            models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+            # ?ordering=due_date: dated tasks, then undated ones by id (see KeysetPagination).
+            models.Index(fields=['due_date', 'id'], name='task_due_idx'),
+            # /api/tasks/sync/: changes after the client's watermark, in keyset order.
+            models.Index(fields=['updated_at', 'id'], name='task_updated_idx'),
+            models.Index(fields=['assigned_to', 'updated_at', 'id'], name='task_assignee_updated_idx'),
+            # Open work is a small slice of the table once history builds up.
+            models.Index(
+                fields=['due_date'],
+                condition=~models.Q(status=TaskStatus.COMPLETED),
+                name='task_open_due_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='task_search_idx'),
+            # Candidates for tasks.archive, oldest first.
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(status=TaskStatus.COMPLETED),
+                name='task_completed_updated_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of tasks_task by tasks.archive, keeping its id
+    and timestamps. Only read through TaskWithArchive.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=TaskStatus.choices)
+    due_date = models.DateField(null=True, blank=True)
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.SET_NULL, null=True, blank=True
+    )
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('description', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_task_created_idx'),
+            models.Index(fields=['assigned_to', '-created_at', '-id'], name='archived_task_assignee_idx'),
+            # Sync reports tasks archived since the client's watermark as removed.
+            models.Index(fields=['archived_at'], name='archived_task_archived_idx'),
+            GinIndex(fields=['search_vector'], name='archived_task_search_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class TaskWithArchive(models.Model):
+    """
+    Read-only UNION ALL of tasks_task and tasks_archivedtask (a database view),
+    for ``?include_archived=true``. Postgres pushes filters and ORDER BY ...
+    LIMIT down into both tables' indexes. Mirrors Task's columns, so the view
+    is recreated by a migration whenever they change.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=TaskStatus.choices)
+    due_date = models.DateField(null=True, blank=True)
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.DO_NOTHING,
+        db_constraint=False, null=True, blank=True,
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    search_vector = SearchVectorField()
+
+    class Meta:
+        managed = False
+        db_table = 'tasks_task_with_archive'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.title
+
+
+class TaskTombstone(models.Model):
+    """
+    A task leaving someone's view, for /api/tasks/sync/: either deleted, or
+    (deleted=False) reassigned away from ``assigned_to``.
+    """
+    task_id = models.BigIntegerField()
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, null=True, blank=True
+    )
+    deleted = models.BooleanField(default=True)
+    removed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['removed_at'], name='tombstone_removed_idx'),
+            models.Index(fields=['assigned_to', 'removed_at'], name='tombstone_assignee_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task_id} removed at {self.removed_at}'
+
+
+class TaskActivity(models.Model):
+    """
+    One write to a task by ``actor``: ``changes`` maps each changed field to
+    [old, new]. Append-only and kept after the task is deleted or archived, so
+    neither task_id nor actor is constrained or cascaded; rows older than
+    TASK_ACTIVITY_RETENTION are removed by `manage.py prune_task_activity`.
+    """
+    task_id = models.BigIntegerField()
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.DO_NOTHING,
+        db_constraint=False, db_index=False, null=True, blank=True,
+    )
+    action = models.CharField(max_length=32)
+    changes = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'task activity'
+        indexes = [
+            # Keyset pagination of one task's history.
+            models.Index(fields=['task_id', '-created_at', '-id'], name='task_activity_task_idx'),
+            # Rows arrive in created_at order: a few pages of BRIN cover the whole table for pruning.
+            BrinIndex(fields=['created_at'], name='task_activity_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.action} {self.task_id} at {self.created_at}'
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+
+from core.outbox import enqueue
+from .events import TASK_ASSIGNED
+from .models import Task
+
+User = get_user_model()
+
+
+def enqueue_assignment_notifications(changes, actor_id):
+    """
+    Outbox messages for tasks given to a new assignee, other than ``actor_id``
+    taking a task themselves. Call in the transaction that saves the change.
+    ``changes`` holds (task_id, previous_assignee_id, new_assignee_id) triples.
+    """
+    enqueue(TASK_ASSIGNED, [
+        (new, {'task_id': task_id})
+        for task_id, previous, new in changes
+        if new is not None and new != previous and new != actor_id
+    ])
+
+
+def send_assignment_email(user_id, payloads):
+    """
+    Outbox handler: one email to ``user_id`` listing the tasks from
+    ``payloads`` still assigned to them; nothing when none are.
+    """
+    user = User.objects.filter(pk=user_id, is_active=True).exclude(email='').first()
+    if user is None:
+        return
+    task_ids = {payload['task_id'] for payload in payloads}
+    tasks = list(Task.objects.filter(pk__in=task_ids, assigned_to=user).order_by('due_date', 'id'))
+    if not tasks:
+        return
+
+    if len(tasks) == 1:
+        subject = f'You have been assigned "{tasks[0].title}"'
+    else:
+        subject = f'You have been assigned {len(tasks)} tasks'
+    lines = [f'Hi {user.username},', '', 'These tasks are now assigned to you:', '']
+    for task in tasks:
+        due = f' (due {task.due_date:%Y-%m-%d})' if task.due_date else ''
+        lines.append(f'- {task.title}{due}: {settings.FRONTEND_URL}/app/tasks/{task.pk}')
+    send_mail(subject, '\n'.join(lines), None, [user.email])
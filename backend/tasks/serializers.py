@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from rest_framework import serializers
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
-from .models import Task
+from core.instrumentation import TimedSerializerMixin, timer
+from core.renderers import renders_datetimes
+from .models import Task, TaskActivity
 
 User = get_user_model()
 
@@ -12,9 +17,70 @@ class UserLiteSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email', 'role')
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class PrefetchedUserField(serializers.PrimaryKeyRelatedField):
+    """Resolves ids from context['prefetched_users'] when a batch has loaded them."""
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get('prefetched_users')
+        if prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return prefetched[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class TaskListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    Batch create/update: referenced users are loaded with one query and
+    rows are written with bulk_create/bulk_update.
+    For updates, pass the target tasks as ``instance``; each item needs an ``id``.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            user_ids = set()
+            for item in data:
+                try:
+                    user_ids.add(int(item['assigned_to_id']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self.context['prefetched_users'] = User.objects.in_bulk(user_ids)
+            self.instances = {task.pk: task for task in self.instance or ()}
+            self.targets = []
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            try:
+                self.child.instance = self.instances[int(data['id'])]
+            except (KeyError, TypeError, ValueError):
+                raise serializers.ValidationError({'id': ['Task not found.']})
+            self.child.initial_data = data
+            self.targets.append(self.child.instance)
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        return Task.objects.bulk_create(Task(**attrs) for attrs in validated_data)
+
+    def update(self, instance, validated_data):
+        # bulk_update() skips auto_now, so stamp updated_at explicitly.
+        now = timezone.now()
+        fields = {'updated_at'}
+        for task, attrs in zip(self.targets, validated_data):
+            for attr, value in attrs.items():
+                setattr(task, attr, value)
+                fields.add(attr)
+            task.updated_at = now
+        Task.objects.bulk_update(self.targets, fields)
+        return self.targets
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     assigned_to = UserLiteSerializer(read_only=True)
-    assigned_to_id = serializers.PrimaryKeyRelatedField(
+    assigned_to_id = PrefetchedUserField(
         source='assigned_to',
         queryset=User.objects.all(),
         allow_null=True,
@@ -24,6 +90,7 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
+        list_serializer_class = TaskListSerializer
         fields = (
             'id',
             'title',
@@ -63,3 +130,121 @@ class TaskSerializer(serializers.ModelSerializer):
                 )
 
         return attrs
+
+
+
+class TaskReadListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """Loads every user referenced by the page with one query and serializes each once."""
+
+    def to_representation(self, data):
+        rows = list(data.all() if hasattr(data, 'all') else data)
+        users = {user['id']: user for user in self.users(rows)}
+        return self.represent_rows(rows, users)
+
+    async def ato_representation(self, rows):
+        """to_representation() for async views, given already fetched rows."""
+        users = {user['id']: user async for user in self.users(rows)}
+        with timer('serialize'):
+            return self.represent_rows(rows, users)
+
+    def users(self, rows):
+        user_ids = set()
+        for row in rows:
+            user_ids.update((self.child.get(row, 'assigned_to_id'), self.child.get(row, 'created_by_id')))
+        user_ids.discard(None)
+        return User.objects.filter(pk__in=user_ids).values(*UserLiteSerializer.Meta.fields)
+
+    def represent_rows(self, rows, users):
+        format_datetime, format_date = self.child.formatters()
+        return [self.child.represent(row, users, format_datetime, format_date) for row in rows]
+
+
+class TaskReadSerializer(TimedSerializerMixin, serializers.BaseSerializer):
+    """
+    Read-only fast path for list/retrieve producing the same JSON as TaskSerializer.
+    Accepts Task instances or rows from ``queryset.values(*TaskReadSerializer.value_fields)``.
+    """
+    value_fields = (
+        'id', 'title', 'description', 'status', 'due_date',
+        'assigned_to_id', 'created_by_id', 'created_at', 'updated_at',
+    )
+    datetime_field = serializers.DateTimeField()
+    date_field = serializers.DateField()
+
+    class Meta:
+        list_serializer_class = TaskReadListSerializer
+
+    @staticmethod
+    def get(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    @staticmethod
+    def user_data(user):
+        return {field: getattr(user, field) for field in UserLiteSerializer.Meta.fields}
+
+    def formatters(self):
+        """
+        (datetime, date) formatters for represent(). Values are left for the
+        renderer to write when it produces the same ISO 8601 text itself.
+        """
+        native = renders_datetimes(self.context)
+        return self.datetime_formatter(native), self.date_formatter(native)
+
+    def datetime_formatter(self, native=False):
+        """DateTimeField.to_representation with the timezone lookup hoisted out of the row loop."""
+        if api_settings.DATETIME_FORMAT != ISO_8601 or not settings.USE_TZ:
+            return self.datetime_field.to_representation
+        current_timezone = timezone.get_current_timezone()
+        if native:
+            return lambda value: value.astimezone(current_timezone)
+
+        def format_datetime(value):
+            value = value.astimezone(current_timezone).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+        return format_datetime
+
+    def date_formatter(self, native=False):
+        if native and api_settings.DATE_FORMAT == ISO_8601:
+            return lambda value: value
+        return self.date_field.to_representation
+
+    def to_representation(self, instance):
+        users = {}
+        for user in (instance.assigned_to, instance.created_by):
+            if user is not None:
+                users[user.pk] = self.user_data(user)
+        return self.represent(
+            instance, users, self.datetime_field.to_representation, self.date_field.to_representation,
+        )
+
+    def represent(self, row, users, format_datetime, format_date):
+        get = self.get
+        due_date = get(row, 'due_date')
+        assigned_to_id = get(row, 'assigned_to_id')
+        return {
+            'id': get(row, 'id'),
+            'title': get(row, 'title'),
+            'description': get(row, 'description'),
+            'status': get(row, 'status'),
+            'due_date': format_date(due_date) if due_date is not None else None,
+            'assigned_to': users[assigned_to_id] if assigned_to_id is not None else None,
+            'assigned_to_id': assigned_to_id,
+            'created_by': users[get(row, 'created_by_id')],
+            'created_at': format_datetime(get(row, 'created_at')),
+            'updated_at': format_datetime(get(row, 'updated_at')),
+        }
+
+
+class TaskBulkAssignSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=500)
+    user_id = serializers.IntegerField(allow_null=True, required=False)
+
+
+class TaskActivitySerializer(serializers.ModelSerializer):
+    actor = UserLiteSerializer(read_only=True)
+
+    class Meta:
+        model = TaskActivity
+        fields = ('id', 'action', 'changes', 'actor', 'created_at')
+        read_only_fields = fields
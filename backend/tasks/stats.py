@@ -0,0 +1,27 @@
+import datetime
+
+from django.db.models import Count, Q
+
+from .models import TaskStatus
+
+
+def status_counts(user):
+    """Conditional COUNT expressions for the dashboard summary cards."""
+    return {
+        'total': Count('id'),
+        'todo': Count('id', filter=Q(status=TaskStatus.TODO)),
+        'in_progress': Count('id', filter=Q(status=TaskStatus.IN_PROGRESS)),
+        'completed': Count('id', filter=Q(status=TaskStatus.COMPLETED)),
+        'assigned_to_me': Count('id', filter=Q(assigned_to=user)),
+    }
+
+
+def due_counts(today):
+    """COUNT expressions bucketing open (not completed) tasks by due date."""
+    open_tasks = ~Q(status=TaskStatus.COMPLETED)
+    end_of_week = today + datetime.timedelta(days=6 - today.weekday())
+    return {
+        'overdue': Count('id', filter=open_tasks & Q(due_date__lt=today)),
+        'due_this_week': Count('id', filter=open_tasks & Q(due_date__gte=today, due_date__lte=end_of_week)),
+        'no_due_date': Count('id', filter=open_tasks & Q(due_date__isnull=True)),
+    }
@@ -0,0 +1,41 @@
+import datetime
+
+from django.conf import settings
+
+from .models import ArchivedTask, TaskTombstone
+
+# Rows that commit slightly out of updated_at order are sent twice rather than missed.
+SYNC_OVERLAP = datetime.timedelta(seconds=5)
+
+
+def record_deletion(task_id, assignee_id):
+    TaskTombstone.objects.create(task_id=task_id, assigned_to_id=assignee_id)
+
+
+def record_reassignments(changes):
+    """``changes`` holds (task_id, previous_assignee_id, new_assignee_id) triples."""
+    TaskTombstone.objects.bulk_create(
+        TaskTombstone(task_id=task_id, assigned_to_id=previous, deleted=False)
+        for task_id, previous, new in changes
+        if previous is not None and previous != new
+    )
+
+
+def removed_task_ids(user, since, include_archived=False):
+    """Ids of tasks that left ``user``'s view after ``since``; archiving counts unless ``include_archived``."""
+    queryset = TaskTombstone.objects.filter(removed_at__gt=since)
+    if user.is_member:
+        queryset = queryset.filter(assigned_to=user)
+    else:
+        queryset = queryset.filter(deleted=True)
+    removed = queryset.values_list('task_id', flat=True)
+    if not include_archived:
+        archived = ArchivedTask.objects.filter(archived_at__gt=since)
+        if user.is_member:
+            archived = archived.filter(assigned_to=user)
+        removed = removed.union(archived.values_list('id', flat=True))
+    return set(removed)
+
+
+def retention_horizon(now):
+    return now - settings.TASK_TOMBSTONE_RETENTION
@@ -0,0 +1,107 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.archive import archive_completed_tasks
+from tasks.models import ArchivedTask, Task, TaskStatus
+
+User = get_user_model()
+
+AGE = datetime.timedelta(days=90)
+
+
+class TaskArchiveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        long_ago = timezone.now() - AGE - datetime.timedelta(days=1)
+        self.old_done = [
+            Task.objects.create(title=f'Shipped report {n}', status=TaskStatus.COMPLETED,
+                                assigned_to=self.member if n % 2 else None, created_by=self.manager)
+            for n in range(5)
+        ]
+        self.old_open = Task.objects.create(title='Stalled', created_by=self.manager)
+        Task.objects.filter(pk__in=[task.pk for task in [*self.old_done, self.old_open]]).update(updated_at=long_ago)
+        self.recent_done = Task.objects.create(
+            title='Just finished', status=TaskStatus.COMPLETED, assigned_to=self.member, created_by=self.manager,
+        )
+        self.client.force_authenticate(user=self.manager)
+
+    def list_ids(self, **params):
+        response = self.client.get(reverse('task-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task['id'] for task in response.data['results']]
+
+    def test_moves_old_completed_tasks_in_batches(self):
+        before = {task['id']: task for task in self.client.get(reverse('task-list')).json()['results']}
+        self.assertEqual(archive_completed_tasks(AGE, batch_size=2), 5)
+
+        archived_ids = sorted(task.pk for task in self.old_done)
+        self.assertEqual(sorted(ArchivedTask.objects.values_list('id', flat=True)), archived_ids)
+        self.assertFalse(Task.objects.filter(pk__in=archived_ids).exists())
+        self.assertEqual(archive_completed_tasks(AGE), 0)
+
+        # Archived rows read back exactly as they were served.
+        everything = self.client.get(reverse('task-list'), {'include_archived': 'true'}).json()['results']
+        self.assertEqual({task['id']: task for task in everything}, before)
+
+    def test_lists_read_the_hot_set_unless_asked(self):
+        self.list_ids()  # Cached, then invalidated by the archive run.
+        archive_completed_tasks(AGE)
+        hot = {self.old_open.pk, self.recent_done.pk}
+        self.assertEqual(set(self.list_ids()), hot)
+        everything = self.list_ids(include_archived='true')
+        self.assertEqual(set(everything), hot | {task.pk for task in self.old_done})
+        self.assertEqual(everything, sorted(everything, reverse=True))
+
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(self.list_ids(), [self.recent_done.pk])
+        self.assertEqual(
+            set(self.list_ids(include_archived='1')), {self.recent_done.pk, self.old_done[1].pk, self.old_done[3].pk},
+        )
+
+    def test_search_stats_and_pages_span_the_archive(self):
+        archive_completed_tasks(AGE)
+        self.assertEqual(self.list_ids(search='shipped'), [])
+        self.assertEqual(len(self.list_ids(search='shipped', include_archived='true')), 5)
+
+        first = self.client.get(reverse('task-list'), {'include_archived': 'true', 'page_size': 4}).data
+        second = self.client.get(first['next']).data
+        self.assertEqual(len(first['results']) + len(second['results']), 7)
+        self.assertIsNone(second['next'])
+
+        stats = self.client.get(reverse('task-stats'), {'include_archived': 'true'}).data
+        self.assertEqual((stats['total'], stats['completed']), (7, 6))
+        self.assertEqual(self.client.get(reverse('task-stats')).data['completed'], 1)
+
+    def test_archived_tasks_are_read_only(self):
+        archive_completed_tasks(AGE)
+        url = reverse('task-detail', args=[self.old_done[0].pk])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(url, {'include_archived': 'true'})
+        self.assertEqual(response.data['title'], 'Shipped report 0')
+        response = self.client.patch(f'{url}?include_archived=true', {'status': 'TODO'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sync_reports_archived_tasks_as_removed(self):
+        since = timezone.now()
+        archive_completed_tasks(AGE)
+        self.client.force_authenticate(user=self.member)
+        params = {'since': since.isoformat()}
+        response = self.client.get(reverse('task-sync'), params)
+        self.assertEqual(response.data['deleted'], [self.old_done[1].pk, self.old_done[3].pk])
+        response = self.client.get(reverse('task-sync'), {**params, 'include_archived': 'true'})
+        self.assertEqual(response.data['deleted'], [])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('archive_tasks', days=90, batch_size=2, stdout=out)
+        self.assertIn('Archived 5 completed tasks.', out.getvalue())
@@ -0,0 +1,114 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import Task, TaskActivity, TaskStatus
+from users.authentication import token_versions
+from users.serializers import UsernameTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class AsyncTaskViewTests(APITestCase):
+    """The hot endpoints as served under ASGI (config.async_urls)."""
+
+    def setUp(self):
+        token_versions.clear()
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.other = User.objects.create_user('other', 'other@example.com', 'pass1234', role='MEMBER')
+        self.task = Task.objects.create(title='Mine', created_by=self.manager, assigned_to=self.member)
+        self.hidden = Task.objects.create(title='Not mine', created_by=self.manager, assigned_to=self.other)
+        # Issuing tokens writes to the database, so do it before entering the event loop.
+        self.tokens = {
+            user.pk: str(UsernameTokenObtainPairSerializer.get_token(user).access_token)
+            for user in (self.manager, self.member)
+        }
+
+    def auth(self, user):
+        return {'headers': {'Authorization': f'Bearer {self.tokens[user.pk]}'}}
+
+    async def test_list_matches_the_sync_view(self):
+        response = await self.async_client.get(reverse('task-list'), **self.auth(self.manager))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=self.manager)
+        sync_response = await sync_to_async(self.client.get)(reverse('task-list'))
+        self.assertEqual(response.json(), sync_response.json())
+
+        etag = response['ETag']
+        headers = {**self.auth(self.manager)['headers'], 'If-None-Match': etag}
+        response = await self.async_client.get(reverse('task-list'), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_member_sees_only_assigned_tasks(self):
+        response = await self.async_client.get(reverse('task-list'), **self.auth(self.member))
+        self.assertEqual([task['id'] for task in response.json()['results']], [self.task.pk])
+
+        response = await self.async_client.get(reverse('task-detail', args=[self.hidden.pk]), **self.auth(self.member))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self.async_client.get(reverse('task-detail', args=[self.task.pk]), **self.auth(self.member))
+        self.assertEqual(response.json()['title'], 'Mine')
+
+    async def test_partial_update_keeps_member_rules(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        response = await self.async_client.patch(
+            url, {'title': 'Renamed'}, content_type='application/json', **self.auth(self.member)
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = await self.async_client.patch(
+            url, {'status': TaskStatus.COMPLETED}, content_type='application/json', **self.auth(self.member)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await self.task.arefresh_from_db()
+        self.assertEqual(self.task.status, TaskStatus.COMPLETED)
+        activity = await TaskActivity.objects.aget(task_id=self.task.pk)
+        self.assertEqual(activity.changes, {'status': ['TODO', 'COMPLETED']})
+
+    async def test_partial_update_validates_assignee(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        response = await self.async_client.patch(
+            url, {'assigned_to_id': 999999}, content_type='application/json', **self.auth(self.manager)
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = await self.async_client.patch(
+            url, {'assigned_to_id': self.other.pk}, content_type='application/json', **self.auth(self.manager)
+        )
+        self.assertEqual(response.json()['assigned_to']['username'], 'other')
+
+    async def test_partial_update_rejects_a_body_that_is_not_an_object(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        response = await self.async_client.patch(url, [1, 2], content_type='application/json', **self.auth(self.manager))
+        self.client.force_authenticate(user=self.manager)
+        sync_response = await sync_to_async(self.client.patch)(url, [1, 2], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual((response.status_code, response.json()), (sync_response.status_code, sync_response.json()))
+
+    async def test_assign(self):
+        url = reverse('task-assign', args=[self.task.pk])
+        response = await self.async_client.post(
+            url, {'user_id': self.other.pk}, content_type='application/json', **self.auth(self.manager)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['assigned_to_id'], self.other.pk)
+        activity = await TaskActivity.objects.aget(task_id=self.task.pk)
+        self.assertEqual((activity.action, activity.actor_id), ('task.assigned', self.manager.pk))
+
+        response = await self.async_client.post(
+            url, {'user_id': 999999}, content_type='application/json', **self.auth(self.manager)
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_sync_fallback_actions(self):
+        # Create is not async; it runs the sync implementation in a thread.
+        response = await self.async_client.post(
+            reverse('task-list'), {'title': 'Created'}, content_type='application/json', **self.auth(self.manager)
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    async def test_users_me(self):
+        response = await self.async_client.get(reverse('user-me'), **self.auth(self.member))
+        self.assertEqual(response.json()['email'], 'member@example.com')
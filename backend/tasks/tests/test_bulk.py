@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import Task, TaskStatus
+
+User = get_user_model()
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.other = User.objects.create_user('other', 'other@example.com', 'pass1234', role='MEMBER')
+        self.client.force_authenticate(user=self.manager)
+
+    def create_batch(self, size):
+        payload = [
+            {'title': f'Task {index}', 'assigned_to_id': (self.member if index % 2 else self.other).id}
+            for index in range(size)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('task-bulk'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, len(queries)
+
+    def test_bulk_create_query_count_is_constant(self):
+        _, small = self.create_batch(2)
+        response, large = self.create_batch(20)
+        self.assertEqual(small, large)
+        self.assertEqual(Task.objects.count(), 22)
+        self.assertEqual(response.data[1]['assigned_to']['username'], 'member')
+        self.assertEqual(response.data[1]['created_by']['username'], 'manager')
+
+    def test_bulk_create_rejects_unknown_user(self):
+        response = self.client.post(reverse('task-bulk'), [{'title': 'A', 'assigned_to_id': 999999}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
+
+    def test_member_bulk_update_is_status_only_and_scoped(self):
+        mine = Task.objects.create(title='Mine', created_by=self.manager, assigned_to=self.member)
+        theirs = Task.objects.create(title='Theirs', created_by=self.manager, assigned_to=self.other)
+        self.client.force_authenticate(user=self.member)
+        url = reverse('task-bulk')
+
+        response = self.client.patch(url, [{'id': mine.id, 'title': 'Renamed'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(url, [{'id': theirs.id, 'status': TaskStatus.COMPLETED}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        before = Task.objects.get(pk=mine.pk).updated_at
+        response = self.client.patch(url, [{'id': mine.id, 'status': TaskStatus.COMPLETED}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mine.refresh_from_db()
+        self.assertEqual(mine.status, TaskStatus.COMPLETED)
+        self.assertGreater(mine.updated_at, before)
+
+    def test_bulk_assign(self):
+        tasks = [Task.objects.create(title=f'Task {index}', created_by=self.manager) for index in range(3)]
+        url = reverse('task-bulk-assign')
+        response = self.client.post(url, {'task_ids': [task.id for task in tasks], 'user_id': self.member.id},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.filter(assigned_to=self.member).count(), 3)
+
+        response = self.client.post(url, {'task_ids': [tasks[0].id, 999999], 'user_id': None}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['missing'], [999999])
+
+        self.client.force_authenticate(user=self.member)
+        response = self.client.post(url, {'task_ids': [tasks[0].id], 'user_id': self.member.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tasks.cache import task_cache
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE={
+    'BACKEND': 'core.cache.LRUCacheBackend',
+    'OPTIONS': {'max_entries': 100},
+    'TIMEOUT': 60,
+})
+class TaskResponseCacheTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.task = Task.objects.create(title='Cached', created_by=self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+    def get_list(self, **params):
+        return self.client.get(reverse('task-list'), params)
+
+    def test_repeated_list_is_served_from_cache(self):
+        before = task_cache.stats()
+        self.assertEqual(self.get_list()['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.get_list()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['title'], 'Cached')
+        self.assertEqual(self.get_list(status='TODO')['X-Cache'], 'MISS')
+        after = task_cache.stats()
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        self.assertEqual(after['misses'] - before['misses'], 2)
+
+    def test_update_invalidates_list_and_detail(self):
+        detail_url = reverse('task-detail', args=[self.task.pk])
+        self.get_list()
+        self.client.get(detail_url)
+        # Cached responses are dropped once the write commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(detail_url, {'title': 'Renamed'}, format='json')
+
+        response = self.get_list()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+        self.assertEqual(self.client.get(detail_url)['X-Cache'], 'MISS')
+
+    def test_assign_invalidates_member_list(self):
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(self.get_list().data['results'], [])
+
+        self.client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task-assign', args=[self.task.pk]), {'user_id': self.member.pk}, format='json')
+
+        self.client.force_authenticate(user=self.member)
+        response = self.get_list()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([item['id'] for item in response.data['results']], [self.task.pk])
+
+    def test_username_change_invalidates_nested_payloads(self):
+        self.get_list()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('user-detail', args=[self.admin.pk]), {'username': 'boss'}, format='json')
+
+        response = self.get_list()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['created_by']['username'], 'boss')
+
+        # Saves outside the API (the admin, the ORM) invalidate them too; unrelated fields do not.
+        self.get_list()
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.first_name = 'Ada'
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.save()
+        self.assertEqual(self.get_list()['X-Cache'], 'HIT')
+        admin.email = 'boss@example.com'
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.save()
+        self.assertEqual(self.get_list()['X-Cache'], 'MISS')
+
+    def test_cache_hit_answers_conditional_get(self):
+        etag = self.get_list()['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    @override_settings(RESPONSE_CACHE={'BACKEND': 'core.cache.LRUCacheBackend', 'TIMEOUT': 0})
+    def test_list_etag_follows_rows_changed_outside_the_api(self):
+        etag = self.get_list()['ETag']
+        # Saved outside the API, so no cache tag is renewed; the validators read the rows themselves.
+        self.task.title = 'Edited'
+        self.task.save()
+        response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['title'], 'Edited')
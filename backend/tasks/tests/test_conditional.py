@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE={'BACKEND': ''})
+class TaskConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.task = Task.objects.create(title='Task', created_by=self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_list_not_modified_until_a_task_changes(self):
+        url = reverse('task-list')
+        etag = self.client.get(url)['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(reverse('task-assign', args=[self.task.pk]), {'user_id': self.member.pk}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_with_nested_user(self):
+        url = reverse('task-list')
+        etag = self.client.get(url)['ETag']
+        self.client.patch(reverse('user-detail', args=[self.admin.pk]), {'username': 'boss'}, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_detail_if_modified_since(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        response = self.client.get(url)
+        last_modified = response['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
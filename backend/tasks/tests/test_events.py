@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.events import OVERFLOW, InMemoryBroker
+from tasks.events import TASK_ASSIGNED, TASK_CREATED, TASK_DELETED, TASK_REMOVED, scope_event, task_feed
+
+User = get_user_model()
+
+
+class RecordingBroker:
+    published = []
+
+    def publish(self, channel, events):
+        self.published.extend(events)
+
+    def has_subscribers(self, channel):
+        return True
+
+
+class InMemoryBrokerTests(APITestCase):
+    def test_events_published_from_another_thread_reach_subscribers(self):
+        broker = InMemoryBroker()
+
+        async def listen():
+            subscription = broker.subscribe('tasks')
+            thread = threading.Thread(target=broker.publish, args=('tasks', [{'event': 'a'}, {'event': 'b'}]))
+            thread.start()
+            received = [await subscription.get(timeout=1), await subscription.get(timeout=1)]
+            subscription.close()
+            return received
+
+        self.assertEqual(async_to_sync(listen)(), [{'event': 'a'}, {'event': 'b'}])
+        self.assertFalse(broker.has_subscribers('tasks'))
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        broker = InMemoryBroker(max_queue=2)
+
+        async def listen():
+            subscription = broker.subscribe('tasks')
+            broker.publish('tasks', [{'event': str(index)} for index in range(5)])
+            await asyncio.sleep(0)
+            return [await subscription.get(timeout=1), await subscription.get(timeout=1)]
+
+        self.assertEqual(async_to_sync(listen)(), [{'event': '1'}, OVERFLOW])
+        self.assertFalse(broker.has_subscribers('tasks'))
+
+
+@override_settings(EVENT_BROKER={'BACKEND': 'tasks.tests.test_events.RecordingBroker'})
+class TaskEventTests(APITestCase):
+    def setUp(self):
+        RecordingBroker.published.clear()
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.other = User.objects.create_user('other', 'other@example.com', 'pass1234', role='MEMBER')
+        self.client.force_authenticate(user=self.manager)
+
+    def test_writes_publish_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('task-list'), {'title': 'New', 'assigned_to_id': self.member.pk})
+        task_id = response.data['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task-assign', args=[task_id]), {'user_id': self.other.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('task-detail', args=[task_id]))
+
+        self.assertEqual(
+            [(event['event'], event['previous_assignee_id']) for event in RecordingBroker.published],
+            [(TASK_CREATED, None), (TASK_ASSIGNED, self.member.pk), (TASK_DELETED, self.other.pk)],
+        )
+        self.assertEqual(RecordingBroker.published[1]['task']['assigned_to_id'], self.other.pk)
+
+    def test_events_are_scoped_like_the_task_list(self):
+        event = {'event': TASK_ASSIGNED, 'id': 1, 'task': {'id': 1, 'assigned_to_id': self.other.pk},
+                 'previous_assignee_id': self.member.pk}
+        self.assertEqual(scope_event(self.manager, event), event)
+        self.assertEqual(scope_event(self.other, event), event)
+        self.assertEqual(scope_event(self.member, event), {'event': TASK_REMOVED, 'id': 1})
+
+        deleted = {'event': TASK_DELETED, 'id': 1, 'task': None, 'previous_assignee_id': self.other.pk}
+        self.assertEqual(scope_event(self.other, deleted), {'event': TASK_DELETED, 'id': 1})
+        self.assertIsNone(scope_event(self.member, deleted))
+
+
+class TaskEventStreamTests(APITestCase):
+    def setUp(self):
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.token = str(RefreshToken.for_user(self.member).access_token)
+        self.client.force_authenticate(user=self.member)
+        self.ticket = self.client.post(reverse('task-events-ticket')).data['ticket']
+
+    async def open(self, **kwargs):
+        """The stream's response, with its first chunk read and the stream closed."""
+        response = await self.async_client.get(reverse('task-events'), **kwargs)
+        if response.status_code == 200:
+            stream = aiter(response.streaming_content)
+            await anext(stream)
+            await stream.aclose()
+        return response
+
+    async def test_stream_sends_only_visible_events(self):
+        response = await self.async_client.get(reverse('task-events'), {'ticket': self.ticket})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+
+        task_feed.publish([
+            {'event': TASK_CREATED, 'id': 1, 'task': {'id': 1, 'assigned_to_id': None}, 'previous_assignee_id': None},
+            {'event': TASK_CREATED, 'id': 2, 'task': {'id': 2, 'assigned_to_id': self.member.pk},
+             'previous_assignee_id': None},
+        ])
+        chunk = (await anext(stream)).decode()
+        await stream.aclose()
+
+        self.assertTrue(chunk.startswith(f'event: {TASK_CREATED}\n'))
+        self.assertEqual(json.loads(chunk.split('data: ', 1)[1])['id'], 2)
+
+    async def test_ticket_opens_one_stream(self):
+        self.assertEqual((await self.open(data={'ticket': self.ticket})).status_code, 200)
+        self.assertEqual((await self.open(data={'ticket': self.ticket})).status_code, 401)
+
+    async def test_stream_requires_a_ticket_or_token(self):
+        self.assertEqual((await self.open()).status_code, 401)
+        self.assertEqual((await self.open(data={'ticket': 'forged'})).status_code, 401)
+        # The JWT itself is accepted only in the header.
+        self.assertEqual((await self.open(data={'token': self.token})).status_code, 401)
+        self.assertEqual((await self.open(headers={'Authorization': f'Bearer {self.token}'})).status_code, 200)
+
+    def test_tickets_need_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.post(reverse('task-events-ticket')).status_code, 401)
+
+    def test_stream_is_refused_outside_asgi(self):
+        response = self.client.get(reverse('task-events'), {'ticket': self.ticket})
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import Task, TaskStatus
+from users.serializers import UsernameTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE={'BACKEND': ''})
+class TaskExportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        for index in range(5):
+            Task.objects.create(
+                title=f'Task {index}',
+                status=TaskStatus.COMPLETED if index % 2 else TaskStatus.TODO,
+                assigned_to=self.member if index < 2 else None,
+                created_by=self.admin,
+            )
+        self.client.force_authenticate(user=self.admin)
+
+    def export(self, **params):
+        response = self.client.get(reverse('task-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_matches_list_payload(self):
+        lines = [json.loads(line) for line in self.export(status='TODO').splitlines()]
+        listed = self.client.get(reverse('task-list'), {'status': 'TODO'}).json()['results']
+        self.assertEqual(lines, listed)
+
+    def test_csv_export_with_search(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(output='csv', search='task'))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual({row['assigned_to'] for row in rows}, {'member', ''})
+        self.assertEqual(rows[0]['created_by'], 'admin')
+
+    def test_member_export_is_scoped(self):
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(len(self.export().splitlines()), 2)
+
+    def test_unknown_output(self):
+        response = self.client.get(reverse('task-export'), {'output': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_asgi_export_streams_an_async_iterator(self):
+        token = await sync_to_async(lambda: str(UsernameTokenObtainPairSerializer.get_token(self.admin).access_token))()
+        response = await self.async_client.get(
+            reverse('task-export'), {'output': 'csv'}, headers={'Authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(content, await sync_to_async(self.export)(output='csv'))
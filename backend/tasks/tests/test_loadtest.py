@@ -0,0 +1,90 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.management.commands.loadtest import percentile
+from tasks.models import Task, TaskStatus
+from users.models import Roles
+
+User = get_user_model()
+
+
+class SeedTasksCommandTests(TestCase):
+    def seed(self, **options):
+        call_command('seed_tasks', users=50, tasks=1_000, batch_size=300, stdout=StringIO(), **options)
+
+    def test_seeds_roles_and_task_distributions(self):
+        self.seed()
+
+        users = User.objects.filter(username__startswith='load-')
+        self.assertEqual(users.count(), 50)
+        self.assertEqual(users.filter(role=Roles.ADMIN).count(), 1)
+        self.assertEqual(users.filter(role=Roles.MANAGER).count(), 5)
+        self.assertTrue(users.get(username='load-member-10').check_password('load-test-pass'))
+
+        tasks = Task.objects.all()
+        self.assertEqual(tasks.count(), 1_000)
+        for task_status in TaskStatus.values:
+            self.assertTrue(tasks.filter(status=task_status).exists())
+        self.assertTrue(tasks.filter(due_date__isnull=True).exists())
+        self.assertTrue(tasks.filter(assigned_to__isnull=True).exists())
+        self.assertFalse(tasks.filter(assigned_to__role__in=[Roles.ADMIN, Roles.MANAGER]).exists())
+        # Timestamps are spread out, not all "now".
+        self.assertLess(tasks.order_by('created_at').first().created_at, timezone.now() - datetime.timedelta(days=30))
+        self.assertFalse(tasks.filter(updated_at__lt=F('created_at')).exists())
+
+    def test_same_seed_same_data(self):
+        self.seed(seed=7)
+        first = list(Task.objects.order_by('id').values_list('title', 'status', 'due_date'))
+        self.seed(seed=7, clear=True)
+        self.assertEqual(list(Task.objects.order_by('id').values_list('title', 'status', 'due_date')), first)
+
+    def test_refuses_to_seed_twice(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+class LoadTestCommandTests(TestCase):
+    def test_runs_mixed_workload_and_writes_json(self):
+        call_command('seed_tasks', users=30, tasks=300, stdout=StringIO())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.json')
+            out = StringIO()
+            # One worker runs on this thread, so it sees the test transaction.
+            call_command(
+                'loadtest', requests=40, concurrency=1, output=path, stdout=out,
+                mix='member_list=3,member_update_status=2,manager_list=2,manager_search=1,assign=1,login=1,'
+                    'directory=1',
+            )
+            with open(path) as output:
+                results = json.load(output)
+
+            call_command('loadtest', requests=10, concurrency=1, baseline=path, stdout=out)
+
+        self.assertEqual(results['total']['requests'], 40)
+        self.assertEqual(results['total']['errors'], 0)
+        for stats in results['endpoints'].values():
+            self.assertLessEqual(stats['p50_ms'], stats['p95_ms'])
+            self.assertLessEqual(stats['p95_ms'], stats['p99_ms'])
+        self.assertIn('Δp95', out.getvalue())
+
+    def test_unknown_scenario(self):
+        # Helpers and dunders on Workload are not scenarios either.
+        for name in ('delete_everything', 'sample', '__init__'):
+            with self.subTest(name=name), self.assertRaisesMessage(CommandError, f'Unknown scenario "{name}"'):
+                call_command('loadtest', requests=1, concurrency=1, mix=f'{name}=1', stdout=StringIO())
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([3], 0.95), 3)
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import OutboxMessage
+from core.outbox import process_batch
+from core.tests.utils import override_setting_dict
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@override_setting_dict('OUTBOX', DELAY=0)
+class AssignmentNotificationTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.other = User.objects.create_user('other', 'other@example.com', 'pass1234', role='MEMBER')
+        self.task = Task.objects.create(title='Write report', created_by=self.manager)
+        self.client.force_authenticate(user=self.manager)
+
+    def assign(self, task, user):
+        return self.client.post(reverse('task-assign', args=[task.pk]), {'user_id': user.pk}, format='json')
+
+    def test_assignments_become_one_email_per_recipient(self):
+        second = Task.objects.create(title='Review budget', created_by=self.manager)
+        self.assign(self.task, self.member)
+        self.client.post(reverse('task-list'), {'title': 'Plan sprint', 'assigned_to_id': self.member.pk}, format='json')
+        self.client.patch(reverse('task-detail', args=[second.pk]), {'assigned_to_id': self.other.pk}, format='json')
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+        self.assertEqual(mail.outbox, [])
+
+        process_batch()
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['member@example.com', 'other@example.com'])
+        email = next(message for message in mail.outbox if message.to == ['member@example.com'])
+        self.assertEqual(email.subject, 'You have been assigned 2 tasks')
+        self.assertIn('Plan sprint', email.body)
+        self.assertIn(f'/app/tasks/{self.task.pk}', email.body)
+
+    def test_bulk_assign(self):
+        second = Task.objects.create(title='Review budget', created_by=self.manager)
+        self.client.post(
+            reverse('task-bulk-assign'), {'task_ids': [self.task.pk, second.pk], 'user_id': self.member.pk},
+            format='json',
+        )
+        process_batch()
+        self.assertEqual([message.subject for message in mail.outbox], ['You have been assigned 2 tasks'])
+
+    def test_no_email_for_unchanged_self_or_moved_on_assignments(self):
+        self.client.patch(reverse('task-detail', args=[self.task.pk]), {'title': 'Renamed'}, format='json')
+        self.assign(self.task, self.manager)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+        # Reassigned again before the worker ran: only the current assignee hears about it.
+        self.assign(self.task, self.member)
+        self.assign(self.task, self.other)
+        process_batch()
+        self.assertEqual([message.to for message in mail.outbox], [['other@example.com']])
+        self.assertEqual(mail.outbox[0].subject, 'You have been assigned "Renamed"')
+
+    def test_failed_write_leaves_no_message(self):
+        response = self.client.post(
+            reverse('task-list'), {'title': '', 'assigned_to_id': self.member.pk}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OutboxMessage.objects.exists())
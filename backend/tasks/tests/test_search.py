@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tasks.filters import trigram_available
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskSearchTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.client.force_authenticate(user=self.admin)
+        self.notes = Task.objects.create(title='Write notes', description='Steps to deploy the release',
+                                         created_by=self.admin)
+        self.deploy = Task.objects.create(title='Deploy release', created_by=self.admin)
+        Task.objects.create(title='Unrelated', description='Nothing here', created_by=self.admin)
+
+    def search(self, term, **params):
+        response = self.client.get(reverse('task-list'), {'search': term, **params})
+        return [item['id'] for item in response.data['results']]
+
+    def test_prefix_matches_ranked_by_title_weight(self):
+        self.assertEqual(self.search('deplo'), [self.deploy.id, self.notes.id])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search('write deploy'), [self.notes.id])
+
+    def test_explicit_ordering_overrides_rank(self):
+        self.assertEqual(self.search('release', ordering='created_at'), [self.notes.id, self.deploy.id])
+
+    def test_ranked_results_paginate(self):
+        first = self.client.get(reverse('task-list'), {'search': 'deploy', 'page_size': 1})
+        second = self.client.get(first.data['next'])
+        self.assertEqual(
+            [first.data['results'][0]['id'], second.data['results'][0]['id']],
+            [self.deploy.id, self.notes.id],
+        )
+        self.assertIsNone(second.data['next'])
+
+    def test_rank_is_paged_as_not_null(self):
+        first = self.client.get(reverse('task-list'), {'search': 'deploy', 'page_size': 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first.data['next'])
+        sql = next(query['sql'] for query in queries if 'LIMIT' in query['sql'])
+        self.assertNotIn('IS NULL', sql)
+        self.assertNotIn('NULLS', sql)
+
+    def test_trigram_matches_typos(self):
+        if not trigram_available(DEFAULT_DB_ALIAS):
+            self.skipTest('pg_trgm is not installed')
+        self.assertEqual(self.search('relaese'), [self.deploy.id])
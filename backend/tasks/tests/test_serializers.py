@@ -0,0 +1,40 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from tasks.models import Task, TaskStatus
+from tasks.serializers import TaskReadSerializer, TaskSerializer
+
+User = get_user_model()
+
+
+class TaskReadSerializerTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        Task.objects.create(title='Plain', created_by=self.admin)
+        Task.objects.create(title='Full', description='Details', status=TaskStatus.IN_PROGRESS,
+                            due_date=datetime.date(2030, 5, 1), assigned_to=self.member, created_by=self.admin)
+        request = APIRequestFactory().get('/')
+        request.user = self.admin
+        self.context = {'request': request}
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_list_output_is_byte_compatible(self):
+        tasks = Task.objects.select_related('assigned_to', 'created_by').order_by('id')
+        rows = Task.objects.order_by('id').values(*TaskReadSerializer.value_fields)
+        expected = self.render(TaskSerializer(tasks, many=True, context=self.context).data)
+        with self.assertNumQueries(2):
+            actual = self.render(TaskReadSerializer(rows, many=True, context=self.context).data)
+        self.assertEqual(actual, expected)
+
+    def test_instance_output_is_byte_compatible(self):
+        for task in Task.objects.select_related('assigned_to', 'created_by'):
+            self.assertEqual(
+                self.render(TaskReadSerializer(task, context=self.context).data),
+                self.render(TaskSerializer(task, context=self.context).data),
+            )
@@ -0,0 +1,48 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import Task, TaskStatus
+
+User = get_user_model()
+
+
+class TaskStatsTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        today = timezone.localdate()
+        Task.objects.create(title='Overdue', created_by=self.manager, assigned_to=self.member,
+                            due_date=today - datetime.timedelta(days=1))
+        Task.objects.create(title='Today', created_by=self.manager, assigned_to=self.member,
+                            status=TaskStatus.IN_PROGRESS, due_date=today)
+        Task.objects.create(title='Done', created_by=self.manager, assigned_to=self.manager,
+                            status=TaskStatus.COMPLETED)
+        Task.objects.create(title='Open', created_by=self.manager)
+
+    def test_manager_counts(self):
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.get(reverse('task-stats'), {'breakdown': 'due,assignee'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(response.data['todo'], 2)
+        self.assertEqual(response.data['in_progress'], 1)
+        self.assertEqual(response.data['completed'], 1)
+        self.assertEqual(response.data['assigned_to_me'], 1)
+        self.assertEqual(response.data['overdue'], 1)
+        self.assertEqual(response.data['due_this_week'], 1)
+        self.assertEqual(response.data['no_due_date'], 1)
+        by_assignee = {row['username']: row['total'] for row in response.data['by_assignee']}
+        self.assertEqual(by_assignee, {'manager': 1, 'member': 2, None: 1})
+
+    def test_member_counts_are_scoped(self):
+        self.client.force_authenticate(user=self.member)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('task-stats'))
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['assigned_to_me'], 2)
+        self.assertNotIn('overdue', response.data)
@@ -0,0 +1,104 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import Task, TaskTombstone
+from tasks.sync import SYNC_OVERLAP
+
+User = get_user_model()
+
+
+class TaskSyncTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'pass1234', role='MANAGER')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+        self.other = User.objects.create_user('other', 'other@example.com', 'pass1234', role='MEMBER')
+        self.task = Task.objects.create(title='Mine', created_by=self.manager, assigned_to=self.member)
+
+    def sync(self, user, since, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(reverse('task-sync'), {'since': since.isoformat(), **params})
+
+    def test_without_since_returns_watermark_only(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(reverse('task-sync'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {'watermark'})
+
+    def test_changed_tasks_since_watermark(self):
+        since = timezone.now() - datetime.timedelta(minutes=1)
+        Task.objects.filter(pk=self.task.pk).update(updated_at=since - datetime.timedelta(minutes=5))
+        fresh = Task.objects.create(title='Fresh', created_by=self.manager, assigned_to=self.member)
+
+        response = self.sync(self.member, since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['changed']], [fresh.pk])
+        self.assertEqual(response.data['deleted'], [])
+
+    def test_deleted_task_is_reported(self):
+        since = timezone.now()
+        self.client.force_authenticate(user=self.manager)
+        self.client.delete(reverse('task-detail', args=[self.task.pk]))
+
+        for user in (self.manager, self.member):
+            self.assertEqual(self.sync(user, since).data['deleted'], [self.task.pk])
+
+    def test_reassigned_task_leaves_previous_assignee(self):
+        since = timezone.now()
+        self.client.force_authenticate(user=self.manager)
+        self.client.post(reverse('task-assign', args=[self.task.pk]), {'user_id': self.other.pk})
+
+        self.assertEqual(self.sync(self.member, since).data['deleted'], [self.task.pk])
+        response = self.sync(self.other, since)
+        self.assertEqual(response.data['deleted'], [])
+        self.assertEqual([task['id'] for task in response.data['changed']], [self.task.pk])
+        # Reassignment is not a deletion for managers.
+        self.assertEqual(self.sync(self.manager, since).data['deleted'], [])
+
+    def test_reassigned_back_is_not_deleted(self):
+        since = timezone.now()
+        self.client.force_authenticate(user=self.manager)
+        self.client.post(reverse('task-assign', args=[self.task.pk]), {'user_id': self.other.pk})
+        self.client.post(reverse('task-assign', args=[self.task.pk]), {'user_id': self.member.pk})
+
+        response = self.sync(self.member, since)
+        self.assertEqual(response.data['deleted'], [])
+        self.assertEqual([task['id'] for task in response.data['changed']], [self.task.pk])
+
+    def test_changes_are_paginated(self):
+        since = timezone.now()
+        for index in range(4):
+            Task.objects.create(title=f'Task {index}', created_by=self.manager)
+        self.client.force_authenticate(user=self.manager)
+
+        ids = []
+        response = self.client.get(reverse('task-sync'), {'since': since.isoformat(), 'page_size': 3})
+        while True:
+            ids.extend(task['id'] for task in response.data['changed'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        expected = Task.objects.filter(updated_at__gt=since - SYNC_OVERLAP).order_by('updated_at', 'id')
+        self.assertEqual(ids, list(expected.values_list('id', flat=True)))
+
+    def test_invalid_and_expired_since(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(reverse('task-sync'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.sync(self.member, timezone.now() - datetime.timedelta(days=365))
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_command_removes_expired_tombstones(self):
+        old = TaskTombstone.objects.create(task_id=1)
+        TaskTombstone.objects.filter(pk=old.pk).update(removed_at=timezone.now() - datetime.timedelta(days=365))
+        recent = TaskTombstone.objects.create(task_id=2)
+
+        call_command('prune_task_tombstones', batch_size=1, stdout=StringIO())
+        self.assertEqual(list(TaskTombstone.objects.values_list('pk', flat=True)), [recent.pk])
@@ -1,32 +1,66 @@
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import F
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from core.conditional import ConditionalGetMixin
+from core.db import replicas
+from core.events import OVERFLOW
+from core.pagination import KeysetPagination
 from core.permissions import IsManagerOrAdmin
-from .models import Task
-from .serializers import TaskSerializer
-from .filters import TaskFilter
+from users.authentication import ClaimsJWTAuthentication
+from .activity import activity_entries, deletion_entry, record_activity, snapshot
+from .cache import detail_tags, invalidate_tasks, list_tags, request_key_parts, task_cache
+from .models import Task, TaskActivity, TaskWithArchive
+from .serializers import TaskActivitySerializer, TaskBulkAssignSerializer, TaskReadSerializer, TaskSerializer
+from .events import (
+    TASK_ASSIGNED, TASK_CREATED, TASK_UPDATED, aredeem_stream_ticket, format_sse, issue_stream_ticket,
+    publish_task_deleted, publish_task_events, scope_event, task_feed,
+)
+from .export import aiter_lines, csv_lines, iter_tasks, ndjson_lines
+from .filters import TaskFilter, TaskSearchFilter, TaskWithArchiveFilter
+from .notifications import enqueue_assignment_notifications
+from .stats import due_counts, status_counts
+from .sync import SYNC_OVERLAP, record_deletion, record_reassignments, removed_task_ids, retention_horizon
 
 User = get_user_model()
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
-    queryset = Task.objects.select_related('assigned_to', 'created_by')
-    filterset_class = TaskFilter
+    queryset = Task.objects.select_related('assigned_to', 'created_by').defer('search_vector')
+    filter_backends = (DjangoFilterBackend, OrderingFilter, TaskSearchFilter)
     search_fields = ('title', 'description')
     ordering_fields = ('created_at', 'due_date')
+    pagination_class = KeysetPagination
+    bulk_max_items = 500
+    export_chunk_size = 2000
+    validator_related_fields = ('assigned_to', 'created_by')
+    # Read-only actions that honour ?include_archived=true.
+    archive_actions = ('list', 'retrieve', 'stats', 'export', 'sync', 'history')
 
     def get_permissions(self):
         user = self.request.user
 
         # MEMBER PERMISSIONS
         if user.is_member:
-            if self.action in ["list", "retrieve"]:
+            if self.action in ["list", "retrieve", "stats", "export", "sync", "history"]:
                 return [IsAuthenticated()]
-            if self.action in ["update", "partial_update"]:
+            if self.action in ["update", "partial_update", "bulk_update"]:
                 return [IsAuthenticated()]
             # No create, delete, assign
             return []
@@ -34,19 +68,108 @@ class TaskViewSet(viewsets.ModelViewSet):
         # MANAGER / ADMIN = FULL CRUD
         return [IsManagerOrAdmin()]
 
+    @property
+    def filterset_class(self):
+        return TaskWithArchiveFilter if self.include_archived() else TaskFilter
+
+    def include_archived(self):
+        value = self.request.query_params.get('include_archived', '')
+        return self.action in self.archive_actions and value.lower() in ('1', 'true', 'yes')
+
     def get_queryset(self):
-        queryset = super().get_queryset()
+        if self.include_archived():
+            queryset = TaskWithArchive.objects.select_related('assigned_to', 'created_by').defer('search_vector')
+        else:
+            queryset = super().get_queryset()
         user = self.request.user
         if user.is_member:
             queryset = queryset.filter(assigned_to=user)
+        if self.action in ('list', 'sync'):
+            # Plain rows for TaskReadSerializer; users are loaded once per page.
+            queryset = queryset.values(*TaskReadSerializer.value_fields)
         return queryset
 
+    def get_serializer_class(self):
+        if self.action in ('list', 'retrieve', 'sync'):
+            return TaskReadSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        return task_cache.respond(
+            request,
+            request_key_parts(request, 'list'),
+            list_tags(request.user),
+            lambda: super(TaskViewSet, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_field]
+        return task_cache.respond(
+            request,
+            request_key_parts(request, 'retrieve', pk),
+            detail_tags(pk),
+            lambda: super(TaskViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
     def perform_create(self, serializer):
         user = self.request.user
-        if user.is_member:
-            serializer.save(created_by=user, assigned_to=user)
-        else:
-            serializer.save(created_by=user)
+        with transaction.atomic():
+            if user.is_member:
+                serializer.save(created_by=user, assigned_to=user)
+            else:
+                serializer.save(created_by=user)
+            self.tasks_changed(TASK_CREATED, [serializer.instance])
+
+    def perform_update(self, serializer):
+        previous_assignee_id = serializer.instance.assigned_to_id
+        before = snapshot(serializer.instance)
+        with transaction.atomic():
+            serializer.save()
+            self.tasks_changed(TASK_UPDATED, [serializer.instance], [previous_assignee_id], [before])
+
+    def perform_destroy(self, instance):
+        task_id, assignee_id = instance.pk, instance.assigned_to_id
+        before = snapshot(instance)
+        with transaction.atomic():
+            instance.delete()
+            record_deletion(task_id, assignee_id)
+            record_activity([deletion_entry(task_id, before, self.request.user.pk)])
+            publish_task_deleted(task_id, assignee_id)
+        invalidate_tasks([task_id], [assignee_id])
+
+    def tasks_changed(self, event, tasks, previous_assignee_ids=None, snapshots=None):
+        """
+        In the transaction of a write: record its rows (see record_changes()),
+        and, given the tasks' ``snapshots`` from before the write, what changed
+        as TaskActivity; once it commits, drop cached responses and publish
+        ``event`` on the change feed for each task.
+        """
+        tasks = list(tasks)
+        if previous_assignee_ids is None:
+            previous_assignee_ids = [None] * len(tasks)
+        changes = self.task_changes(tasks, previous_assignee_ids)
+        self.record_changes(changes)
+        if snapshots is not None:
+            record_activity(activity_entries(event, tasks, snapshots, self.request.user.pk))
+        transaction.on_commit(partial(invalidate_tasks, *self.changed_task_and_assignee_ids(changes)))
+        publish_task_events(event, tasks, previous_assignee_ids)
+
+    def record_changes(self, changes):
+        """Rows committed with the task changes: reassignment tombstones for sync and assignment emails."""
+        record_reassignments(changes)
+        enqueue_assignment_notifications(changes, self.request.user.pk)
+
+    @staticmethod
+    def task_changes(tasks, previous_assignee_ids):
+        """(task_id, previous_assignee_id, new_assignee_id) triples."""
+        return [(task.pk, previous, task.assigned_to_id) for task, previous in zip(tasks, previous_assignee_ids)]
+
+    @staticmethod
+    def changed_task_and_assignee_ids(changes):
+        return (
+            [task_id for task_id, _, _ in changes],
+            [assignee_id for _, previous, new in changes for assignee_id in (previous, new)],
+        )
 
     def destroy(self, request, *args, **kwargs):
         if request.user.is_member:
@@ -58,6 +181,17 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
+        denied = self.check_member_update(request, instance)
+        if denied is not None:
+            return denied
+        # UpdateModelMixin.update() without fetching the task again.
+        serializer = self.get_serializer(instance, data=request.data, partial=kwargs.pop('partial', False))
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(serializer.data)
+
+    def check_member_update(self, request, instance):
+        """The error response for a member's disallowed update, or None."""
         user = request.user
 
         if user.is_member:
@@ -74,13 +208,14 @@ class TaskViewSet(viewsets.ModelViewSet):
                     {"detail": "Members may only update the task status."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-
-        return super().update(request, *args, **kwargs)
+        return None
 
     @action(detail=True, methods=['post'], permission_classes=[IsManagerOrAdmin])
     def assign(self, request, pk=None):
         """Assign task to a user (Manager/Admin only)."""
         task = self.get_object()
+        previous_assignee_id = task.assigned_to_id
+        before = snapshot(task)
         user_id = request.data.get('user_id')
 
         if not user_id:
@@ -95,6 +230,267 @@ class TaskViewSet(viewsets.ModelViewSet):
                 )
             task.assigned_to = assignee
 
-        task.save(update_fields=['assigned_to'])
+        with transaction.atomic():
+            task.save(update_fields=['assigned_to', 'updated_at'])
+            self.tasks_changed(TASK_ASSIGNED, [task], [previous_assignee_id], [before])
 
         return Response(self.get_serializer(task).data)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Dashboard counts from a single aggregate query.
+        ?breakdown=due adds due-date buckets, ?breakdown=assignee adds per-assignee counts.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        breakdown = set(request.query_params.get('breakdown', '').split(','))
+
+        counts = status_counts(request.user)
+        if 'due' in breakdown:
+            counts.update(due_counts(timezone.localdate()))
+        data = queryset.aggregate(**counts)
+
+        if 'assignee' in breakdown:
+            counts.pop('assigned_to_me')
+            data['by_assignee'] = list(
+                queryset.values(assignee_id=F('assigned_to'), username=F('assigned_to__username'))
+                .annotate(**counts)
+                .order_by('username')
+            )
+
+        return Response(data)
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    def bulk_create(self, request):
+        """Create many tasks in one transaction."""
+        serializer = self.get_serializer(data=request.data, many=True, max_length=self.bulk_max_items)
+        serializer.is_valid(raise_exception=True)
+
+        user = request.user
+        with transaction.atomic():
+            if user.is_member:
+                serializer.save(created_by=user, assigned_to=user)
+            else:
+                serializer.save(created_by=user)
+            self.tasks_changed(TASK_CREATED, serializer.instance)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Partially update many tasks; every item carries its task `id`."""
+        items = [item for item in request.data if isinstance(item, dict)] if isinstance(request.data, list) else []
+
+        # Members can only update task status (see update()).
+        if request.user.is_member and any(set(item) - {"id", "status"} for item in items):
+            return Response(
+                {"detail": "Members may only update the task status."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ids = [item["id"] for item in items if isinstance(item.get("id"), int)]
+        tasks = list(self.get_queryset().filter(pk__in=ids))
+        serializer = self.get_serializer(
+            tasks, data=request.data, many=True, partial=True, max_length=self.bulk_max_items
+        )
+        serializer.is_valid(raise_exception=True)
+        previous_assignee_ids = [task.assigned_to_id for task in tasks]
+        snapshots = [snapshot(task) for task in tasks]
+
+        with transaction.atomic():
+            serializer.save()
+            self.tasks_changed(TASK_UPDATED, tasks, previous_assignee_ids, snapshots)
+
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk/assign', url_name='bulk-assign',
+            permission_classes=[IsManagerOrAdmin])
+    def bulk_assign(self, request):
+        """Assign many tasks to one user, or unassign them (Manager/Admin only)."""
+        if request.user.is_member:
+            return Response(
+                {"detail": "Members cannot assign tasks."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        payload = TaskBulkAssignSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        task_ids = set(payload.validated_data['task_ids'])
+        user_id = payload.validated_data.get('user_id')
+
+        assignee = None
+        if user_id:
+            try:
+                assignee = User.objects.get(id=user_id)
+            except User.DoesNotExist:
+                return Response(
+                    {'detail': 'User not found.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+        tasks = list(self.get_queryset().filter(pk__in=task_ids))
+        missing = task_ids - {task.pk for task in tasks}
+        if missing:
+            return Response(
+                {'detail': 'Tasks not found.', 'missing': sorted(missing)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        now = timezone.now()
+        previous_assignee_ids = [task.assigned_to_id for task in tasks]
+        snapshots = [snapshot(task) for task in tasks]
+        for task in tasks:
+            task.assigned_to = assignee
+            task.updated_at = now
+        with transaction.atomic():
+            Task.objects.filter(pk__in=task_ids).update(assigned_to=assignee, updated_at=now)
+            self.tasks_changed(TASK_ASSIGNED, tasks, previous_assignee_ids, snapshots)
+
+        return Response(self.get_serializer(tasks, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream every visible task as NDJSON (default) or CSV (?output=csv),
+        honouring the same filters, search and ordering as the list.
+        """
+        output = request.query_params.get('output', 'ndjson')
+        if output not in ('ndjson', 'csv'):
+            return Response(
+                {'detail': 'output must be "ndjson" or "csv".'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        tasks = iter_tasks(self.filter_queryset(self.get_queryset()), chunk_size=self.export_chunk_size)
+        if output == 'csv':
+            lines, content_type = csv_lines(tasks), 'text/csv'
+        else:
+            lines, content_type = ndjson_lines(tasks), 'application/x-ndjson'
+        if isinstance(request._request, ASGIRequest):
+            lines = aiter_lines(lines)
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="tasks.{output}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """The task's activity log, newest first, keyset-paginated like the list."""
+        task = self.get_object()
+        queryset = TaskActivity.objects.filter(task_id=task.pk).select_related('actor')
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(TaskActivitySerializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """
+        Incremental sync: tasks changed and task ids removed from the caller's
+        view since ``?since=<watermark>``. Without ``since`` only a fresh
+        watermark is returned. Clients apply ``deleted`` before ``changed``
+        and keep the watermark of the first page for their next sync.
+        """
+        # The watermark is the primary's clock; a lagging replica could miss rows written before it.
+        replicas.use_primary()
+        now = timezone.now()
+        raw_since = request.query_params.get('since')
+        if not raw_since:
+            return Response({'watermark': now})
+
+        since = parse_datetime(raw_since)
+        if since is None:
+            return Response(
+                {'detail': 'since must be an ISO 8601 datetime.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        if since < retention_horizon(now):
+            return Response(
+                {'detail': 'since is older than the sync history; refetch the full task list.'},
+                status=status.HTTP_410_GONE
+            )
+
+        page = self.paginate_queryset(self.changed_since(since))
+
+        deleted = []
+        if not request.query_params.get(self.paginator.cursor_query_param):
+            removed = removed_task_ids(request.user, since - SYNC_OVERLAP, self.include_archived())
+            if removed:
+                # A task reassigned away and back again is still visible.
+                visible = set(self.get_queryset().filter(pk__in=removed).values_list('id', flat=True))
+                deleted = sorted(removed - visible)
+
+        return Response({
+            'watermark': now,
+            'changed': self.get_serializer(page, many=True).data,
+            'deleted': deleted,
+            'next': self.paginator.get_next_link(),
+        })
+
+    def changed_since(self, since):
+        """The visible tasks updated after ``since``, oldest change first."""
+        return self.get_queryset().filter(updated_at__gt=since - SYNC_OVERLAP).order_by('updated_at', 'id')
+
+
+class TaskEventTicketView(APIView):
+    """POST: a single-use ticket for ``/api/tasks/events/?ticket=``, for clients that cannot send headers."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {'ticket': issue_stream_ticket(request.user.pk), 'expires_in': settings.TASK_EVENTS_TICKET_TTL},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+async def stream_user(request):
+    """The user of a ``?ticket=`` from TaskEventTicketView, or of the Authorization header."""
+    ticket = request.GET.get('ticket')
+    if ticket:
+        user_id = await aredeem_stream_ticket(ticket)
+        if user_id is None:
+            return None
+        return await User.objects.filter(pk=user_id, is_active=True).only('id', 'username', 'role').afirst()
+    authenticator = ClaimsJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+async def task_event_stream(request):
+    """
+    Server-Sent Events feed of task changes, scoped like TaskViewSet.get_queryset.
+    Needs an ASGI server; after a ``resync`` event clients should catch up via
+    /api/tasks/sync/ and reconnect.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'The event stream requires an ASGI server.'}, status=501)
+    user = await stream_user(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    subscription = task_feed.subscribe()
+
+    async def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                event = await subscription.get(timeout=settings.TASK_EVENTS_HEARTBEAT)
+                if event is None:
+                    yield ': keepalive\n\n'
+                    continue
+                if event is OVERFLOW:
+                    yield format_sse(event)
+                    return
+                event = scope_event(user, event)
+                if event is not None:
+                    yield format_sse(event)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
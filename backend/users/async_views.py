@@ -0,0 +1,19 @@
+from rest_framework.response import Response
+
+from core.async_views import AsyncViewSetMixin
+from .views import UserViewSet
+
+
+class AsyncUserViewSet(AsyncViewSetMixin, UserViewSet):
+    """UserViewSet with ``me`` on the async ORM; served under ASGI."""
+
+    async def me(self, request):
+        """Return the logged-in user's profile."""
+        user = request.user
+        if user.get_deferred_fields():
+            # Built from token claims; load the full profile in one query.
+            user = await self.get_queryset().aget(pk=user.pk)
+        etag, last_modified = self.get_object_validators(user)
+        return self.conditional_response(
+            etag, last_modified, lambda: Response(self.get_serializer(user).data)
+        )
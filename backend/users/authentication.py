@@ -0,0 +1,176 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# Claims copied onto the request user; everything else is loaded lazily if touched.
+USER_CLAIMS = ('username', 'role')
+VERSION_CLAIM = 'ver'
+# Stored for users that no longer exist or are inactive, so tokens never match.
+REVOKED = -1
+
+
+class TokenVersionCache:
+    """
+    Current ``token_version`` per user: a short-TTL in-process dict in front of
+    the shared Django cache, which falls back to one indexed lookup.
+    A revocation writes the new version to the shared cache, so other processes
+    see it within ``AUTH_TOKEN_VERSION_TTL`` seconds. A lookup that read the
+    old version just before the revocation may still store it after; shared
+    entries expire after ``AUTH_TOKEN_VERSION_CACHE_TTL`` seconds to bound that.
+    """
+
+    def __init__(self):
+        self._local = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return settings.AUTH_TOKEN_VERSION_TTL
+
+    @property
+    def shared_ttl(self):
+        return settings.AUTH_TOKEN_VERSION_CACHE_TTL
+
+    def _key(self, user_id):
+        return f'auth:token-version:{user_id}'
+
+    def _remember(self, user_id, version):
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + self.ttl, version)
+
+    def _recall(self, user_id):
+        with self._lock:
+            entry = self._local.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _current(self, user_id):
+        return User.objects.filter(pk=user_id, is_active=True).values_list('token_version', flat=True)
+
+    def get(self, user_id):
+        version = self._recall(user_id)
+        if version is not None:
+            return version
+
+        version = cache.get(self._key(user_id))
+        if version is None:
+            version = self._current(user_id).first()
+            version = REVOKED if version is None else version
+            cache.set(self._key(user_id), version, self.shared_ttl)
+        self._remember(user_id, version)
+        return version
+
+    async def aget(self, user_id):
+        version = self._recall(user_id)
+        if version is not None:
+            return version
+
+        version = await cache.aget(self._key(user_id))
+        if version is None:
+            version = await self._current(user_id).afirst()
+            version = REVOKED if version is None else version
+            await cache.aset(self._key(user_id), version, self.shared_ttl)
+        self._remember(user_id, version)
+        return version
+
+    def _store(self, user_id, version):
+        cache.set(self._key(user_id), version, self.shared_ttl)
+        self._remember(user_id, version)
+
+    def prime(self, user):
+        self._store(user.pk, user.token_version if user.is_active else REVOKED)
+
+    def revoke(self, user_id):
+        """Invalidate every token issued to ``user_id`` so far."""
+        # Read back inside the transaction, so the new version comes from the primary.
+        with transaction.atomic():
+            User.objects.filter(pk=user_id).update(token_version=F('token_version') + 1)
+            version = self._current(user_id).first()
+        self._store(user_id, REVOKED if version is None else version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+token_versions = TokenVersionCache()
+
+
+def add_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[VERSION_CLAIM] = user.token_version
+    token_versions.prime(user)
+    return token
+
+
+def token_user_id(token):
+    return User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+
+
+def check_token_version(token):
+    if token.get(VERSION_CLAIM) != token_versions.get(token_user_id(token)):
+        raise AuthenticationFailed('Token has been revoked.', code='token_revoked')
+
+
+async def acheck_token_version(token):
+    if token.get(VERSION_CLAIM) != await token_versions.aget(token_user_id(token)):
+        raise AuthenticationFailed('Token has been revoked.', code='token_revoked')
+
+
+def user_from_claims(token):
+    """
+    A ``User`` built from token claims without a query. Fields missing from the
+    claims are deferred: reading one loads it, and ``save()`` writes only the loaded ones.
+    """
+    values = {'id': token_user_id(token), **{claim: token[claim] for claim in USER_CLAIMS}}
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db(None, field_names, [values[name] for name in field_names])
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the id/username/role claims instead of
+    loading the user row, after checking the token version is still current.
+    Tokens issued without the claims fall back to the database lookup.
+    """
+
+    claims = (api_settings.USER_ID_CLAIM, VERSION_CLAIM, *USER_CLAIMS)
+
+    def has_claims(self, validated_token):
+        return all(claim in validated_token for claim in self.claims)
+
+    def get_user(self, validated_token):
+        if not self.has_claims(validated_token):
+            return super().get_user(validated_token)
+        check_token_version(validated_token)
+        return user_from_claims(validated_token)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views; only tokens without claims touch the database in a thread."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if not self.has_claims(validated_token):
+            return await sync_to_async(super().get_user)(validated_token)
+        await acheck_token_version(validated_token)
+        return user_from_claims(validated_token)
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashers import hashing_pool
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend with password hashing on the bounded hashing pool. Database
+    access stays on the request thread. Hashes from an older hasher or cost are
+    upgraded on a successful login, as AbstractBaseUser.check_password() does.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as wrong passwords.
+            hashing_pool.make_password(password)
+            return None
+
+        is_correct, must_update = hashing_pool.verify(password, user.password)
+        if not is_correct:
+            return None
+        if must_update:
+            user.password = hashing_pool.make_password(password)
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
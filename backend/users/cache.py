@@ -0,0 +1,18 @@
+from core.cache import ResponseCache
+
+# Shares RESPONSE_CACHE with the task cache; entries live under their own namespace.
+directory_cache = ResponseCache('users')
+
+DIRECTORY_TAG = 'directory'
+# Changing one of these changes what the directory returns or matches.
+DIRECTORY_FIELDS = ('username', 'email', 'role', 'is_active')
+
+
+def directory_key_parts(request):
+    """The directory is the same for every manager and admin, so only the query string matters."""
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    return ('directory', request.get_host(), params)
+
+
+def invalidate_directory():
+    directory_cache.invalidate(DIRECTORY_TAG)
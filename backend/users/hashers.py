@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with the costs in ``settings.PASSWORD_HASHING['ARGON2']``."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHING['ARGON2']['TIME_COST']
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHING['ARGON2']['MEMORY_COST']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHING['ARGON2']['PARALLELISM']
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt with ``settings.PASSWORD_HASHING['BCRYPT_ROUNDS']``; needs the bcrypt package."""
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_HASHING['BCRYPT_ROUNDS']
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with ``settings.PASSWORD_HASHING['PBKDF2_ITERATIONS']``."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHING['PBKDF2_ITERATIONS']
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many logins in progress. Try again shortly.'
+    default_code = 'password_hashing_busy'
+
+
+class HashingPool:
+    """
+    Runs password hashing on at most WORKERS threads per process, so a burst
+    of logins cannot take every CPU from other requests. Callers wait up to
+    QUEUE_TIMEOUT seconds for one of WORKERS + MAX_QUEUE slots, then get
+    PasswordHashingBusy. WORKERS = 0 hashes on the calling thread.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        setting_changed.connect(self._reset, weak=False)
+
+    @property
+    def config(self):
+        return settings.PASSWORD_HASHING
+
+    def _reset(self, setting, **kwargs):
+        if setting == 'PASSWORD_HASHING':
+            with self._lock:
+                executor, self._executor, self._slots = self._executor, None, None
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                workers = self.config['WORKERS']
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+                self._slots = threading.BoundedSemaphore(workers + self.config['MAX_QUEUE'])
+            return self._executor, self._slots
+
+    def run(self, func, *args):
+        if not self.config['WORKERS']:
+            return func(*args)
+        executor, slots = self._start()
+        if not slots.acquire(timeout=self.config['QUEUE_TIMEOUT']):
+            raise PasswordHashingBusy()
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            slots.release()
+
+    def verify(self, password, encoded):
+        """(is_correct, must_update), as django.contrib.auth.hashers.verify_password."""
+        return self.run(hashers.verify_password, password, encoded)
+
+    def make_password(self, password):
+        return self.run(hashers.make_password, password)
+
+
+hashing_pool = HashingPool()
@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+
+from users.serializers import ClaimsTokenRefreshSerializer, UsernameTokenObtainPairSerializer
+from users.tokens import blacklist_filter, prune_expired_tokens
+
+User = get_user_model()
+
+# Historical tokens: issued over the last --days, one day lifetime, so all but the newest day are expired.
+SEED_SQL = """
+    INSERT INTO token_blacklist_outstandingtoken (jti, token, created_at, expires_at, user_id)
+    SELECT
+        md5('bench-blacklist-' || n),
+        '',
+        now() - (%(rows)s - n) * %(step)s * interval '1 second',
+        now() - (%(rows)s - n) * %(step)s * interval '1 second' + interval '1 day',
+        %(user_id)s
+    FROM generate_series(1, %(rows)s) AS n
+"""
+BLACKLIST_SQL = """
+    INSERT INTO token_blacklist_blacklistedtoken (token_id, blacklisted_at)
+    SELECT id, created_at FROM token_blacklist_outstandingtoken
+    WHERE id >= %(first_id)s AND id %% %(every)s = 0
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large refresh token history inside a transaction, then time refresh token '
+        'validation (blacklist and token version checks) with the blacklist query alone '
+        'and behind the Bloom filter, before and after prune_expired_tokens(). '
+        'Rolled back afterwards. PostgreSQL only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tokens', type=int, default=10_000_000)
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--blacklist-every', type=int, default=3,
+                            help='Blacklist one in this many historical tokens.')
+        parser.add_argument('--refreshes', type=int, default=2_000)
+        parser.add_argument('--batch-size', type=int, default=20_000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_token_blacklist requires PostgreSQL.')
+
+        with transaction.atomic():
+            user = User.objects.create_user('bench-blacklist', 'bench-blacklist@example.com', None)
+            start = time.perf_counter()
+            self.seed(user, options)
+            self.stdout.write(f"Seeded {options['tokens']} tokens in {time.perf_counter() - start:.1f}s")
+
+            tokens = [str(UsernameTokenObtainPairSerializer.get_token(user)) for _ in range(options['refreshes'])]
+            self.stdout.write(f"{'phase':<14} {'check':<10} {'p50':>9} {'p95':>9} {'p99':>9}")
+            self.measure('history', tokens)
+
+            start = time.perf_counter()
+            deleted = prune_expired_tokens(options['batch_size'])
+            self.stdout.write(f'Pruned {deleted} expired tokens in {time.perf_counter() - start:.1f}s')
+            self.measure('pruned', tokens)
+
+            transaction.set_rollback(True)
+        blacklist_filter.clear()
+
+    def seed(self, user, options):
+        step = options['days'] * 86_400 / options['tokens']
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT coalesce(max(id), 0) + 1 FROM token_blacklist_outstandingtoken')
+            first_id = cursor.fetchone()[0]
+            cursor.execute(SEED_SQL, {'rows': options['tokens'], 'step': step, 'user_id': user.pk})
+            cursor.execute(BLACKLIST_SQL, {'every': options['blacklist_every'], 'first_id': first_id})
+            cursor.execute('ANALYZE token_blacklist_outstandingtoken')
+            cursor.execute('ANALYZE token_blacklist_blacklistedtoken')
+
+    def measure(self, phase, tokens):
+        for label, enabled in (('query', False), ('bloom', True)):
+            config = {**settings.TOKEN_BLACKLIST_FILTER, 'ENABLED': enabled}
+            with override_settings(TOKEN_BLACKLIST_FILTER=config):
+                blacklist_filter.clear()
+                if enabled:
+                    start = time.perf_counter()
+                    blacklist_filter.current()
+                    self.stdout.write(f'{phase:<14} {"(build)":<10} {(time.perf_counter() - start) * 1000:>7.1f}ms')
+                latencies = []
+                for token in tokens:
+                    start = time.perf_counter()
+                    ClaimsTokenRefreshSerializer(data={'refresh': token}).is_valid(raise_exception=True)
+                    latencies.append(time.perf_counter() - start)
+            cuts = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f'{phase:<14} {label:<10} {cuts[49] * 1000:>7.2f}ms {cuts[94] * 1000:>7.2f}ms {cuts[98] * 1000:>7.2f}ms'
+            )
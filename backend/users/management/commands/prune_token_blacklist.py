@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from users.tokens import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding refresh tokens and their blacklist entries, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        total = prune_expired_tokens(options['batch_size'], options['pause'])
+        self.stdout.write(f'Deleted {total} expired outstanding tokens.')
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Chr, Collate, Concat, Left, Length, Ord, Right, Upper
 
 
 class Roles(models.TextChoices):
@@ -12,6 +14,22 @@ def default_role():
     return Roles.MEMBER
 
 
+def directory_key(field):
+    """Case-insensitive sort key in byte order, so every prefix is one contiguous index range."""
+    return Collate(Upper(field), 'C')
+
+
+def directory_prefix_range(prefix):
+    """
+    Bounds of every directory key starting with ``prefix``. The database
+    upper-cases it, as it does the keys, so both agree on characters like "ß".
+    """
+    key = Upper(Value(prefix))
+    # The key with its last character bumped by one code point.
+    high = Concat(Left(key, Length(key) - 1), Chr(Ord(Right(key, 1)) + 1))
+    return Collate(key, 'C'), Collate(high, 'C')
+
+
 class UserManager(BaseUserManager):
     """
     Custom user manager required when customizing AbstractUser fields.
@@ -51,12 +69,70 @@ class User(AbstractUser):
     username = models.CharField(max_length=150, unique=True)
     email = models.EmailField(unique=True)
     role = models.CharField(max_length=20, choices=Roles.choices, default=default_role)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Embedded in issued tokens; bumping it revokes every token issued before.
+    token_version = models.PositiveIntegerField(default=0)
 
     # ✨ IMPORTANT: Use custom user manager
     objects = UserManager()
 
     REQUIRED_FIELDS = ['email']  # For createsuperuser
 
+    # Carried in (or guarding) issued tokens; saving a change to one bumps token_version.
+    TOKEN_FIELDS = ('username', 'role', 'is_active')
+    _password_changed = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # As loaded, so a save can tell which fields it changed (see users.signals).
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def changed_fields(self, fields):
+        """
+        Those of ``fields`` changed since the instance was loaded or last saved.
+        Deferred fields are not written, so never count; a field with no loaded
+        value (an instance not read from the database) always does.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        deferred = self.get_deferred_fields()
+        return {
+            field for field in fields
+            if field not in deferred and (field not in loaded or loaded[field] != getattr(self, field))
+        }
+
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        # Revokes tokens on save; a login upgrading the hash of the same password does not.
+        self._password_changed = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        saved = set(self.TOKEN_FIELDS) | {'password'} if update_fields is None else set(update_fields)
+        revokes = self.changed_fields(saved & set(self.TOKEN_FIELDS)) or (
+            self._password_changed and 'password' in saved
+        )
+        if revokes and not self._state.adding:
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._password_changed = False
+        written = kwargs.get('update_fields')
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), **{
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+            if field.attname not in deferred and (written is None or field.attname in written)
+        }}
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # User directory: prefix search and keyset pages in one ordered range scan.
+            models.Index(directory_key('username'), 'id', name='user_directory_name_idx'),
+            models.Index(directory_key('email'), 'id', name='user_directory_email_idx'),
+        ]
+
     @property
     def is_admin(self):
         return self.role == Roles.ADMIN
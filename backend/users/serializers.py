@@ -1,12 +1,16 @@
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from core.instrumentation import TimedSerializerMixin
+from .authentication import add_user_claims, check_token_version
+from .tokens import RefreshToken
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
 
     class Meta:
@@ -36,6 +40,15 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
+class UserDirectorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Just enough to pick an assignee."""
+
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'role')
+        read_only_fields = fields
+
+
 class RegisterSerializer(UserSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -59,6 +72,12 @@ class RegisterSerializer(UserSerializer):
 
 
 class UsernameTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        # Access tokens inherit these claims, so requests can skip the user query.
+        return add_user_claims(super().get_token(user), user)
 
     def validate(self, attrs):
         username = attrs.get("username")
@@ -86,4 +105,13 @@ class UsernameTokenObtainPairSerializer(TokenObtainPairSerializer):
                 "email": user.email,
                 "role": user.role,
             },
-        }
\ No newline at end of file
+        }
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuse refresh tokens issued before a role change, password change or revocation."""
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        check_token_version(self.token_class(attrs['refresh']))
+        return super().validate(attrs)
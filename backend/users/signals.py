@@ -0,0 +1,36 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tasks.cache import USER_PAYLOAD_FIELDS, invalidate_users
+from .authentication import token_versions
+from .cache import DIRECTORY_FIELDS, invalidate_directory
+from .models import User
+
+
+def saved_fields(fields, update_fields):
+    return set(fields) if update_fields is None else set(fields) & update_fields
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields, **kwargs):
+    """
+    Once a save commits: invalidate the directory and the nested user payloads
+    of task responses if it changed one of their fields, and publish a bumped
+    token_version (see User.save).
+    """
+    if created or instance.changed_fields(saved_fields(DIRECTORY_FIELDS, update_fields)):
+        transaction.on_commit(invalidate_directory)
+    if not created and instance.changed_fields(saved_fields(USER_PAYLOAD_FIELDS, update_fields)):
+        transaction.on_commit(invalidate_users)
+    if instance.changed_fields(['token_version']):
+        transaction.on_commit(partial(token_versions.prime, instance))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_directory)
+    transaction.on_commit(invalidate_users)
+    transaction.on_commit(partial(token_versions.revoke, instance.pk))
@@ -0,0 +1,122 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.authentication import token_versions
+
+User = get_user_model()
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_versions.clear()
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+
+    def login(self, username):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': username, 'password': 'pass1234'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def authorize(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_requests_skip_the_user_query(self):
+        self.authorize(self.login('member')['access'])
+        # Only the aggregate itself; the user comes from the token claims.
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('task-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_claims_user_still_serves_full_profile(self):
+        self.authorize(self.login('member')['access'])
+        response = self.client.get(reverse('user-me'))
+        self.assertEqual(response.data['email'], 'member@example.com')
+
+    def test_role_change_revokes_tokens(self):
+        tokens = self.login('member')
+        self.authorize(self.login('admin')['access'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('user-detail', args=[self.member.pk]), {'role': 'MANAGER'})
+
+        self.authorize(tokens['access'])
+        self.assertEqual(self.client.get(reverse('task-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authorize(self.login('member')['access'])
+        self.assertEqual(self.client.get(reverse('task-list')).status_code, status.HTTP_200_OK)
+
+    def test_deleted_user_token_is_rejected(self):
+        access = self.login('member')['access']
+        self.authorize(self.login('admin')['access'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('user-detail', args=[self.member.pk]))
+
+        self.authorize(access)
+        self.assertEqual(self.client.get(reverse('task-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changes_outside_the_api_revoke_tokens(self):
+        tokens = self.login('admin')
+        self.authorize(tokens['access'])
+        self.assertEqual(self.client.get(reverse('user-list')).status_code, status.HTTP_200_OK)
+
+        # Demoted through the ORM, as the Django admin does.
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.role = 'MEMBER'
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.save()
+        self.assertEqual(self.client.get(reverse('user-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        access = self.login('member')['access']
+        member = User.objects.get(pk=self.member.pk)
+        member.set_password('n3w-Passw0rd!')
+        with self.captureOnCommitCallbacks(execute=True):
+            member.save()
+        self.authorize(access)
+        self.assertEqual(self.client.get(reverse('task-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_saves_keep_tokens(self):
+        self.authorize(self.login('member')['access'])
+        member = User.objects.get(pk=self.member.pk)
+        member.email = 'new@example.com'
+        # A legacy hash, upgraded by the next login without changing the password.
+        User.objects.filter(pk=member.pk).update(password=make_password('pass1234', hasher='pbkdf2_sha256'))
+        with self.captureOnCommitCallbacks(execute=True):
+            member.save(update_fields=['email'])
+            self.login('member')
+
+        self.assertEqual(self.client.get(reverse('task-list')).status_code, status.HTTP_200_OK)
+        member.refresh_from_db()
+        self.assertEqual(member.token_version, self.member.token_version)
+        self.assertFalse(member.password.startswith('pbkdf2_sha256$'))
+
+    def test_revocation_stores_the_new_version(self):
+        token_versions.revoke(self.member.pk)
+        token_versions.clear()  # As in another process.
+        with self.assertNumQueries(0):
+            self.assertEqual(token_versions.get(self.member.pk), self.member.token_version + 1)
+
+    @override_settings(AUTH_TOKEN_VERSION_TTL=0, AUTH_TOKEN_VERSION_CACHE_TTL=0.05)
+    def test_version_stored_by_a_racing_lookup_expires(self):
+        token_versions.revoke(self.member.pk)
+        # A lookup that read the row before the revocation stores it after.
+        token_versions._store(self.member.pk, self.member.token_version)
+        time.sleep(0.1)
+        self.assertEqual(token_versions.get(self.member.pk), self.member.token_version + 1)
+
+    def test_tokens_without_claims_fall_back_to_database(self):
+        self.authorize(str(RefreshToken.for_user(self.member).access_token))
+        response = self.client.get(reverse('user-me'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['role'], 'MEMBER')
@@ -0,0 +1,129 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.cache import directory_cache
+
+User = get_user_model()
+
+
+class UserDirectoryTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass1234', role='ADMIN')
+        self.manager = User.objects.create_user('manager', 'boss@example.com', 'pass1234', role='MANAGER')
+        for name in ('Alice', 'alan', 'bob', 'carol'):
+            User.objects.create_user(name, f'{name.lower()}@corp.example.com', 'pass1234')
+        self.client.force_authenticate(user=self.manager)
+
+    def directory(self, **params):
+        response = self.client.get(reverse('user-directory'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def usernames(self, **params):
+        return [user['username'] for user in self.directory(**params).data['results']]
+
+    def write(self, method, url, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(url, data)
+
+    def test_slim_alphabetical_rows(self):
+        response = self.directory()
+        self.assertEqual(
+            [user['username'] for user in response.data['results']],
+            ['admin', 'alan', 'Alice', 'bob', 'carol', 'manager'],
+        )
+        self.assertEqual(set(response.data['results'][0]), {'id', 'username', 'role'})
+
+    def test_pages(self):
+        first = self.directory(page_size=4)
+        self.assertEqual(len(first.data['results']), 4)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first.data['next'])
+        # The directory key inherits NOT NULL from its field: one segment, no NULL handling.
+        sql = next(query['sql'] for query in queries if 'users_user' in query['sql'])
+        self.assertNotIn('IS NULL', sql)
+        self.assertNotIn('NULLS', sql)
+        self.assertEqual([user['username'] for user in second.data['results']], ['carol', 'manager'])
+        self.assertIsNone(second.data['next'])
+
+    def test_prefix_search_is_case_insensitive(self):
+        self.assertEqual(self.usernames(q='AL'), ['alan', 'Alice'])
+        self.assertEqual(self.usernames(q='ali'), ['Alice'])
+        self.assertEqual(self.usernames(q='lice'), [])
+        self.assertEqual(self.usernames(q='a%'), [])
+
+    def test_prefix_is_upper_cased_like_the_keys(self):
+        # Python upper-cases "ß" to "SS"; the keys keep what the database makes of it.
+        User.objects.create_user('straße', 'strasse@example.com', 'pass1234')
+        self.assertEqual(self.usernames(q='straß'), ['straße'])
+
+    def test_search_by_email(self):
+        self.assertEqual(self.usernames(q='boss@'), ['manager'])
+        self.assertEqual(self.usernames(q='BOB@CORP'), ['bob'])
+
+    def test_role_filter_and_inactive_users(self):
+        User.objects.filter(username='carol').update(is_active=False)
+        self.assertEqual(self.usernames(role='MANAGER'), ['manager'])
+        self.assertNotIn('carol', self.usernames())
+
+    def test_members_are_forbidden(self):
+        self.client.force_authenticate(user=User.objects.get(username='bob'))
+        response = self.client.get(reverse('user-directory'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cached_between_changes(self):
+        self.assertEqual(self.directory(q='a')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.directory(q='a')['X-Cache'], 'HIT')
+        # Shared by everyone allowed to see it.
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.directory(q='a')['X-Cache'], 'HIT')
+
+    def test_admin_changes_invalidate(self):
+        self.client.force_authenticate(user=self.admin)
+        self.directory(q='a')
+
+        self.write('post', reverse('user-list'), {'username': 'anna', 'email': 'anna@example.com', 'role': 'MEMBER'})
+        self.assertIn('anna', self.usernames(q='a'))
+
+        anna = User.objects.get(username='anna')
+        self.write('patch', reverse('user-detail', args=[anna.pk]), {'username': 'zoe'})
+        self.assertNotIn('anna', self.usernames(q='a'))
+        self.assertEqual(self.usernames(q='z'), ['zoe'])
+
+        self.write('delete', reverse('user-detail', args=[anna.pk]))
+        self.assertEqual(self.usernames(q='z'), [])
+
+    def test_changes_outside_the_api_invalidate(self):
+        self.directory(q='b')
+        bob = User.objects.get(username='bob')
+        with self.captureOnCommitCallbacks(execute=True):
+            bob.username = 'brian'
+            bob.save()
+        self.assertEqual(self.usernames(q='b'), ['brian'])
+        with self.captureOnCommitCallbacks(execute=True):
+            bob.delete()
+        self.assertEqual(self.usernames(q='b'), [])
+
+    def test_unrelated_update_keeps_the_cache(self):
+        self.client.force_authenticate(user=self.admin)
+        self.directory()
+        generation = directory_cache.generations(['directory'])
+        bob = User.objects.get(username='bob')
+        self.write('patch', reverse('user-detail', args=[bob.pk]), {'password': 'n3w-Passw0rd!'})
+        self.assertEqual(directory_cache.generations(['directory']), generation)
+
+    def test_registration_invalidates(self):
+        self.directory(q='d')
+        self.client.force_authenticate(user=None)
+        self.write(
+            'post', reverse('register'), {'username': 'dave', 'email': 'dave@example.com', 'password': 'n3w-Passw0rd!'}
+        )
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(self.usernames(q='d'), ['dave'])
@@ -0,0 +1,111 @@
+import time
+from functools import partial
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.tests.utils import override_setting_dict
+from users.hashers import hashing_pool
+
+User = get_user_model()
+
+
+hashing = partial(override_setting_dict, 'PASSWORD_HASHING')
+throttle = partial(override_setting_dict, 'LOGIN_THROTTLE')
+
+
+class LoginTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234', role='MEMBER')
+
+    def login(self, username='member', password='pass1234', ip='10.0.0.1'):
+        return self.client.post(
+            reverse('token_obtain_pair'), {'username': username, 'password': password}, REMOTE_ADDR=ip
+        )
+
+    def test_new_passwords_use_the_preferred_hasher(self):
+        self.assertEqual(identify_hasher(self.member.password).algorithm, 'argon2')
+        params = identify_hasher(self.member.password).decode(self.member.password)['params']
+        self.assertEqual(params.memory_cost, settings.PASSWORD_HASHING['ARGON2']['MEMORY_COST'])
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        User.objects.filter(pk=self.member.pk).update(password=make_password('pass1234', hasher='pbkdf2_sha256'))
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.member.refresh_from_db()
+        self.assertEqual(identify_hasher(self.member.password).algorithm, 'argon2')
+        self.assertTrue(self.member.check_password('pass1234'))
+
+    def test_cost_change_rehashes_on_login(self):
+        argon2 = {**settings.PASSWORD_HASHING['ARGON2'], 'TIME_COST': 3}
+        with hashing(ARGON2=argon2):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.member.refresh_from_db()
+        params = identify_hasher(self.member.password).decode(self.member.password)['params']
+        self.assertEqual(params.time_cost, 3)
+
+    def test_wrong_password_does_not_rehash(self):
+        before = self.member.password
+        self.assertEqual(self.login(password='wrong').status_code, status.HTTP_400_BAD_REQUEST)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.password, before)
+
+    def test_hashing_inline_when_pool_disabled(self):
+        with hashing(WORKERS=0):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_busy_pool_rejects_login(self):
+        with hashing(WORKERS=1, MAX_QUEUE=0, QUEUE_TIMEOUT=0):
+            _, slots = hashing_pool._start()
+            slots.acquire()
+            try:
+                response = self.login()
+            finally:
+                slots.release()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_failed_attempts_per_username_and_ip_are_limited(self):
+        with throttle(USERNAME_LIMIT=3, WINDOW=900):
+            for _ in range(3):
+                self.assertEqual(self.login(password='wrong').status_code, status.HTTP_400_BAD_REQUEST)
+            with mock.patch.object(hashing_pool, 'verify') as verify:
+                # Refused before hashing, even with the right password.
+                response = self.login()
+            verify.assert_not_called()
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            # Failures elsewhere do not lock the user out.
+            self.assertEqual(self.login(ip='10.0.0.2').status_code, status.HTTP_200_OK)
+
+            with mock.patch('users.throttling.time.time', return_value=time.time() + 600):
+                response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(299 <= int(response['Retry-After']) <= 300)
+
+    def test_body_that_is_not_an_object_is_rejected(self):
+        response = self.client.post(reverse('token_obtain_pair'), ['member', 'pass1234'], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_success_clears_username_failures(self):
+        with throttle(USERNAME_LIMIT=3):
+            for _ in range(2):
+                self.login(password='wrong')
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            for _ in range(2):
+                self.login(password='wrong')
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_failed_attempts_per_ip_are_limited(self):
+        with throttle(IP_LIMIT=3):
+            for n in range(3):
+                self.login(username=f'nobody{n}', password='wrong')
+            self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self.login(ip='10.0.0.2').status_code, status.HTTP_200_OK)
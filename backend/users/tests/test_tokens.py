@@ -0,0 +1,128 @@
+import datetime
+from functools import partial
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.bloom import BloomFilter
+from core.tests.utils import override_setting_dict
+from users.authentication import token_versions
+from users.serializers import UsernameTokenObtainPairSerializer
+from users.tokens import blacklist_filter, prune_expired_tokens
+
+User = get_user_model()
+
+
+bloom = partial(override_setting_dict, 'TOKEN_BLACKLIST_FILTER')
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives(self):
+        bloom_filter = BloomFilter(1_000, 0.01)
+        items = [f'jti-{n}' for n in range(1_000)]
+        for item in items:
+            bloom_filter.add(item)
+        self.assertTrue(all(item in bloom_filter for item in items))
+        false_positives = sum(f'other-{n}' in bloom_filter for n in range(10_000))
+        self.assertLess(false_positives, 300)
+
+
+class PruneExpiredTokensTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('member', 'member@example.com', 'pass1234')
+        now = timezone.now()
+        for n in range(5):
+            OutstandingToken.objects.create(
+                user=self.user, jti=f'expired-{n}', token='',
+                created_at=now - datetime.timedelta(days=3), expires_at=now - datetime.timedelta(days=2),
+            )
+        self.live = OutstandingToken.objects.create(
+            user=self.user, jti='live', token='', created_at=now, expires_at=now + datetime.timedelta(days=1),
+        )
+        for token in OutstandingToken.objects.filter(jti__in=['expired-0', 'expired-3', 'live']):
+            BlacklistedToken.objects.create(token=token)
+
+    def test_deletes_expired_tokens_and_their_blacklist_entries(self):
+        self.assertEqual(prune_expired_tokens(batch_size=2), 5)
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), ['live'])
+        self.assertEqual(prune_expired_tokens(), 0)
+
+    def test_batches_seek_past_the_last_deleted_id(self):
+        expired_ids = sorted(OutstandingToken.objects.exclude(jti='live').values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            prune_expired_tokens(batch_size=2)
+        seeks = [query['sql'] for query in queries if '"expires_at" <=' in query['sql']]
+        # Batches of 2, 2 and 1, then an empty one.
+        self.assertEqual(len(seeks), 4)
+        for sql, last_id in zip(seeks[1:], [expired_ids[1], expired_ids[3], expired_ids[4]]):
+            self.assertIn(f'"token_blacklist_outstandingtoken"."id" > {last_id}', sql)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('prune_token_blacklist', batch_size=2, stdout=out)
+        self.assertIn('Deleted 5 expired outstanding tokens.', out.getvalue())
+
+
+class BlacklistFilterTests(APITestCase):
+    def setUp(self):
+        blacklist_filter.clear()
+        token_versions.clear()
+        self.member = User.objects.create_user('member', 'member@example.com', 'pass1234')
+
+    def tearDown(self):
+        blacklist_filter.clear()
+
+    def refresh(self, token):
+        return self.client.post(reverse('token_refresh'), {'refresh': str(token)})
+
+    def blacklist_queries(self, queries):
+        return [query for query in queries if 'token_blacklist_blacklistedtoken' in query['sql']]
+
+    @bloom(ENABLED=True)
+    def test_unlisted_token_skips_the_blacklist_query(self):
+        token = UsernameTokenObtainPairSerializer.get_token(self.member)
+        blacklist_filter.current()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.blacklist_queries(queries.captured_queries), [])
+
+    def test_disabled_filter_queries_the_blacklist(self):
+        token = UsernameTokenObtainPairSerializer.get_token(self.member)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.blacklist_queries(queries.captured_queries))
+
+    @bloom(ENABLED=True)
+    def test_token_blacklisted_before_the_build_is_rejected(self):
+        token = UsernameTokenObtainPairSerializer.get_token(self.member)
+        token.blacklist()
+        blacklist_filter.clear()
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @bloom(ENABLED=True)
+    def test_token_blacklisted_after_the_build_is_rejected(self):
+        token = UsernameTokenObtainPairSerializer.get_token(self.member)
+        blacklist_filter.current()
+        token.blacklist()
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @bloom(ENABLED=True)
+    def test_logout_blacklists_through_the_filter(self):
+        login = self.client.post(reverse('token_obtain_pair'), {'username': 'member', 'password': 'pass1234'}).data
+        blacklist_filter.current()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login['access']}")
+        self.client.post(reverse('logout'), {'refresh': login['refresh']})
+        self.client.credentials()
+        self.assertEqual(self.refresh(login['refresh']).status_code, status.HTTP_401_UNAUTHORIZED)
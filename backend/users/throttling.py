@@ -0,0 +1,76 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LoginAttemptLimiter:
+    """
+    Counts failed logins per username and client IP pair, and per client IP,
+    in a cache, and refuses further attempts once either reaches its limit
+    within WINDOW seconds, before any password is hashed. Failures from other
+    IPs never lock a user out. A successful login clears the pair's count.
+    Configured by ``settings.LOGIN_THROTTLE``.
+    """
+
+    @property
+    def config(self):
+        return settings.LOGIN_THROTTLE
+
+    @property
+    def cache(self):
+        return caches[self.config['CACHE']]
+
+    def keys(self, username, ip):
+        keys = {}
+        if username:
+            keys[f'login-fail:user:{ip}:{str(username).lower()}'] = self.config['USERNAME_LIMIT']
+        if ip:
+            keys[f'login-fail:ip:{ip}'] = self.config['IP_LIMIT']
+        return keys
+
+    def _until_key(self, key):
+        return f'{key}:until'
+
+    def retry_after(self, username, ip):
+        """Seconds until ``username`` may try again from ``ip``; 0 when it has attempts left."""
+        limits = self.keys(username, ip)
+        found = self.cache.get_many([*limits, *map(self._until_key, limits)])
+        now = time.time()
+        waits = [
+            found.get(self._until_key(key), now + self.config['WINDOW']) - now
+            for key, limit in limits.items() if found.get(key, 0) >= limit
+        ]
+        return max(1, math.ceil(max(waits))) if waits else 0
+
+    def _start(self, key):
+        window = self.config['WINDOW']
+        if not self.cache.add(key, 1, window):
+            return False
+        self.cache.set(self._until_key(key), time.time() + window, window)
+        return True
+
+    def failed(self, username, ip):
+        for key in self.keys(username, ip):
+            # The window starts at the first failure and is not extended by later ones.
+            if not self._start(key):
+                try:
+                    self.cache.incr(key)
+                except ValueError:
+                    # Expired between add() and incr().
+                    self._start(key)
+
+    def succeeded(self, username, ip):
+        self.cache.delete_many([
+            name for key in self.keys(username, ip) if key.startswith('login-fail:user:')
+            for name in (key, self._until_key(key))
+        ])
+
+
+login_limiter = LoginAttemptLimiter()
+
+
+def client_ip(request):
+    """REMOTE_ADDR; behind a proxy, have it set REMOTE_ADDR from the forwarded address."""
+    return request.META.get('REMOTE_ADDR')
@@ -0,0 +1,127 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.bloom import BloomFilter
+
+
+class BlacklistFilter:
+    """
+    A per-process Bloom filter of the jtis of unexpired blacklisted tokens,
+    rebuilt from the database every TTL seconds. A jti it has never seen skips
+    the blacklist query; a possible match still asks the database. Tokens
+    blacklisted by this process are added at once; ones blacklisted by another
+    process are only seen after the next rebuild, so a logged-out refresh token
+    may be accepted elsewhere for up to TTL seconds.
+    Configured by ``settings.TOKEN_BLACKLIST_FILTER``.
+    """
+
+    def __init__(self):
+        self._filter = None
+        self._built_at = 0.0
+        self._added = None
+        self._lock = threading.Lock()
+        self._rebuilding = threading.Lock()
+
+    @property
+    def config(self):
+        return settings.TOKEN_BLACKLIST_FILTER
+
+    @property
+    def enabled(self):
+        return self.config['ENABLED']
+
+    def might_contain(self, jti):
+        return jti in self.current()
+
+    def current(self):
+        bloom = self._filter
+        if bloom is not None and time.monotonic() - self._built_at < self.config['TTL']:
+            return bloom
+        # One thread rebuilds; the others keep using the stale filter meanwhile.
+        if self._rebuilding.acquire(blocking=bloom is None):
+            try:
+                if self._filter is bloom:
+                    self.rebuild()
+            finally:
+                self._rebuilding.release()
+        return self._filter
+
+    def rebuild(self):
+        with self._lock:
+            self._added = []
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list('token__jti', flat=True)
+        )
+        # Room to grow until the next rebuild.
+        bloom = BloomFilter(2 * len(jtis) + 1024, self.config['ERROR_RATE'])
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            # Blacklisted while the query ran.
+            for jti in self._added:
+                bloom.add(jti)
+            self._added = None
+            self._filter = bloom
+            self._built_at = time.monotonic()
+
+    def add(self, jti):
+        with self._lock:
+            if self._added is not None:
+                self._added.append(jti)
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def clear(self):
+        with self._lock:
+            self._filter = None
+            self._built_at = 0.0
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class RefreshToken(tokens.RefreshToken):
+    """Checks blacklist_filter before querying the blacklist, when it is enabled."""
+
+    def check_blacklist(self):
+        if blacklist_filter.enabled and not blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            return
+        super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+def prune_expired_tokens(batch_size=5000, pause=0.0, now=None):
+    """
+    Delete expired outstanding tokens and their blacklist entries, a batch per
+    short transaction. An expired token fails verification whether or not it
+    is listed. Returns the number of outstanding tokens deleted.
+    """
+    now = now or timezone.now()
+    # Oldest ids expire first. Each batch seeks past the last id deleted, so the
+    # pk index never walks back over the dead entries of earlier batches.
+    expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('id')
+    total = last_id = 0
+    while True:
+        ids = list(expired.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            total += OutstandingToken.objects.filter(id__in=ids).only('id').delete()[1].get(
+                OutstandingToken._meta.label, 0
+            )
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
@@ -1,18 +1,25 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
 from core.permissions import IsAdmin, IsManagerOrAdmin
+from .cache import DIRECTORY_TAG, directory_cache, directory_key_parts
+from .models import directory_key, directory_prefix_range
 from .serializers import (
     RegisterSerializer,
+    UserDirectorySerializer,
     UserSerializer,
     UsernameTokenObtainPairSerializer
 )
+from .throttling import client_ip, login_limiter
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -22,9 +29,28 @@ User = get_user_model()
 # -------------------------
 
 class LoginView(TokenObtainPairView):
-    """Custom login view using custom serializer."""
+    """Custom login view using custom serializer; repeated failures are throttled."""
     serializer_class = UsernameTokenObtainPairSerializer
 
+    def post(self, request, *args, **kwargs):
+        # The serializer rejects a body that is not an object; it still counts against the IP.
+        username = request.data.get('username') if isinstance(request.data, dict) else None
+        ip = client_ip(request)
+        retry_after = login_limiter.retry_after(username, ip)
+        if retry_after:
+            return Response(
+                {'detail': 'Too many failed login attempts. Try again later.'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(retry_after)},
+            )
+        try:
+            response = super().post(request, *args, **kwargs)
+        except ValidationError:
+            login_limiter.failed(username, ip)
+            raise
+        login_limiter.succeeded(username, ip)
+        return response
+
 
 class RegisterView(APIView):
     """Public user registration."""
@@ -60,12 +86,18 @@ class LogoutView(APIView):
 # USER MANAGEMENT (Admin Only)
 # -------------------------
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserDirectoryPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+
+
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     Admin-only user management.
     Extra routes:
         /users/me/        → any authenticated user
         /users/options/   → manager/admin only
+        /users/directory/ → manager/admin only
     """
     serializer_class = UserSerializer
     queryset = User.objects.all().order_by('id')
@@ -78,7 +110,7 @@ class UserViewSet(viewsets.ModelViewSet):
         if action == "me":
             return [IsAuthenticated()]
 
-        if action == "options":
+        if action in ("options", "directory"):
             return [IsManagerOrAdmin()]
 
         # Default: admin only
@@ -87,11 +119,51 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def me(self, request):
         """Return the logged-in user's profile."""
-        serializer = self.get_serializer(request.user)
-        return Response(serializer.data)
+        user = request.user
+        if user.get_deferred_fields():
+            # Built from token claims; load the full profile in one query.
+            user = self.get_queryset().get(pk=user.pk)
+        etag, last_modified = self.get_object_validators(user)
+        return self.conditional_response(
+            etag, last_modified, lambda: Response(self.get_serializer(user).data)
+        )
 
     @action(detail=False, methods=['get'])
     def options(self, request):
         """Return all users to managers/admins."""
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return Response(serializer.data)
+        queryset = self.get_queryset()
+        etag, last_modified = self.get_list_validators(queryset)
+        return self.conditional_response(
+            etag, last_modified, lambda: Response(self.get_serializer(queryset, many=True).data)
+        )
+
+    @action(detail=False, methods=['get'])
+    def directory(self, request):
+        """
+        Active users as id/username/role for assignee typeahead, ordered by username.
+        ``?q=`` prefix-matches usernames, or emails once it contains "@"
+        (case-insensitive); ``?role=`` filters.
+        """
+        return directory_cache.respond(
+            request, directory_key_parts(request), [DIRECTORY_TAG], lambda: self.directory_response(request)
+        )
+
+    def directory_response(self, request):
+        query = request.query_params.get('q', '').strip()
+        # Sort by the searched field so the prefix and the page come from one index range.
+        field = 'email' if '@' in query else 'username'
+        queryset = (
+            User.objects.filter(is_active=True)
+            .annotate(directory_key=directory_key(field))
+            .only('id', 'username', 'role')
+            .order_by('directory_key')
+        )
+        if query:
+            low, high = directory_prefix_range(query)
+            queryset = queryset.filter(directory_key__gte=low, directory_key__lt=high)
+        role = request.query_params.get('role')
+        if role:
+            queryset = queryset.filter(role=role)
+        paginator = UserDirectoryPagination()
+        page = paginator.paginate_queryset(queryset, request, self)
+        return paginator.get_paginated_response(UserDirectorySerializer(page, many=True).data)
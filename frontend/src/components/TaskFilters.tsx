@@ -5,13 +5,15 @@ import {
   SelectItem,
   SelectValue,
 } from "@/components/ui/select"
-import { ApiUser, TaskStatus } from "../types"
+import { DirectoryUser, TaskStatus } from "../types"
+import UserPicker from "./UserPicker"
 
 type TProps = {
   status?: TaskStatus
   assignee?: string
   onChange: (filters: { status?: TaskStatus; assignee?: string }) => void
-  users: ApiUser[]
+  // Fixed choices; without them, pick from the whole user directory.
+  users?: DirectoryUser[]
 }
 
 // Special constant for "All"
@@ -53,27 +55,41 @@ const TaskFilters = ({ status, assignee, onChange, users }: TProps) => (
         Assignee
       </label>
 
-      <Select
-        value={assignee ?? ALL_VALUE}
-        onValueChange={(value) =>
-          onChange({
-            assignee: value === ALL_VALUE ? undefined : value,
-          })
-        }
-      >
-        <SelectTrigger className="w-full">
-          <SelectValue placeholder="All" />
-        </SelectTrigger>
+      {users ? (
+        <Select
+          value={assignee ?? ALL_VALUE}
+          onValueChange={(value) =>
+            onChange({
+              assignee: value === ALL_VALUE ? undefined : value,
+            })
+          }
+        >
+          <SelectTrigger className="w-full">
+            <SelectValue placeholder="All" />
+          </SelectTrigger>
 
-        <SelectContent>
-          <SelectItem value={ALL_VALUE}>All</SelectItem>
-          {users.map((user) => (
-            <SelectItem key={user.id} value={String(user.id)}>
-              {user.username}
-            </SelectItem>
-          ))}
-        </SelectContent>
-      </Select>
+          <SelectContent>
+            <SelectItem value={ALL_VALUE}>All</SelectItem>
+            {users.map((user) => (
+              <SelectItem key={user.id} value={String(user.id)}>
+                {user.username}
+              </SelectItem>
+            ))}
+          </SelectContent>
+        </Select>
+      ) : (
+        <UserPicker
+          value={assignee ?? ALL_VALUE}
+          onChange={(value) =>
+            onChange({
+              assignee: value === ALL_VALUE ? undefined : value,
+            })
+          }
+          emptyValue={ALL_VALUE}
+          emptyLabel="All"
+          triggerClassName="w-full"
+        />
+      )}
     </div>
 
   </div>
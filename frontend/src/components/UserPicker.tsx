@@ -0,0 +1,71 @@
+import { useEffect, useState } from "react"
+
+import {
+  Select,
+  SelectTrigger,
+  SelectContent,
+  SelectItem,
+  SelectValue,
+} from "@/components/ui/select"
+import Input from "./ui/Input"
+import { useUserDirectory } from "../hooks/useUsers"
+import { DirectoryUser } from "../types"
+
+type TProps = {
+  value: string
+  onChange: (value: string) => void
+  // The user behind `value` when it is set from outside, e.g. a task's current assignee.
+  selected?: DirectoryUser | null
+  emptyValue: string
+  emptyLabel: string
+  triggerClassName?: string
+}
+
+// A searchable user select backed by the paginated directory instead of the full user list.
+const UserPicker = ({ value, onChange, selected, emptyValue, emptyLabel, triggerClassName }: TProps) => {
+  const [search, setSearch] = useState("")
+  const [picked, setPicked] = useState<DirectoryUser | null>(selected ?? null)
+  const { data: users = [] } = useUserDirectory(search)
+
+  useEffect(() => {
+    setPicked(selected ?? null)
+  }, [selected])
+
+  // Keep the chosen user listed while the search shows others, so the trigger still names them.
+  const options = picked && String(picked.id) === value && !users.some((user) => user.id === picked.id)
+    ? [picked, ...users]
+    : users
+
+  const handleChange = (next: string) => {
+    setPicked(options.find((user) => String(user.id) === next) ?? null)
+    onChange(next)
+  }
+
+  return (
+    <div className="flex flex-col gap-2">
+      <Input
+        placeholder="Search by username or email"
+        value={search}
+        onChange={(event) => setSearch(event.target.value)}
+        className={triggerClassName}
+      />
+
+      <Select value={value} onValueChange={handleChange}>
+        <SelectTrigger className={triggerClassName}>
+          <SelectValue placeholder={emptyLabel} />
+        </SelectTrigger>
+
+        <SelectContent>
+          <SelectItem value={emptyValue}>{emptyLabel}</SelectItem>
+          {options.map((user) => (
+            <SelectItem key={user.id} value={String(user.id)}>
+              {user.username}
+            </SelectItem>
+          ))}
+        </SelectContent>
+      </Select>
+    </div>
+  )
+}
+
+export default UserPicker
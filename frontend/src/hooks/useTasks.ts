@@ -1,22 +1,169 @@
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
+import { useEffect, useRef } from 'react'
+import { InfiniteData, QueryClient, useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import client from '../lib/api/client'
-import { Task } from '../types'
+import { useAuthStore } from '../store/useAuthStore'
+import { CursorPaginatedResponse, Task, TaskEvent, TaskStats, TaskSyncResponse } from '../types'
 
 export const TASKS_KEY = ['tasks']
 
-export const useTasks = (params?: Record<string, string | number | undefined>) => {
-  return useQuery({
+export const useTasks = (params?: Record<string, string | number | undefined>, options?: { enabled?: boolean }) => {
+  return useInfiniteQuery({
     queryKey: [...TASKS_KEY, params],
-    queryFn: async () => {
+    queryFn: async ({ pageParam }) => {
       const filteredParams = Object.fromEntries(
         Object.entries(params ?? {}).filter(([, value]) => value !== undefined && value !== '')
       )
-      const { data } = await client.get<Task[]>('tasks/', { params: filteredParams })
+      // Follow the server's cursor links verbatim; they already carry the filters.
+      const { data } = pageParam
+        ? await client.get<CursorPaginatedResponse<Task>>(pageParam)
+        : await client.get<CursorPaginatedResponse<Task>>('tasks/', { params: filteredParams })
+      return data
+    },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next,
+    select: (data) => data.pages.flatMap((page) => page.results),
+    enabled: options?.enabled ?? true
+  })
+}
+
+export const useTaskStats = () => {
+  return useQuery({
+    queryKey: [...TASKS_KEY, 'stats'],
+    queryFn: async () => {
+      const { data } = await client.get<TaskStats>('tasks/stats/')
       return data
     }
   })
 }
 
+type TaskPages = InfiniteData<CursorPaginatedResponse<Task>>
+
+// Drop deleted tasks and replace changed ones in every cached task list page.
+const mergeTaskChanges = (data: TaskPages | undefined, changed: Map<number, Task>, deleted: Set<number>) => {
+  if (!data?.pages) return data
+  return {
+    ...data,
+    pages: data.pages.map((page) => ({
+      ...page,
+      results: page.results
+        .filter((task) => !deleted.has(task.id))
+        .map((task) => changed.get(task.id) ?? task)
+    }))
+  }
+}
+
+const applyTaskChanges = (queryClient: QueryClient, changed: Map<number, Task>, deleted: Set<number>) => {
+  if (!changed.size && !deleted.size) return
+  queryClient.setQueriesData<TaskPages>(
+    { queryKey: TASKS_KEY, predicate: (query) => query.queryKey[1] !== 'stats' },
+    (data) => mergeTaskChanges(data, changed, deleted)
+  )
+  changed.forEach((task) => queryClient.setQueryData(['task', task.id], task))
+  // New tasks may belong anywhere in a filtered list, and counts change; refetch those lazily.
+  queryClient.invalidateQueries({ queryKey: TASKS_KEY, refetchType: 'none' })
+  queryClient.invalidateQueries({ queryKey: [...TASKS_KEY, 'stats'] })
+}
+
+export const useTaskSync = (intervalMs = 30000) => {
+  const queryClient = useQueryClient()
+  const watermark = useRef<string | null>(null)
+
+  useEffect(() => {
+    let cancelled = false
+
+    const sync = async () => {
+      if (!watermark.current) {
+        const { data } = await client.get<TaskSyncResponse>('tasks/sync/')
+        watermark.current = data.watermark
+        return
+      }
+
+      const changed = new Map<number, Task>()
+      const deleted = new Set<number>()
+      let page = (await client.get<TaskSyncResponse>('tasks/sync/', { params: { since: watermark.current } })).data
+      const nextWatermark = page.watermark
+      page.deleted?.forEach((id) => deleted.add(id))
+      for (;;) {
+        page.changed?.forEach((task) => changed.set(task.id, task))
+        if (!page.next) break
+        page = (await client.get<TaskSyncResponse>(page.next)).data
+      }
+      if (cancelled) return
+      watermark.current = nextWatermark
+      applyTaskChanges(queryClient, changed, deleted)
+    }
+
+    const run = () => sync().catch(() => {
+      // A 410 means the watermark is too old: start over from a full refetch.
+      watermark.current = null
+      queryClient.invalidateQueries({ queryKey: TASKS_KEY })
+    })
+    run()
+    const timer = window.setInterval(run, intervalMs)
+    return () => {
+      cancelled = true
+      window.clearInterval(timer)
+    }
+  }, [queryClient, intervalMs])
+}
+
+const TASK_EVENT_TYPES = ['task.created', 'task.updated', 'task.assigned', 'task.deleted', 'task.removed']
+
+// Live updates from the server's change feed; `resync` means events were dropped.
+export const useTaskEvents = () => {
+  const queryClient = useQueryClient()
+  const accessToken = useAuthStore((state) => state.accessToken)
+
+  useEffect(() => {
+    if (!accessToken) return
+    let source: EventSource | undefined
+    let retry: number | undefined
+    let cancelled = false
+
+    const onTaskEvent = (message: MessageEvent<string>) => {
+      const event: TaskEvent = JSON.parse(message.data)
+      if (event.task) {
+        applyTaskChanges(queryClient, new Map([[event.id, event.task]]), new Set())
+      } else {
+        applyTaskChanges(queryClient, new Map(), new Set([event.id]))
+      }
+    }
+
+    // EventSource cannot send the access token, so each connection redeems a single-use ticket.
+    // That also rules out EventSource's own reconnects: reconnect with a new ticket instead.
+    const reconnect = () => {
+      source?.close()
+      if (!cancelled) retry = window.setTimeout(connect, 5000)
+    }
+    const connect = async () => {
+      let ticket: string
+      try {
+        const { data } = await client.post<{ ticket: string }>('tasks/events/ticket/')
+        ticket = data.ticket
+      } catch {
+        reconnect()
+        return
+      }
+      if (cancelled) return
+      const url = new URL('tasks/events/', new URL(client.defaults.baseURL ?? '/api/', window.location.href))
+      url.searchParams.set('ticket', ticket)
+      source = new EventSource(url)
+      TASK_EVENT_TYPES.forEach((type) => source?.addEventListener(type, onTaskEvent as EventListener))
+      source.addEventListener('resync', () => {
+        queryClient.invalidateQueries({ queryKey: TASKS_KEY })
+      })
+      source.onerror = reconnect
+    }
+
+    connect()
+    return () => {
+      cancelled = true
+      window.clearTimeout(retry)
+      source?.close()
+    }
+  }, [queryClient, accessToken])
+}
+
 export const useTask = (id: string | number, options?: { enabled?: boolean }) => {
   return useQuery({
     queryKey: ['task', id],
@@ -1,6 +1,7 @@
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
+import { useEffect, useState } from 'react'
+import { keepPreviousData, useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import client from '../lib/api/client'
-import { ApiUser } from '../types'
+import { ApiUser, CursorPaginatedResponse, DirectoryUser } from '../types'
 
 export const USERS_KEY = ['users']
 
@@ -21,6 +22,29 @@ export const useUsers = (options?: UseUsersOptions) => {
   })
 }
 
+// Typeahead over /users/directory/: the first page of users whose username (or email, once it has an "@") starts with `search`.
+export const useUserDirectory = (search: string, options?: { enabled?: boolean }) => {
+  const [query, setQuery] = useState(search.trim())
+
+  useEffect(() => {
+    const timer = setTimeout(() => setQuery(search.trim()), 200)
+    return () => clearTimeout(timer)
+  }, [search])
+
+  return useQuery({
+    queryKey: [...USERS_KEY, 'directory', query],
+    queryFn: async () => {
+      const { data } = await client.get<CursorPaginatedResponse<DirectoryUser>>('users/directory/', {
+        params: query ? { q: query } : {}
+      })
+      return data.results
+    },
+    placeholderData: keepPreviousData,
+    staleTime: 30_000,
+    enabled: options?.enabled ?? true
+  })
+}
+
 export const useUserMutation = () => {
   const queryClient = useQueryClient()
   return useMutation({
@@ -1,12 +1,20 @@
-import axios from 'axios'
+import axios, { InternalAxiosRequestConfig } from 'axios'
 import { useAuthStore } from '../../store/useAuthStore'
 
 const client = axios.create({
   baseURL: import.meta.env.VITE_API_URL || 'http://localhost:8000/api/',
   withCredentials: false,
-  headers: { 'Content-Type': 'application/json' }
+  headers: { 'Content-Type': 'application/json' },
+  // 304 Not Modified is answered from the ETag cache below
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304
 })
 
+// --- ETAG CACHE (CONDITIONAL GET) ---
+const etagCache = new Map<string, { etag: string; data: unknown }>()
+let etagCacheToken: string | null = null
+
+const cacheKey = (config: InternalAxiosRequestConfig) => client.getUri(config)
+
 // --- REQUEST INTERCEPTOR (ATTACH ACCESS TOKEN) ---
 client.interceptors.request.use((config) => {
   const token = useAuthStore.getState().accessToken
@@ -14,12 +22,35 @@ client.interceptors.request.use((config) => {
     config.headers = config.headers || {}
     config.headers.Authorization = `Bearer ${token}`
   }
+  if (token !== etagCacheToken) {
+    // Never revalidate one session's responses with another's
+    etagCache.clear()
+    etagCacheToken = token
+  }
+  if (config.method === 'get') {
+    const cached = etagCache.get(cacheKey(config))
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag
+    }
+  }
   return config
 })
 
 // --- RESPONSE INTERCEPTOR (AUTO LOGOUT ON 401) ---
 client.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if (response.config.method !== 'get') return response
+    const key = cacheKey(response.config)
+    if (response.status === 304) {
+      const cached = etagCache.get(key)
+      return cached ? { ...response, status: 200, data: cached.data } : response
+    }
+    const etag = response.headers['etag']
+    if (etag) {
+      etagCache.set(key, { etag, data: response.data })
+    }
+    return response
+  },
   (error) => {
     if (error.response?.status === 401) {
       // Clear tokens and user state
@@ -1,35 +1,38 @@
 import { useMemo, useState } from "react"
 import TaskCategoryDialog from "../components/TaskCategoryDialog"
 import Card from "../components/ui/Card"
-import { useTasks } from "../hooks/useTasks"
+import { useTaskStats, useTasks } from "../hooks/useTasks"
 import { useAuthStore } from "../store/useAuthStore"
-import { Task } from "../types"
 import { CategoryKey } from "../types"
 
 
 const DashboardPage = () => {
   const { user } = useAuthStore()
-  const { data: tasks = [], isLoading } = useTasks()
+  const { data: counts, isLoading } = useTaskStats()
   const [activeCategory, setActiveCategory] = useState<CategoryKey | null>(null)
 
-  const stats = useMemo(() => {
-    const total = tasks.length
-    const todo = tasks.filter((task) => task.status === 'TODO').length
-    const completed = tasks.filter((task) => task.status === 'COMPLETED').length
-    const inProgress = tasks.filter((task) => task.status === 'IN_PROGRESS').length
-    const assignedToMe = tasks.filter((task) => task.assigned_to?.id === user?.id).length
-    return { total, todo, completed, inProgress, assignedToMe }
-  }, [tasks, user])
+  const stats = {
+    total: counts?.total ?? 0,
+    todo: counts?.todo ?? 0,
+    inProgress: counts?.in_progress ?? 0,
+    completed: counts?.completed ?? 0,
+    assignedToMe: counts?.assigned_to_me ?? 0,
+  }
 
-  const categorizedTasks = useMemo<Record<CategoryKey, Task[]>>(
+  // Only the opened category is fetched, one page at a time.
+  const categoryParams = useMemo<Record<CategoryKey, Record<string, string | number | undefined>>>(
     () => ({
-      total: tasks,
-      todo: tasks.filter((task) => task.status === "TODO"),
-      inProgress: tasks.filter((task) => task.status === "IN_PROGRESS"),
-      completed: tasks.filter((task) => task.status === "COMPLETED"),
-      assignedToMe: tasks.filter((task) => task.assigned_to?.id === user?.id),
+      total: {},
+      todo: { status: "TODO" },
+      inProgress: { status: "IN_PROGRESS" },
+      completed: { status: "COMPLETED" },
+      assignedToMe: { assigned_to: user?.id },
     }),
-    [tasks, user]
+    [user]
+  )
+  const { data: categoryTasks = [] } = useTasks(
+    activeCategory ? categoryParams[activeCategory] : undefined,
+    { enabled: Boolean(activeCategory) }
   )
 
   const categoryLabels: Record<CategoryKey, string> = {
@@ -75,7 +78,7 @@ const DashboardPage = () => {
 
       <TaskCategoryDialog
         title={activeCategory ? categoryLabels[activeCategory] : null}
-        tasks={activeCategory ? categorizedTasks[activeCategory] : []}
+        tasks={activeCategory ? categoryTasks : []}
         onClose={() => setActiveCategory(null)}
       />
     </div>
@@ -11,7 +11,7 @@ import {
   SelectItem
 } from "@/components/ui/select"
 
-import { useUsers } from "../../hooks/useUsers"
+import UserPicker from "../../components/UserPicker"
 import { useAuthStore } from "../../store/useAuthStore"
 import { useEffect, useState } from "react"
 import { useToast } from "../../providers/ToastProvider"
@@ -27,11 +27,6 @@ const TaskDetailPage = () => {
   const { user } = useAuthStore()
   const { pushToast } = useToast()
 
-  const { data: users = [] } = useUsers({
-    enabled: user?.role === "ADMIN" || user?.role === "MANAGER",
-    endpoint: "users/options/"
-  })
-
   const [status, setStatus] = useState<"TODO" | "IN_PROGRESS" | "COMPLETED">(
     task?.status ?? "TODO"
   )
@@ -147,20 +142,14 @@ const TaskDetailPage = () => {
           <div className="flex flex-col gap-1">
             <label className="text-sm font-medium">Assign to</label>
 
-            <Select value={assigneeId} onValueChange={handleAssign}>
-              <SelectTrigger className="w-[200px]">
-                <SelectValue placeholder="Unassigned" />
-              </SelectTrigger>
-
-              <SelectContent>
-                <SelectItem value="__none">Unassigned</SelectItem>
-                {users.map((u) => (
-                  <SelectItem key={u.id} value={String(u.id)}>
-                    {u.username}
-                  </SelectItem>
-                ))}
-              </SelectContent>
-            </Select>
+            <UserPicker
+              value={assigneeId}
+              onChange={handleAssign}
+              selected={task.assigned_to}
+              emptyValue="__none"
+              emptyLabel="Unassigned"
+              triggerClassName="w-[200px]"
+            />
           </div>
         </div>
       )}
@@ -24,7 +24,7 @@ import { cn } from "@/lib/utils"
 import { CalendarIcon } from "lucide-react"
 
 import { useTask, useTaskMutation } from "../../hooks/useTasks"
-import { useUsers } from "../../hooks/useUsers"
+import UserPicker from "../../components/UserPicker"
 import { TaskStatus } from "../../types"
 import { useToast } from "../../providers/ToastProvider"
 
@@ -48,7 +48,6 @@ const TaskFormPage = ({ mode }: TProps) => {
 
   const { data: task } = useTask(taskId || "", { enabled: mode === "edit" })
   const { mutateAsync, isPending } = useTaskMutation()
-  const { data: users = [] } = useUsers({ endpoint: "users/options/" })
   const { pushToast } = useToast()
 
   const today = useMemo(() => getStartOfDay(new Date()), [])
@@ -229,25 +228,16 @@ const TaskFormPage = ({ mode }: TProps) => {
         <div className="flex flex-col gap-1">
           <label className="text-sm font-medium">Assign to</label>
 
-          <Select
+          <UserPicker
             value={form.assigned_to_id}
-            onValueChange={(value) =>
+            onChange={(value) =>
               setForm({ ...form, assigned_to_id: value })
             }
-          >
-            <SelectTrigger className="w-[230px]">
-              <SelectValue placeholder="Unassigned" />
-            </SelectTrigger>
-
-            <SelectContent>
-              <SelectItem value="__none">Unassigned</SelectItem>
-              {users.map((user) => (
-                <SelectItem key={user.id} value={String(user.id)}>
-                  {user.username}
-                </SelectItem>
-              ))}
-            </SelectContent>
-          </Select>
+            selected={task?.assigned_to}
+            emptyValue="__none"
+            emptyLabel="Unassigned"
+            triggerClassName="w-[230px]"
+          />
         </div>
 
         {/* SUBMIT */}
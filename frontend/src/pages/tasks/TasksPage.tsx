@@ -1,8 +1,7 @@
 import { useMemo, useState } from 'react'
 import TaskList from '../../components/TaskList'
 import TaskFilters from '../../components/TaskFilters'
-import { useDeleteTask, useTasks } from '../../hooks/useTasks'
-import { useUsers } from '../../hooks/useUsers'
+import { useDeleteTask, useTaskEvents, useTaskSync, useTasks } from '../../hooks/useTasks'
 import { Task, TaskStatus } from '../../types'
 import { Link } from 'react-router-dom'
 import { useAuthStore } from '../../store/useAuthStore'
@@ -12,12 +11,15 @@ import TaskInfoDialog from '../../components/TaskInfoDialog'
 
 const TasksPage = () => {
   const [filters, setFilters] = useState<{ status?: TaskStatus; assignee?: string }>({})
-  const { data: tasks = [], isLoading } = useTasks(filters)
+  const { data: tasks = [], isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useTasks(filters)
+  useTaskEvents()
+  // Catches up on anything the live feed missed, e.g. while disconnected.
+  useTaskSync(120000)
   const { user } = useAuthStore()
   const { pushToast } = useToast()
   const shouldLoadUsers = user?.role === 'ADMIN' || user?.role === 'MANAGER'
-  const { data: teamMembers = [] } = useUsers({ enabled: shouldLoadUsers, endpoint: 'users/options/' })
-  const availableUsers = shouldLoadUsers ? teamMembers : user ? [user] : []
+  // Managers and admins search the user directory; members only filter by themselves.
+  const availableUsers = shouldLoadUsers ? undefined : user ? [user] : []
   const deleteMutation = useDeleteTask()
   const [taskToDelete, setTaskToDelete] = useState<Task | null>(null)
   const canDeleteTasks = user?.role === 'ADMIN' || user?.role === 'MANAGER'
@@ -65,6 +67,18 @@ const TasksPage = () => {
           onInfoClick={canOpenDialog ? setTaskToView : undefined}
         />
       )}
+      {hasNextPage && (
+        <div className="flex justify-center">
+          <button
+            type="button"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+            className="px-4 py-2 rounded-md border border-slate-200 text-sm font-medium disabled:opacity-50"
+          >
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
       <ConfirmDialog
         open={Boolean(taskToDelete)}
         title="Delete task"
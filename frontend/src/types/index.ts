@@ -7,6 +7,9 @@ export type ApiUser = {
   role: Role
 }
 
+// /users/directory/ rows: just enough to pick an assignee.
+export type DirectoryUser = Pick<ApiUser, 'id' | 'username' | 'role'>
+
 export type TaskStatus = 'TODO' | 'IN_PROGRESS' | 'COMPLETED'
 
 export type  Task  = {
@@ -29,5 +32,31 @@ export type PaginatedResponse<T>  = {
   results: T[]
 }
 
+export type CursorPaginatedResponse<T> = {
+  next: string | null
+  previous: string | null
+  results: T[]
+}
+
+export type TaskSyncResponse = {
+  watermark: string
+  changed?: Task[]
+  deleted?: number[]
+  next?: string | null
+}
+
+export type TaskEvent = {
+  event: 'task.created' | 'task.updated' | 'task.assigned' | 'task.deleted' | 'task.removed'
+  id: number
+  task?: Task | null
+}
+
+export type TaskStats = {
+  total: number
+  todo: number
+  in_progress: number
+  completed: number
+  assigned_to_me: number
+}
 
 export type CategoryKey = "total" | "todo" | "inProgress" | "completed" | "assignedToMe"
\ No newline at end of file